@@ -1,11 +1,20 @@
-.PHONY: help install train test run docker-build docker-run docker-stop clean
+.PHONY: help install train train-tune train-incremental test run serve bench-workers bench-json bench-micro bench-load bench-parallel bench-startup docker-build docker-run docker-stop clean
 
 help:
 	@echo "Comandos disponibles:"
 	@echo "  make install       - Instalar dependencias"
 	@echo "  make train         - Entrenar el modelo"
+	@echo "  make train-tune    - Entrenar con búsqueda de hiperparámetros"
+	@echo "  make train-incremental DATA=casos.csv - Actualizar el modelo con casos nuevos"
 	@echo "  make test          - Ejecutar tests"
 	@echo "  make run           - Ejecutar API localmente"
+	@echo "  make serve         - Ejecutar API con Gunicorn (producción)"
+	@echo "  make bench-workers - Benchmark de throughput por número de workers"
+	@echo "  make bench-json    - Benchmark del coste de serialización JSON"
+	@echo "  make bench-micro   - Micro-benchmarks del predictor"
+	@echo "  make bench-load    - Barrido de concurrencia contra un servidor local"
+	@echo "  make bench-parallel - Punto de cruce de la inferencia en paralelo"
+	@echo "  make bench-startup - Arranque en frío: import, readiness y primera predicción"
 	@echo "  make docker-build  - Construir imagen Docker"
 	@echo "  make docker-run    - Ejecutar contenedor Docker"
 	@echo "  make docker-stop   - Detener contenedor Docker"
@@ -18,12 +27,40 @@ install:
 train:
 	python models/train_model.py
 
+train-tune:
+	python models/train_model.py --tune
+
+DATA ?= casos_nuevos.csv
+train-incremental:
+	python models/train_model.py --incremental --data $(DATA)
+
 test:
 	pytest tests/ -v --cov=api --cov-report=term-missing
 
 run:
 	python api/app.py
 
+serve:
+	gunicorn -c api/gunicorn_config.py api.app:app
+
+bench-workers:
+	python benchmarks/bench_workers.py --workers 1,2,4 --output bench_workers.json
+
+bench-json:
+	python benchmarks/bench_json.py --batch-sizes 1,100,1000 --output bench_json.json
+
+bench-micro:
+	python benchmarks/bench_micro.py --output bench_micro.json
+
+bench-load:
+	python benchmarks/bench_load.py --concurrency 1,2,4,8,16 --output bench_load.json
+
+bench-parallel:
+	python benchmarks/bench_parallel.py --output bench_parallel.json
+
+bench-startup:
+	python benchmarks/bench_startup.py --workers 4 --runs 5 --output bench_startup.json
+
 docker-build:
 	docker build -t breast-cancer-api:latest .
 
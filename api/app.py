@@ -5,27 +5,98 @@ Este módulo implementa una API Flask que expone el modelo de predicción
 mediante endpoints REST con validación de datos y manejo de errores.
 """
 
+import hashlib
+import hmac
+import io
 import logging
 import os
+import signal
+import sys
+import threading
+import time
 from datetime import datetime
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
-import joblib
 import numpy as np
-from flask import Flask, jsonify, request
+from flask import Blueprint, Flask, Response, g, jsonify, request, stream_with_context
 from werkzeug.exceptions import BadRequest
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from api.binary_formats import BINARY_CONTENT_TYPES, decode as decode_binary
+from api.bulk_scoring import DEFAULT_CHUNK_SIZE, STREAM_FORMATS, detect_format, format_results, iter_records, score_stream
+from api.cache import PredictionCache
+from api.forest_engine import CompiledForest
+from api.json_backend import BACKEND as JSON_BACKEND, FastJSONProvider
+from api.logging_config import PredictionSampler, configure_logging
+from api.metrics import (
+    BATCH_SIZE, CONTENT_TYPE as METRICS_CONTENT_TYPE, REGISTRY, REQUEST_ERRORS, REQUEST_SECONDS, REQUESTS,
+    ROWS, STAGE_SECONDS, CallbackMetric
 )
+from api.parallelism import ParallelScorer, limit_native_threads
+from api.registry import ModelPool, ModelRegistry, UnknownModelVersion, directory_bytes
+from api.reload import ModelReloader
+from api.schema import FeatureSchema, not_a_number_error
+from api.shadow import SHADOW_MODEL_VERSION, ShadowScorer
+
+configure_logging()
 logger = logging.getLogger(__name__)
+log_prediction = PredictionSampler()
+
+# Un hilo por pool BLAS/OpenMP; el paralelismo de la inferencia lo decide
+# ParallelScorer según el tamaño del lote.
+limit_native_threads()
+inference_scorer = ParallelScorer()
+
+# Las rutas se registran en el blueprint; la app se crea con create_app()
+routes = Blueprint('api', __name__)
+
+# Nombres de los artefactos dentro de un directorio de modelo (el de
+# MODEL_DIR o una versión del registro)
+MODEL_FILE = 'breast_cancer_model.pkl'
+SCALER_FILE = 'scaler.pkl'
+METADATA_FILE = 'model_metadata.pkl'
+COMPILED_MODEL_DIR = 'compiled_forest'
+FUSED_MODEL_DIR = 'fused_forest'
+
+MODEL_DIR = os.environ.get('MODEL_DIR', 'models')
+MODEL_PATH = os.path.join(MODEL_DIR, MODEL_FILE)
+SCALER_PATH = os.path.join(MODEL_DIR, SCALER_FILE)
+METADATA_PATH = os.path.join(MODEL_DIR, METADATA_FILE)
+COMPILED_MODEL_PATH = os.path.join(MODEL_DIR, COMPILED_MODEL_DIR)
+FUSED_MODEL_PATH = os.path.join(MODEL_DIR, FUSED_MODEL_DIR)
 
-app = Flask(__name__)
+# Registro de versiones. MODEL_VERSION (versión, digest o alias como
+# 'latest') hace que el modelo por defecto salga del registro en lugar de
+# MODEL_DIR; cada petición puede pedir otra versión con la cabecera
+# MODEL_VERSION_HEADER o la ruta /models/<versión>/...
+MODEL_REGISTRY_DIR = os.environ.get('MODEL_REGISTRY_DIR', os.path.join(MODEL_DIR, 'registry'))
+MODEL_VERSION = os.environ.get('MODEL_VERSION', '')
+MODEL_POOL_MEMORY_MB = float(os.environ.get('MODEL_POOL_MEMORY_MB', 256))
+MODEL_VERSION_HEADER = 'X-Model-Version'
 
-MODEL_PATH = os.path.join('models', 'breast_cancer_model.pkl')
-SCALER_PATH = os.path.join('models', 'scaler.pkl')
-METADATA_PATH = os.path.join('models', 'model_metadata.pkl')
+INFERENCE_BACKENDS = ('auto', 'fused', 'compiled', 'sklearn')
+INFERENCE_BACKEND = os.environ.get('INFERENCE_BACKEND', 'auto').lower()
+MODEL_MMAP = os.environ.get('MODEL_MMAP', 'true').lower() == 'true'
+
+MAX_BATCH_SIZE = int(os.environ.get('MAX_BATCH_SIZE', 10000))
+DECISION_THRESHOLD = float(os.environ.get('DECISION_THRESHOLD', 0.5))
+POSITIVE_CLASS = 'malignant'
+
+PREDICTION_CACHE_SIZE = int(os.environ.get('PREDICTION_CACHE_SIZE', 0))
+PREDICTION_CACHE_TTL = float(os.environ.get('PREDICTION_CACHE_TTL', 300))
+CACHE_BYPASS_HEADER = 'X-Cache-Bypass'
+
+MODEL_WATCH_INTERVAL = float(os.environ.get('MODEL_WATCH_INTERVAL', 0))
+ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN')
+
+# 'eager': create_app() carga el modelo antes de devolver la app (con
+# Gunicorn, una sola vez en el maestro). 'lazy': la app atiende peticiones
+# enseguida y el modelo se carga en un hilo en segundo plano; /health/ready
+# responde 503 (y las predicciones también) hasta que termina.
+STARTUP_MODES = ('eager', 'lazy')
+STARTUP_MODE = os.environ.get('STARTUP_MODE', 'eager').lower()
+READY_RETRY_AFTER = 1
 
 REQUIRED_FEATURES = [
     'mean_radius', 'mean_texture', 'mean_perimeter', 'mean_area',
@@ -45,31 +116,112 @@ class ModelPredictor:
     Clase para cargar y ejecutar predicciones con el modelo.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        decision_threshold: float = DECISION_THRESHOLD,
+        backend: str = INFERENCE_BACKEND,
+        cache_size: int = PREDICTION_CACHE_SIZE,
+        cache_ttl: float = PREDICTION_CACHE_TTL,
+        scorer: Optional[ParallelScorer] = None,
+        model_dir: str = MODEL_DIR,
+        model_version: Optional[str] = None
+    ):
         """
         Inicializa el predictor cargando el modelo y scaler.
+
+        Args:
+            decision_threshold: Probabilidad mínima de la clase maligna para
+                clasificar un caso como maligno
+            backend: Motor de inferencia: 'fused' (bosque compilado con el
+                scaler integrado en los umbrales), 'compiled' (arrays NumPy
+                exportados en el entrenamiento), 'sklearn' (modelo pickle) o
+                'auto' (el más rápido cuyo artefacto exista)
+            cache_size: Entradas de la caché de predicciones (0 = desactivada)
+            cache_ttl: Segundos de validez de cada entrada de la caché
+            scorer: Política de paralelismo de la inferencia (por defecto la
+                compartida por todo el proceso, configurada con
+                INFERENCE_N_JOBS y PARALLEL_BATCH_THRESHOLD)
+            model_dir: Directorio con los artefactos (MODEL_DIR o una
+                versión del registro)
+            model_version: Identificador de la versión (por defecto, un
+                digest de los artefactos cargados)
         """
+        if not 0.0 <= decision_threshold <= 1.0:
+            raise ValueError("decision_threshold debe estar entre 0 y 1")
+        if backend not in INFERENCE_BACKENDS:
+            raise ValueError(f"backend debe ser uno de {INFERENCE_BACKENDS}")
+        
+        self.decision_threshold = decision_threshold
+        self.backend = backend
         self.model = None
         self.scaler = None
         self.metadata = None
+        self.positive_index = 0
+        self.labels = ['Malignant', 'Benign']
+        self.model_dir = model_dir
+        self.model_version = model_version
+        self.memory_bytes = 0
+        self.schema = FeatureSchema(REQUIRED_FEATURES)
+        self.cache = PredictionCache(cache_size, cache_ttl) if cache_size > 0 else None
+        self.scorer = scorer if scorer is not None else inference_scorer
         self.load_model()
 
     def load_model(self) -> None:
         """
         Carga el modelo, scaler y metadata desde disco.
         """
+        # joblib (y scikit-learn, al deserializar el pickle) solo se importan
+        # al cargar: con STARTUP_MODE=lazy la carga ocurre tras el arranque.
+        import joblib
+
+        fused_path = os.path.join(self.model_dir, FUSED_MODEL_DIR)
+        compiled_path = os.path.join(self.model_dir, COMPILED_MODEL_DIR)
+        scaler_path = os.path.join(self.model_dir, SCALER_FILE)
+        metadata_path = os.path.join(self.model_dir, METADATA_FILE)
         try:
-            logger.info("Cargando modelo desde disco")
-            self.model = joblib.load(MODEL_PATH)
-            self.scaler = joblib.load(SCALER_PATH)
-            self.metadata = joblib.load(METADATA_PATH)
-            logger.info("Modelo cargado exitosamente")
-            logger.info(f"Fecha de entrenamiento: {self.metadata.get('training_date', 'N/A')}")
+            logger.info("Cargando modelo desde %s", self.model_dir)
+            if self.backend == 'auto':
+                if os.path.exists(fused_path):
+                    self.backend = 'fused'
+                elif os.path.exists(compiled_path):
+                    self.backend = 'compiled'
+                else:
+                    self.backend = 'sklearn'
+            
+            if self.backend == 'fused':
+                model_path = fused_path
+                self.model = CompiledForest.load(fused_path, mmap=MODEL_MMAP)
+                self.scaler = None
+            elif self.backend == 'compiled':
+                model_path = compiled_path
+                self.model = CompiledForest.load(compiled_path, mmap=MODEL_MMAP)
+                self.scaler = joblib.load(scaler_path)
+            else:
+                model_path = os.path.join(self.model_dir, MODEL_FILE)
+                self.model = joblib.load(model_path)
+                # El pickle conserva n_jobs=-1 del entrenamiento: el paralelismo
+                # lo controla self.scorer, no joblib.
+                self.model.n_jobs = 1
+                self.scaler = joblib.load(scaler_path)
+            if self.model_version is None:
+                self.model_version = self._file_digest(model_path, metadata_path)
+            self.memory_bytes = directory_bytes(model_path) + (
+                directory_bytes(scaler_path) if self.scaler is not None else 0
+            )
+            if self.cache is not None:
+                self.cache.clear()
+            self.metadata = joblib.load(metadata_path)
+            self.schema = FeatureSchema.from_metadata(self.metadata, REQUIRED_FEATURES)
+            target_names = list(self.metadata.get('target_names', ['malignant', 'benign']))
+            self.positive_index = target_names.index(POSITIVE_CLASS) if POSITIVE_CLASS in target_names else 0
+            self.labels = [str(name).capitalize() for name in target_names]
+            logger.info("Modelo cargado exitosamente (motor: %s, versión: %s)", self.backend, self.model_version)
+            logger.info("Fecha de entrenamiento: %s", self.metadata.get('training_date', 'N/A'))
         except FileNotFoundError as e:
-            logger.error(f"Error al cargar modelo: {e}")
+            logger.error("Error al cargar modelo: %s", e)
             raise RuntimeError("Modelo no encontrado. Ejecute train_model.py primero.")
         except Exception as e:
-            logger.error(f"Error inesperado al cargar modelo: {e}")
+            logger.error("Error inesperado al cargar modelo: %s", e)
             raise
 
     def validate_input(self, data: Dict) -> Tuple[bool, List[str]]:
@@ -80,66 +232,586 @@ class ModelPredictor:
             data: Diccionario con los datos de entrada
 
         Returns:
-            Tupla (es_valido, lista_de_errores)
+            Tupla (es_valido, lista_de_errores) con todos los campos erróneos
         """
-        missing_features = [f for f in REQUIRED_FEATURES if f not in data]
-        
-        if missing_features:
-            return False, missing_features
-        
-        try:
-            for feature in REQUIRED_FEATURES:
-                float(data[feature])
-        except (ValueError, TypeError):
-            return False, [f"Feature '{feature}' debe ser un número"]
-        
-        return True, []
+        errors = self.schema.errors(data)
+        return not errors, errors
 
-    def predict(self, data: Dict) -> Dict:
+    def parse_record(self, data: Dict) -> Tuple[Optional[np.ndarray], List[str]]:
+        """
+        Valida un registro y construye su matriz 1 x 30 de features en una
+        sola pasada.
+
+        Args:
+            data: Diccionario con las features
+
+        Returns:
+            Tupla (matriz_de_features, errores). Si hay errores la matriz es
+            None y se reportan todos los campos erróneos.
+        """
+        row, errors = self.schema.parse(data)
+        if errors:
+            return None, errors
+        return row.reshape(1, -1), []
+
+    def predict(self, data: Dict, use_cache: bool = True) -> Dict:
         """
         Realiza una predicción basada en los datos de entrada.
 
         Args:
             data: Diccionario con las features
+            use_cache: Si es False no se consulta ni se actualiza la caché
+
+        Returns:
+            Diccionario con la predicción y probabilidades
+        """
+        return self.predict_row(self.record_to_row(data), use_cache)
+
+    def predict_row(self, features: np.ndarray, use_cache: bool = True) -> Dict:
+        """
+        Realiza una predicción para una matriz 1 x 30 ya validada.
+
+        Args:
+            features: Matriz 1 x 30 devuelta por ``parse_record``
+            use_cache: Si es False no se consulta ni se actualiza la caché
 
         Returns:
             Diccionario con la predicción y probabilidades
         """
         try:
-            features = np.array([[data[f] for f in REQUIRED_FEATURES]])
+            ROWS.inc('valid')
+            probabilities = self.predict_proba_cached(features, use_cache)
+            prediction = self.decide(probabilities)[0]
+            
+            result = self._format_result(int(prediction), probabilities[0].tolist())
+            result['timestamp'] = datetime.now().isoformat()
+            
+            if log_prediction():
+                logger.info(
+                    "Predicción realizada: %s (confianza: %.2f)", result['prediction_label'], result['confidence'],
+                    extra={'prediction': result['prediction_label'], 'confidence': result['confidence'],
+                           'model_version': self.model_version}
+                )
+            
+            return result
+        
+        except Exception as e:
+            logger.error("Error en predicción: %s", e)
+            raise
+
+    def record_to_row(self, data: Dict) -> np.ndarray:
+        """
+        Construye la matriz 1 x 30 de features de un registro.
+
+        Args:
+            data: Diccionario con las features
+
+        Returns:
+            Matriz 1 x 30 en el orden de REQUIRED_FEATURES
+
+        Raises:
+            ValueError: Si el registro no es válido
+        """
+        features, errors = self.parse_record(data)
+        if errors:
+            raise ValueError(f"Registro inválido: {errors}")
+        return features
+
+    def records_to_matrix(self, records: List) -> Tuple[np.ndarray, Dict[int, List[str]]]:
+        """
+        Valida una lista de registros y construye la matriz N x 30 de features.
+
+        Args:
+            records: Lista de diccionarios con las features
+
+        Returns:
+            Tupla (matriz_de_features, errores_por_fila). Las filas con
+            errores quedan a cero y no deben puntuarse.
+        """
+        return self.schema.parse_many(records)
+
+    def columns_to_matrix(self, columns: Dict) -> Tuple[np.ndarray, Dict[int, List[str]]]:
+        """
+        Valida un payload columnar (feature -> lista de valores) y construye
+        la matriz N x 30 de features.
+
+        Args:
+            columns: Diccionario con una lista de valores por feature
+
+        Returns:
+            Tupla (matriz_de_features, errores_por_fila)
+
+        Raises:
+            ValueError: Si faltan columnas o sus longitudes no coinciden
+        """
+        missing_features = [f for f in self.schema.names if f not in columns]
+        if missing_features:
+            raise ValueError(f"Faltan columnas requeridas: {missing_features}")
+        
+        lengths = {len(columns[f]) if isinstance(columns[f], list) else -1 for f in self.schema.names}
+        if len(lengths) != 1 or -1 in lengths:
+            raise ValueError("Todas las columnas deben ser listas de la misma longitud")
+        
+        n_rows = lengths.pop()
+        features = np.zeros((n_rows, self.schema.n_features), dtype=np.float64)
+        row_errors = {}
+        
+        for j, feature in enumerate(self.schema.names):
+            column = columns[feature]
+            try:
+                values = np.asarray(column, dtype=np.float64)
+                if values.shape != (n_rows,):
+                    values = None
+            except (ValueError, TypeError):
+                values = None
             
-            features_scaled = self.scaler.transform(features)
+            # np.asarray convierte None en NaN: se revisa elemento a elemento
+            # para reportar el mismo error que la validación por registro
+            # (también para "nan" e infinitos).
+            if values is not None and np.isfinite(values).all():
+                features[:, j] = values
+                continue
             
-            prediction = self.model.predict(features_scaled)[0]
-            probabilities = self.model.predict_proba(features_scaled)[0]
+            for i, value in enumerate(column):
+                try:
+                    features[i, j] = float(value)
+                    valid = np.isfinite(features[i, j])
+                except (ValueError, TypeError):
+                    valid = False
+                if not valid:
+                    row_errors.setdefault(i, []).append(not_a_number_error(feature))
+        
+        return features, row_errors
+
+    def predict_batch(
+        self,
+        features: np.ndarray,
+        row_errors: Dict[int, List[str]],
+        use_cache: bool = True
+    ) -> List[Dict]:
+        """
+        Realiza predicciones para una matriz de features en una sola pasada
+        por el scaler y el modelo.
+
+        Args:
+            features: Matriz N x 30 de features
+            row_errors: Errores de validación por fila; esas filas no se puntúan
+            use_cache: Si es False no se consulta ni se actualiza la caché
+
+        Returns:
+            Lista con un resultado (o un error) por fila, en el orden de entrada
+        """
+        try:
+            n_rows = features.shape[0]
+            is_valid = np.ones(n_rows, dtype=bool)
+            is_valid[list(row_errors)] = False
+            valid_rows = np.flatnonzero(is_valid)
             
-            target_names = self.metadata.get('target_names', ['malignant', 'benign'])
-            prediction_label = target_names[prediction]
+            results = [None] * n_rows
             
-            result = {
-                'prediction': int(prediction),
-                'prediction_label': prediction_label.capitalize(),
-                'probability': {
-                    target_names[0].capitalize(): float(probabilities[0]),
-                    target_names[1].capitalize(): float(probabilities[1])
-                },
-                'confidence': float(max(probabilities)),
-                'timestamp': datetime.now().isoformat()
-            }
+            if len(valid_rows):
+                # Sin errores se puntúa la matriz tal cual, sin copiarla
+                scored = features if not row_errors else features[valid_rows]
+                probabilities = self.predict_proba_cached(scored, use_cache)
+                predictions = self.decide(probabilities)
+                
+                for i, prediction, row_probabilities in zip(
+                    valid_rows.tolist(), predictions.tolist(), probabilities.tolist()
+                ):
+                    result = self._format_result(prediction, row_probabilities)
+                    result['index'] = i
+                    results[i] = result
             
-            logger.info(f"Predicción realizada: {prediction_label} (confianza: {max(probabilities):.2f})")
+            for i, errors in row_errors.items():
+                results[i] = {
+                    'index': i,
+                    'error': 'Invalid input',
+                    'errors': errors
+                }
             
-            return result
+            ROWS.inc('valid', amount=len(valid_rows))
+            ROWS.inc('invalid', amount=len(row_errors))
+            if log_prediction():
+                logger.info(
+                    "Predicción por lotes realizada: %d filas válidas, %d con errores", len(valid_rows), len(row_errors),
+                    extra={'valid_rows': len(valid_rows), 'invalid_rows': len(row_errors),
+                           'model_version': self.model_version}
+                )
+            
+            return results
         
         except Exception as e:
-            logger.error(f"Error en predicción: {e}")
+            logger.error("Error en predicción por lotes: %s", e)
             raise
 
+    def predict_proba_matrix(self, features: np.ndarray) -> np.ndarray:
+        """
+        Calcula las probabilidades de una matriz de features con una única
+        pasada por el bosque. Los lotes grandes se reparten entre los hilos
+        de ``self.scorer``.
+
+        Args:
+            features: Matriz N x 30 de features sin escalar
+
+        Returns:
+            Matriz N x 2 con las probabilidades de cada clase
+        """
+        BATCH_SIZE.observe(features.shape[0])
+        
+        if self.scaler is not None:
+            with STAGE_SECONDS.time('scale'):
+                features = self.scaler.transform(features)
+        
+        with STAGE_SECONDS.time('model'):
+            return self.scorer.predict_proba(self.model, features)
+
+    def predict_proba_cached(self, features: np.ndarray, use_cache: bool = True) -> np.ndarray:
+        """
+        Igual que ``predict_proba_matrix`` pero sirviendo desde la caché las
+        filas ya puntuadas con la versión actual del modelo. Las filas que
+        faltan se puntúan juntas en una sola pasada.
+
+        Args:
+            features: Matriz N x 30 de features sin escalar
+            use_cache: Si es False se puntúa todo sin usar la caché
+
+        Returns:
+            Matriz N x 2 con las probabilidades de cada clase
+        """
+        if self.cache is None or not use_cache:
+            return self.predict_proba_matrix(features)
+        
+        keys = [self.cache.make_key(row, self.model_version) for row in features]
+        probabilities = np.empty((len(features), len(self.model.classes_)), dtype=np.float64)
+        missing_rows = []
+        
+        for i, key in enumerate(keys):
+            cached = self.cache.get(key)
+            if cached is None:
+                missing_rows.append(i)
+            else:
+                probabilities[i] = cached
+        
+        if missing_rows:
+            computed = self.predict_proba_matrix(features[missing_rows])
+            probabilities[missing_rows] = computed
+            for i, row_probabilities in zip(missing_rows, computed):
+                self.cache.put(keys[i], row_probabilities.copy())
+        
+        return probabilities
+
+    def decide(self, probabilities: np.ndarray) -> np.ndarray:
+        """
+        Deriva la clase predicha a partir de las probabilidades aplicando el
+        umbral de decisión sobre la clase maligna.
+
+        Con el umbral por defecto (0.5) el resultado coincide con
+        ``model.predict``, sin recorrer el bosque una segunda vez.
+
+        Args:
+            probabilities: Matriz N x 2 devuelta por ``predict_proba_matrix``
+
+        Returns:
+            Vector con el índice de la clase predicha para cada fila
+        """
+        is_positive = probabilities[:, self.positive_index] >= self.decision_threshold
+        return np.where(is_positive, self.positive_index, 1 - self.positive_index)
+
+    def verify(self) -> None:
+        """
+        Comprueba que los artefactos cargados respetan el esquema de features
+        y calienta el camino de predicción con una fila de prueba.
+
+        Raises:
+            ValueError: Si el modelo no es compatible con REQUIRED_FEATURES o
+                la predicción de prueba no es válida
+        """
+        n_features = getattr(self.model, 'n_features_in_', len(REQUIRED_FEATURES))
+        if n_features != len(REQUIRED_FEATURES):
+            raise ValueError(f"El modelo espera {n_features} features, la API envía {len(REQUIRED_FEATURES)}")
+        
+        schema = FeatureSchema.from_metadata(self.metadata, REQUIRED_FEATURES)
+        if list(schema.names) != REQUIRED_FEATURES:
+            raise ValueError("Las features del modelo no coinciden con REQUIRED_FEATURES")
+        
+        probabilities = self.predict_proba_matrix(np.zeros((1, len(REQUIRED_FEATURES))))
+        if probabilities.shape != (1, 2) or not np.isclose(probabilities.sum(), 1.0):
+            raise ValueError(f"Predicción de prueba inválida: {probabilities}")
+
+    @staticmethod
+    def _file_digest(*paths: str) -> str:
+        """
+        Calcula un identificador de versión a partir del contenido de los
+        artefactos del modelo.
+
+        Args:
+            paths: Rutas de los archivos (o directorios) a incluir
+
+        Returns:
+            Primeros 12 caracteres hexadecimales del SHA-256
+        """
+        files = []
+        for path in paths:
+            if os.path.isdir(path):
+                files.extend(os.path.join(path, name) for name in sorted(os.listdir(path)))
+            else:
+                files.append(path)
+        
+        digest = hashlib.sha256()
+        for path in files:
+            digest.update(os.path.basename(path).encode())
+            with open(path, 'rb') as artifact:
+                for block in iter(lambda: artifact.read(1 << 20), b''):
+                    digest.update(block)
+        return digest.hexdigest()[:12]
+
+    def _format_result(self, prediction: int, probabilities: List[float]) -> Dict:
+        """
+        Construye el diccionario de respuesta para una fila puntuada.
+
+        Las etiquetas se calculan una sola vez al cargar el modelo
+        (``self.labels``).
+
+        Args:
+            prediction: Índice de la clase predicha
+            probabilities: Probabilidades de cada clase como floats de Python
+
+        Returns:
+            Diccionario con la predicción y probabilidades
+        """
+        labels = self.labels
+        
+        return {
+            'prediction': prediction,
+            'prediction_label': labels[prediction],
+            'probability': {
+                labels[0]: probabilities[0],
+                labels[1]: probabilities[1]
+            },
+            'confidence': probabilities[prediction]
+        }
+
+
+def _load_version(model_dir: str, digest: str) -> ModelPredictor:
+    """
+    Carga, valida y calienta una versión del registro.
+    """
+    candidate = ModelPredictor(model_dir=model_dir, model_version=digest[:12])
+    candidate.verify()
+    return candidate
+
+
+model_registry = ModelRegistry(MODEL_REGISTRY_DIR)
+model_pool = ModelPool(model_registry, _load_version, int(MODEL_POOL_MEMORY_MB * (1 << 20)))
+
+# Predictor activo: None hasta que termina la primera carga (ver
+# load_default_model). Fuera del módulo se lee con get_predictor().
+_active_predictor: Optional[ModelPredictor] = None
+
+
+class ModelNotReady(RuntimeError):
+    """
+    El modelo activo todavía se está cargando (STARTUP_MODE=lazy).
+    """
+
+
+def get_predictor(version: Optional[str] = None) -> ModelPredictor:
+    """
+    Devuelve el predictor activo o el de una versión del registro. Cada
+    petición debe tomarlo una sola vez y usar esa referencia hasta terminar.
+
+    Si el modelo activo aún no está cargado, lo carga (o espera a la carga
+    en curso) antes de devolverlo.
+
+    Args:
+        version: Versión, digest o alias del registro (None = el activo)
+
+    Raises:
+        UnknownModelVersion: Si la versión no está en el registro
+        RuntimeError: Si el modelo activo no se pudo cargar
+    """
+    if version is not None:
+        return model_pool.get(version)
+    current = _active_predictor
+    if current is None:
+        current = load_default_model()
+    return current
+
+
+def model_ready() -> bool:
+    """
+    Indica si el modelo activo está cargado y puede atender predicciones.
+    """
+    return _active_predictor is not None
+
+
+def load_default_model(background: bool = False) -> Optional[ModelPredictor]:
+    """
+    Carga el modelo activo si todavía no lo está.
+
+    Usa el mismo ``reloader`` que las recargas en caliente, así que nunca
+    hay dos cargas a la vez: una recarga por SIGHUP durante el arranque se
+    ignora y una llamada concurrente espera a la carga en curso.
+
+    Args:
+        background: Si es True lanza la carga en un hilo y vuelve enseguida
+
+    Returns:
+        El predictor activo (None con ``background=True``)
+
+    Raises:
+        RuntimeError: Si la carga falla (solo con ``background=False``)
+    """
+    if _active_predictor is not None:
+        return None if background else _active_predictor
+    if background:
+        reloader.reload()
+        return None
+    if reloader.reload(wait=True) is None:
+        reloader.wait()
+    if _active_predictor is None:
+        raise RuntimeError(f"No se pudo cargar el modelo: {reloader.last_error}")
+    return _active_predictor
+
+
+def _load_predictor() -> ModelPredictor:
+    """
+    Carga, valida y calienta un predictor nuevo con la configuración actual.
+
+    Con MODEL_VERSION se vuelve a resolver la referencia en el registro (un
+    alias puede apuntar ya a otra versión) y, si esa versión está en el
+    pool, se reutiliza sin leer los artefactos.
+    """
+    if MODEL_VERSION:
+        return model_pool.get(MODEL_VERSION)
+    candidate = ModelPredictor()
+    candidate.verify()
+    return candidate
+
+
+# Con SHADOW_MODEL_VERSION cada /predict (o una muestra) se puntúa además en
+# segundo plano con esa versión del registro para compararla con la activa.
+shadow_scorer = ShadowScorer(lambda: model_pool.get(SHADOW_MODEL_VERSION)) if SHADOW_MODEL_VERSION else None
+
+
+def _request_predictor(version: Optional[str] = None) -> ModelPredictor:
+    """
+    Devuelve el predictor de la versión pedida en la ruta o en la cabecera
+    MODEL_VERSION_HEADER (o el activo si no se pide ninguna) y la anota
+    para la cabecera de la respuesta.
+    """
+    version = version or request.headers.get(MODEL_VERSION_HEADER) or None
+    if version is None and not model_ready():
+        raise ModelNotReady("El modelo se está cargando")
+    current = get_predictor(version)
+    g.model_version = current.model_version
+    return current
+
+
+def _swap_predictor(new_predictor: ModelPredictor) -> None:
+    """
+    Publica el predictor nuevo con una única asignación atómica.
+    """
+    global _active_predictor
+    _active_predictor = new_predictor
+
+
+reloader = ModelReloader(_load_predictor, _swap_predictor)
+
+
+def enable_hot_reload() -> None:
+    """
+    Activa las recargas por señal (SIGHUP) y, si MODEL_WATCH_INTERVAL > 0,
+    el vigilante de artefactos. Debe llamarse en cada proceso que sirve
+    peticiones (tras el fork en Gunicorn).
+    """
+    if hasattr(signal, 'SIGHUP') and threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGHUP, lambda signum, frame: reloader.reload())
+        logger.info("Recarga del modelo con SIGHUP activada")
+    
+    if MODEL_WATCH_INTERVAL > 0:
+        if MODEL_VERSION:
+            # Las versiones son inmutables: solo puede cambiar a dónde apunta el alias
+            paths = [os.path.join(MODEL_REGISTRY_DIR, 'index.json')]
+        else:
+            paths = [MODEL_PATH, SCALER_PATH, METADATA_PATH, COMPILED_MODEL_PATH, FUSED_MODEL_PATH]
+        reloader.watch(paths, MODEL_WATCH_INTERVAL)
+
+
+def _cache_bypassed() -> bool:
+    """
+    Indica si la petición pide saltarse la caché de predicciones
+    (cabecera ``X-Cache-Bypass`` o ``Cache-Control: no-cache``).
+    """
+    bypass = request.headers.get(CACHE_BYPASS_HEADER, '').lower() in ('1', 'true', 'yes')
+    return bypass or 'no-cache' in request.headers.get('Cache-Control', '').lower()
+
+
+def _json_response(payload: Dict, status: int = 200):
+    """
+    Serializa una respuesta de predicción registrando la etapa 'serialize'.
+    """
+    with STAGE_SECONDS.time('serialize'):
+        return jsonify(payload), status
+
+
+def _cache_metrics() -> Dict[Tuple, float]:
+    """
+    Aciertos, fallos y desalojos de la caché del predictor activo.
+    """
+    cache = _active_predictor.cache if _active_predictor is not None else None
+    if cache is None:
+        return {}
+    stats = cache.stats()
+    return {(kind,): stats[kind] for kind in ('hits', 'misses', 'evictions')}
+
+
+REGISTRY.register(CallbackMetric(
+    'prediction_cache_events_total', 'Eventos de la caché de predicciones del modelo activo',
+    'counter', _cache_metrics, ('event',)
+))
+
+
+def _model_info() -> Dict[Tuple, float]:
+    """
+    Versión y motor de inferencia del predictor activo.
+    """
+    current = _active_predictor
+    if current is None:
+        return {}
+    return {(current.model_version, current.backend): 1}
+
+
+REGISTRY.register(CallbackMetric(
+    'model_info', 'Modelo activo (valor constante 1)', 'gauge', _model_info, ('version', 'backend')
+))
+
 
-predictor = ModelPredictor()
+@routes.before_app_request
+def _start_request_timer() -> None:
+    """
+    Guarda el instante de inicio de la petición.
+    """
+    g.request_start = time.perf_counter()
 
 
-@app.route('/', methods=['GET'])
+@routes.after_app_request
+def _record_request_metrics(response):
+    """
+    Registra duración, estado y errores de cada petición.
+    """
+    endpoint = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+    REQUESTS.inc(endpoint, request.method, str(response.status_code))
+    if response.status_code >= 400:
+        REQUEST_ERRORS.inc(endpoint, 'server' if response.status_code >= 500 else 'client')
+    if 'request_start' in g:
+        REQUEST_SECONDS.observe(time.perf_counter() - g.request_start, endpoint)
+    if 'model_version' in g:
+        response.headers[MODEL_VERSION_HEADER] = g.model_version
+    return response
+
+
+@routes.route('/', methods=['GET'])
 def health_check():
     """
     Endpoint de verificación del estado del servicio.
@@ -147,40 +819,227 @@ def health_check():
     Returns:
         JSON con el estado del servicio
     """
+    if not model_ready():
+        raise ModelNotReady("El modelo se está cargando")
+    current = get_predictor()
+    
     try:
         response = {
             'status': 'ok',
             'message': 'Breast Cancer Prediction API is running',
             'version': '1.0.0',
             'model_info': {
-                'type': predictor.metadata.get('model_type', 'N/A'),
-                'training_date': predictor.metadata.get('training_date', 'N/A'),
-                'features_count': len(REQUIRED_FEATURES)
+                'type': current.metadata.get('model_type', 'N/A'),
+                'training_date': current.metadata.get('training_date', 'N/A'),
+                'features_count': len(REQUIRED_FEATURES),
+                'decision_threshold': current.decision_threshold,
+                'inference_backend': current.backend,
+                'version': current.model_version
             },
+            'json_backend': JSON_BACKEND,
+            'cache': current.cache.stats() if current.cache is not None else None,
             'timestamp': datetime.now().isoformat()
         }
-        logger.info("Health check solicitado")
         return jsonify(response), 200
     
     except Exception as e:
-        logger.error(f"Error en health check: {e}")
+        logger.error("Error en health check: %s", e)
         return jsonify({
             'status': 'error',
             'message': str(e)
         }), 500
 
 
-@app.route('/predict', methods=['POST'])
-def predict():
+@routes.route('/health/live', methods=['GET'])
+def liveness():
+    """
+    Endpoint de liveness: el proceso atiende peticiones.
+
+    No depende del modelo, así que responde desde el arranque también con
+    STARTUP_MODE=lazy. Solo falla (503) si la carga inicial del modelo
+    falló, para que el orquestador reinicie el proceso.
+
+    Returns:
+        JSON con el estado del proceso
+    """
+    if not model_ready() and not reloader.loading and reloader.failures:
+        return jsonify({
+            'status': 'failed',
+            'message': reloader.last_error
+        }), 503
+    return jsonify({'status': 'alive'}), 200
+
+
+@routes.route('/health/ready', methods=['GET'])
+def readiness():
+    """
+    Endpoint de readiness: el modelo activo está cargado.
+
+    Returns:
+        JSON con el estado de la carga; 503 mientras el modelo se carga
+    """
+    ready = model_ready()
+    response = jsonify({
+        'status': 'ready' if ready else 'loading',
+        'startup_mode': STARTUP_MODE,
+        'model_version': _active_predictor.model_version if ready else None,
+        'load': reloader.status()
+    })
+    if not ready:
+        response.headers['Retry-After'] = str(READY_RETRY_AFTER)
+    return response, 200 if ready else 503
+
+
+@routes.route('/predict', methods=['POST'])
+@routes.route('/models/<version>/predict', methods=['POST'])
+def predict(version: Optional[str] = None):
     """
     Endpoint para realizar predicciones.
 
-    Espera un JSON con todas las features requeridas.
+    Espera un JSON con todas las features requeridas, o una matriz binaria
+    de una sola fila (ver ``api/binary_formats.py``).
+
+    Args:
+        version: Versión del registro pedida en la ruta (ver ``_request_predictor``)
 
     Returns:
         JSON con la predicción y probabilidades
     """
+    current = _request_predictor(version)
+    
+    try:
+        if request.mimetype in BINARY_CONTENT_TYPES:
+            try:
+                with STAGE_SECONDS.time('parse'):
+                    features, row_errors = decode_binary(request.get_data(), request.mimetype, current.schema.names)
+                if features.shape[0] != 1:
+                    raise ValueError(f"Se espera una única fila, se recibieron {features.shape[0]}")
+            except ValueError as e:
+                logger.warning("Cuerpo binario inválido: %s", e)
+                return jsonify({
+                    'error': 'Invalid input',
+                    'message': str(e)
+                }), 400
+            
+            errors = row_errors.get(0, [])
+        else:
+            if not request.is_json:
+                logger.warning("Request sin Content-Type: application/json")
+                return jsonify({
+                    'error': 'Invalid content type',
+                    'message': 'Content-Type debe ser application/json'
+                }), 400
+            
+            with STAGE_SECONDS.time('parse'):
+                data = request.get_json()
+            
+            if not data:
+                logger.warning("Request body vacío")
+                return jsonify({
+                    'error': 'Empty request',
+                    'message': 'El body no puede estar vacío'
+                }), 400
+            
+            with STAGE_SECONDS.time('validate'):
+                features, errors = current.parse_record(data)
+        
+        if errors:
+            logger.warning("Validación fallida: %s", errors)
+            return jsonify({
+                'error': 'Invalid input',
+                'message': 'Faltan features requeridas o valores inválidos',
+                'missing_features': errors,
+                'required_features': REQUIRED_FEATURES
+            }), 400
+        
+        start = time.perf_counter()
+        result = current.predict_row(features, use_cache=not _cache_bypassed())
+        
+        if shadow_scorer is not None:
+            shadow_scorer.submit(
+                features, result['prediction'], list(result['probability'].values()), time.perf_counter() - start
+            )
+        
+        return _json_response(result)
+    
+    except BadRequest as e:
+        logger.error("Bad request: %s", e)
+        return jsonify({
+            'error': 'Bad request',
+            'message': str(e)
+        }), 400
+    
+    except Exception as e:
+        logger.error("Error inesperado en predicción: %s", e)
+        return jsonify({
+            'error': 'Prediction failed',
+            'message': 'Error interno del servidor'
+        }), 500
+
+
+def _predict_binary_batch(current: ModelPredictor):
+    """
+    Puntúa un lote recibido en uno de los formatos binarios. La matriz
+    decodificada es una vista sobre el cuerpo y se pasa al modelo sin copiar.
+    """
+    try:
+        with STAGE_SECONDS.time('parse'):
+            features, row_errors = decode_binary(request.get_data(), request.mimetype, current.schema.names)
+    except ValueError as e:
+        logger.warning("Cuerpo binario inválido: %s", e)
+        return jsonify({
+            'error': 'Invalid input',
+            'message': str(e),
+            'required_features': REQUIRED_FEATURES
+        }), 400
+    
+    if features.shape[0] == 0:
+        return jsonify({
+            'error': 'Empty request',
+            'message': 'El body no puede estar vacío'
+        }), 400
+    
+    if features.shape[0] > MAX_BATCH_SIZE:
+        logger.warning("Lote demasiado grande: %s filas", features.shape[0])
+        return jsonify({
+            'error': 'Batch too large',
+            'message': f'El lote no puede superar {MAX_BATCH_SIZE} filas'
+        }), 413
+    
+    results = current.predict_batch(features, row_errors, use_cache=not _cache_bypassed())
+    
+    return _json_response({
+        'predictions': results,
+        'count': len(results),
+        'errors_count': len(row_errors),
+        'timestamp': datetime.now().isoformat()
+    })
+
+
+@routes.route('/predict/batch', methods=['POST'])
+@routes.route('/models/<version>/predict/batch', methods=['POST'])
+def predict_batch(version: Optional[str] = None):
+    """
+    Endpoint para realizar predicciones por lotes.
+
+    Acepta una lista de registros (``[{...}, ...]`` o
+    ``{"instances": [{...}, ...]}``) o un payload columnar
+    (``{"columns": {"mean_radius": [...], ...}}``), o una matriz binaria
+    (ver ``api/binary_formats.py``). Todas las filas válidas se puntúan en una
+    sola pasada; las inválidas se devuelven con sus errores.
+
+    Args:
+        version: Versión del registro pedida en la ruta (ver ``_request_predictor``)
+
+    Returns:
+        JSON con un resultado por fila
+    """
+    current = _request_predictor(version)
+    
     try:
+        if request.mimetype in BINARY_CONTENT_TYPES:
+            return _predict_binary_batch(current)
+        
         if not request.is_json:
             logger.warning("Request sin Content-Type: application/json")
             return jsonify({
@@ -188,7 +1047,11 @@ def predict():
                 'message': 'Content-Type debe ser application/json'
             }), 400
         
-        data = request.get_json()
+        with STAGE_SECONDS.time('parse'):
+            data = request.get_json()
+        
+        if isinstance(data, dict) and 'instances' in data:
+            data = data['instances']
         
         if not data:
             logger.warning("Request body vacío")
@@ -197,37 +1060,205 @@ def predict():
                 'message': 'El body no puede estar vacío'
             }), 400
         
-        is_valid, errors = predictor.validate_input(data)
-        
-        if not is_valid:
-            logger.warning(f"Validación fallida: {errors}")
+        if isinstance(data, list):
+            n_rows = len(data)
+        elif isinstance(data, dict) and isinstance(data.get('columns'), dict):
+            n_rows = max((len(v) for v in data['columns'].values() if isinstance(v, list)), default=0)
+        else:
             return jsonify({
                 'error': 'Invalid input',
-                'message': 'Faltan features requeridas o valores inválidos',
-                'missing_features': errors,
-                'required_features': REQUIRED_FEATURES
+                'message': 'Se espera una lista de registros, "instances" o "columns"'
             }), 400
         
-        result = predictor.predict(data)
+        if n_rows > MAX_BATCH_SIZE:
+            logger.warning("Lote demasiado grande: %s filas", n_rows)
+            return jsonify({
+                'error': 'Batch too large',
+                'message': f'El lote no puede superar {MAX_BATCH_SIZE} filas'
+            }), 413
+        
+        if isinstance(data, list):
+            with STAGE_SECONDS.time('validate'):
+                features, row_errors = current.records_to_matrix(data)
+        else:
+            try:
+                with STAGE_SECONDS.time('validate'):
+                    features, row_errors = current.columns_to_matrix(data['columns'])
+            except ValueError as e:
+                logger.warning("Validación fallida: %s", e)
+                return jsonify({
+                    'error': 'Invalid input',
+                    'message': str(e),
+                    'required_features': REQUIRED_FEATURES
+                }), 400
+        
+        results = current.predict_batch(features, row_errors, use_cache=not _cache_bypassed())
         
-        return jsonify(result), 200
+        return _json_response({
+            'predictions': results,
+            'count': len(results),
+            'errors_count': len(row_errors),
+            'timestamp': datetime.now().isoformat()
+        })
     
     except BadRequest as e:
-        logger.error(f"Bad request: {e}")
+        logger.error("Bad request: %s", e)
         return jsonify({
             'error': 'Bad request',
             'message': str(e)
         }), 400
     
     except Exception as e:
-        logger.error(f"Error inesperado en predicción: {e}")
+        logger.error("Error inesperado en predicción por lotes: %s", e)
         return jsonify({
             'error': 'Prediction failed',
             'message': 'Error interno del servidor'
         }), 500
 
 
-@app.route('/features', methods=['GET'])
+@routes.route('/predict/stream', methods=['POST'])
+@routes.route('/models/<version>/predict/stream', methods=['POST'])
+def predict_stream(version: Optional[str] = None):
+    """
+    Endpoint de puntuación masiva en streaming.
+
+    Recibe un cuerpo JSONL (``application/x-ndjson``) o CSV (``text/csv``),
+    admite transferencia chunked y devuelve los resultados a medida que se
+    puntúa cada bloque de ``chunk_size`` registros (parámetro de query).
+    ``format`` elige el formato de salida (por defecto, el de entrada).
+
+    Args:
+        version: Versión del registro pedida en la ruta (ver ``_request_predictor``)
+
+    Returns:
+        Respuesta en streaming con un resultado por registro
+    """
+    current = _request_predictor(version)
+    
+    try:
+        input_format = detect_format(request.mimetype)
+    except ValueError:
+        logger.warning("Content-Type no soportado en streaming: %s", request.mimetype)
+        return jsonify({
+            'error': 'Invalid content type',
+            'message': 'Content-Type debe ser application/x-ndjson o text/csv'
+        }), 415
+    
+    output_format = request.args.get('format', input_format)
+    chunk_size = request.args.get('chunk_size', DEFAULT_CHUNK_SIZE, type=int)
+    if output_format not in STREAM_FORMATS or chunk_size < 1 or chunk_size > MAX_BATCH_SIZE:
+        return jsonify({
+            'error': 'Invalid input',
+            'message': f'format debe ser uno de {STREAM_FORMATS} y chunk_size estar entre 1 y {MAX_BATCH_SIZE}'
+        }), 400
+    
+    lines = io.TextIOWrapper(request.stream, encoding='utf-8', newline='')
+    results = score_stream(current, iter_records(lines, input_format), chunk_size,
+                           use_cache=not _cache_bypassed())
+    
+    def generate():
+        try:
+            yield from format_results(results, output_format, current.labels)
+        except Exception as e:
+            logger.error("Error en puntuación en streaming: %s", e)
+            raise
+    
+    mimetype = 'application/x-ndjson' if output_format == 'jsonl' else 'text/csv'
+    return Response(stream_with_context(generate()), mimetype=mimetype)
+
+
+@routes.route('/admin/reload', methods=['POST'])
+def reload_model():
+    """
+    Endpoint administrativo para recargar el modelo en caliente.
+
+    Con ``?wait=true`` espera a que la recarga termine. Exige ADMIN_TOKEN
+    en la cabecera ``X-Admin-Token``; sin ADMIN_TOKEN configurado el
+    endpoint está deshabilitado (la recarga sigue disponible con SIGHUP o
+    MODEL_WATCH_INTERVAL).
+
+    Returns:
+        JSON con el estado de la recarga
+    """
+    if not ADMIN_TOKEN:
+        logger.warning("Recarga del modelo rechazada: ADMIN_TOKEN no configurado")
+        return jsonify({
+            'error': 'Forbidden',
+            'message': 'Recarga por HTTP deshabilitada: configure ADMIN_TOKEN'
+        }), 403
+    
+    if not hmac.compare_digest(request.headers.get('X-Admin-Token', '').encode(), ADMIN_TOKEN.encode()):
+        logger.warning("Recarga del modelo rechazada: token inválido")
+        return jsonify({
+            'error': 'Forbidden',
+            'message': 'Token de administración inválido'
+        }), 403
+    
+    wait = request.args.get('wait', 'false').lower() == 'true'
+    result = reloader.reload(wait=wait)
+    
+    if result is None:
+        return jsonify({
+            'status': 'in_progress',
+            'reload': reloader.status()
+        }), 409
+    
+    if wait:
+        status_code = 200 if result else 500
+        return jsonify({
+            'status': 'reloaded' if result else 'failed',
+            'model_version': get_predictor().model_version,
+            'reload': reloader.status()
+        }), status_code
+    
+    return jsonify({
+        'status': 'reloading',
+        'reload': reloader.status()
+    }), 202
+
+
+@routes.route('/models', methods=['GET'])
+def list_models():
+    """
+    Endpoint con las versiones del registro y las cargadas en este proceso.
+
+    Returns:
+        JSON con la versión activa, las versiones publicadas y el estado del pool
+    """
+    return jsonify({
+        'active': _active_predictor.model_version if _active_predictor is not None else None,
+        'versions': model_registry.versions(),
+        'pool': model_pool.stats()
+    }), 200
+
+
+@routes.route('/shadow', methods=['GET'])
+def shadow_status():
+    """
+    Endpoint con la comparación del modelo en sombra con el activo.
+
+    Returns:
+        JSON con los contadores de la cola, el desacuerdo y las latencias
+        de ambos modelos en este proceso
+    """
+    if shadow_scorer is None:
+        return jsonify({'enabled': False}), 200
+    return jsonify({'enabled': True, **shadow_scorer.stats()}), 200
+
+
+@routes.route('/metrics', methods=['GET'])
+def metrics():
+    """
+    Endpoint de métricas en formato de texto de Prometheus.
+
+    Returns:
+        Latencias por etapa y por endpoint, contadores de peticiones,
+        errores, filas, tamaños de lote y caché de este proceso
+    """
+    return Response(REGISTRY.render(), content_type=METRICS_CONTENT_TYPE)
+
+
+@routes.route('/features', methods=['GET'])
 def get_features():
     """
     Endpoint para obtener la lista de features requeridas.
@@ -245,14 +1276,39 @@ def get_features():
         return jsonify(response), 200
     
     except Exception as e:
-        logger.error(f"Error obteniendo features: {e}")
+        logger.error("Error obteniendo features: %s", e)
         return jsonify({
             'error': 'Error',
             'message': str(e)
         }), 500
 
 
-@app.errorhandler(404)
+@routes.app_errorhandler(UnknownModelVersion)
+def unknown_model_version(error):
+    """
+    Manejador de versiones del modelo que no existen en el registro.
+    """
+    logger.warning("Versión del modelo no encontrada: %s", error)
+    return jsonify({
+        'error': 'Model version not found',
+        'message': str(error)
+    }), 404
+
+
+@routes.app_errorhandler(ModelNotReady)
+def model_not_ready(error):
+    """
+    Manejador de peticiones que llegan mientras el modelo se carga.
+    """
+    response = jsonify({
+        'error': 'Model not ready',
+        'message': str(error)
+    })
+    response.headers['Retry-After'] = str(READY_RETRY_AFTER)
+    return response, 503
+
+
+@routes.app_errorhandler(404)
 def not_found(error):
     """
     Manejador de errores 404.
@@ -263,18 +1319,71 @@ def not_found(error):
     }), 404
 
 
-@app.errorhandler(500)
+@routes.app_errorhandler(500)
 def internal_error(error):
     """
     Manejador de errores 500.
     """
-    logger.error(f"Error 500: {error}")
+    logger.error("Error 500: %s", error)
     return jsonify({
         'error': 'Internal server error',
         'message': 'Error interno del servidor'
     }), 500
 
 
+def create_app(startup_mode: str = STARTUP_MODE) -> Flask:
+    """
+    Crea la aplicación Flask y arranca la carga del modelo activo.
+
+    Importar este módulo no carga el modelo ni crea la app: ``api.app:app``
+    (Gunicorn, tests) la crea la primera vez que se accede a ``app``.
+
+    Args:
+        startup_mode: 'eager' carga el modelo antes de devolver la app;
+            'lazy' lo carga en un hilo en segundo plano (ver /health/ready)
+
+    Returns:
+        Aplicación Flask con todas las rutas registradas
+
+    Raises:
+        RuntimeError: Si el modelo no se pudo cargar (solo en modo 'eager')
+    """
+    if startup_mode not in STARTUP_MODES:
+        raise ValueError(f"startup_mode debe ser uno de {STARTUP_MODES}")
+    
+    flask_app = Flask(__name__)
+    flask_app.json = FastJSONProvider(flask_app)
+    flask_app.register_blueprint(routes)
+    
+    start = time.perf_counter()
+    load_default_model(background=startup_mode == 'lazy')
+    if startup_mode == 'eager':
+        logger.info("Modelo cargado al arrancar en %.2f s", time.perf_counter() - start)
+    else:
+        logger.info("Carga del modelo en segundo plano iniciada")
+    return flask_app
+
+
+_app: Optional[Flask] = None
+_app_lock = threading.Lock()
+
+
+def __getattr__(name: str):
+    """
+    Crea la app (``app``) y carga el predictor activo (``predictor``) solo
+    cuando se piden, para que importar el módulo no tenga efectos.
+    """
+    global _app
+    if name == 'app':
+        with _app_lock:
+            if _app is None:
+                _app = create_app()
+        return _app
+    if name == 'predictor':
+        return get_predictor()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 if __name__ == '__main__':
     logger.info("=" * 60)
     logger.info("Iniciando API de predicción de cáncer de mama")
@@ -283,4 +1392,6 @@ if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
     debug = os.environ.get('DEBUG', 'False').lower() == 'true'
     
-    app.run(host='0.0.0.0', port=port, debug=debug)
\ No newline at end of file
+    enable_hot_reload()
+    
+    create_app().run(host='0.0.0.0', port=port, debug=debug)
\ No newline at end of file
@@ -0,0 +1,405 @@
+"""
+Servidor ASGI asíncrono con micro-batching de predicciones.
+
+Expone sobre asyncio los endpoints de predicción (``/predict`` y
+``/predict/batch``, con los mismos formatos JSON y binarios), salud,
+features y métricas de ``api/app.py``, y respeta STARTUP_MODE. La
+puntuación en streaming, la recarga por HTTP y las rutas por versión
+(``/models/...``) solo están en la app Flask.
+
+Las peticiones concurrentes a ``/predict`` se agrupan con ``MicroBatcher`` y
+se puntúan como una sola matriz, lo que bajo carga multiplica el throughput
+por núcleo a cambio de una latencia adicional acotada.
+
+Uso:
+    uvicorn api.asgi:app --host 0.0.0.0 --port 5000
+"""
+
+import logging
+import os
+import sys
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from api.app import (
+    CACHE_BYPASS_HEADER, MAX_BATCH_SIZE, READY_RETRY_AFTER, REQUIRED_FEATURES, STARTUP_MODE, ModelNotReady,
+    enable_hot_reload, get_predictor, load_default_model, model_ready, reloader
+)
+from api.batching import MicroBatcher
+from api.binary_formats import BINARY_CONTENT_TYPES, decode as decode_binary
+from api.json_backend import dumps_bytes, loads
+from api.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, REGISTRY
+
+logger = logging.getLogger(__name__)
+
+MICROBATCH_MAX_SIZE = int(os.environ.get('MICROBATCH_MAX_SIZE', 64))
+MICROBATCH_MAX_WAIT_US = int(os.environ.get('MICROBATCH_MAX_WAIT_US', 1000))
+
+
+def _score_rows(features) -> list:
+    """
+    Puntúa un micro-lote con el predictor activo.
+    """
+    return get_predictor().predict_batch(features, {})
+
+
+batcher = MicroBatcher(
+    _score_rows,
+    max_batch_size=MICROBATCH_MAX_SIZE,
+    max_wait_us=MICROBATCH_MAX_WAIT_US
+)
+
+
+async def _read_body(receive) -> bytes:
+    """
+    Lee el cuerpo completo de la petición.
+    """
+    chunks = []
+    more_body = True
+    while more_body:
+        message = await receive()
+        chunks.append(message.get('body', b''))
+        more_body = message.get('more_body', False)
+    return b''.join(chunks)
+
+
+async def _send_json(send, status: int, payload: Dict, headers: Optional[List[Tuple[bytes, bytes]]] = None) -> None:
+    """
+    Envía una respuesta JSON.
+    """
+    body = dumps_bytes(payload)
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [
+            (b'content-type', b'application/json'),
+            (b'content-length', str(len(body)).encode()),
+            *(headers or [])
+        ]
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+def _cache_bypassed(scope: Dict) -> bool:
+    """
+    Indica si la petición pide saltarse la caché de predicciones.
+    """
+    headers = dict(scope.get('headers', []))
+    bypass = headers.get(CACHE_BYPASS_HEADER.lower().encode(), b'').lower() in (b'1', b'true', b'yes')
+    return bypass or b'no-cache' in headers.get(b'cache-control', b'').lower()
+
+
+def _content_type(scope: Dict) -> str:
+    """
+    Devuelve el Content-Type de la petición sin parámetros.
+    """
+    headers = dict(scope.get('headers', []))
+    return headers.get(b'content-type', b'').split(b';')[0].strip().decode('latin-1').lower()
+
+
+def _ready_predictor():
+    """
+    Devuelve el predictor activo, o lanza ModelNotReady si aún se carga.
+    """
+    if not model_ready():
+        raise ModelNotReady("El modelo se está cargando")
+    return get_predictor()
+
+
+def _parse_json(scope: Dict, body: bytes) -> Tuple[object, Tuple[int, Dict]]:
+    """
+    Valida el Content-Type y decodifica el cuerpo JSON.
+
+    Returns:
+        Tupla (datos, error). Si hay error, ``datos`` es None y ``error`` es
+        la tupla (status, payload) a devolver.
+    """
+    if _content_type(scope) != 'application/json':
+        logger.warning("Request sin Content-Type: application/json")
+        return None, (400, {
+            'error': 'Invalid content type',
+            'message': 'Content-Type debe ser application/json'
+        })
+
+    try:
+        return loads(body), None
+    except ValueError as e:
+        logger.error("Bad request: %s", e)
+        return None, (400, {'error': 'Bad request', 'message': 'JSON inválido'})
+
+
+async def health_check(scope, receive, send) -> None:
+    """
+    Endpoint de verificación del estado del servicio.
+    """
+    current = _ready_predictor()
+
+    await _send_json(send, 200, {
+        'status': 'ok',
+        'message': 'Breast Cancer Prediction API is running',
+        'version': '1.0.0',
+        'model_info': {
+            'type': current.metadata.get('model_type', 'N/A'),
+            'training_date': current.metadata.get('training_date', 'N/A'),
+            'features_count': len(REQUIRED_FEATURES),
+            'decision_threshold': current.decision_threshold,
+            'inference_backend': current.backend,
+            'version': current.model_version
+        },
+        'cache': current.cache.stats() if current.cache is not None else None,
+        'micro_batching': {
+            'max_batch_size': batcher.max_batch_size,
+            'max_wait_us': int(batcher.max_wait * 1_000_000),
+            'batches': batcher.batches,
+            'rows': batcher.rows
+        },
+        'timestamp': datetime.now().isoformat()
+    })
+
+
+async def liveness(scope, receive, send) -> None:
+    """
+    Endpoint de liveness: 503 solo si la carga inicial del modelo falló.
+    """
+    if not model_ready() and not reloader.loading and reloader.failures:
+        return await _send_json(send, 503, {
+            'status': 'failed',
+            'message': reloader.last_error
+        })
+    await _send_json(send, 200, {'status': 'alive'})
+
+
+async def readiness(scope, receive, send) -> None:
+    """
+    Endpoint de readiness: 503 mientras el modelo activo se carga.
+    """
+    ready = model_ready()
+    await _send_json(send, 200 if ready else 503, {
+        'status': 'ready' if ready else 'loading',
+        'startup_mode': STARTUP_MODE,
+        'model_version': get_predictor().model_version if ready else None,
+        'load': reloader.status()
+    }, headers=None if ready else [(b'retry-after', str(READY_RETRY_AFTER).encode())])
+
+
+async def get_features(scope, receive, send) -> None:
+    """
+    Endpoint para obtener la lista de features requeridas.
+    """
+    await _send_json(send, 200, {
+        'features': REQUIRED_FEATURES,
+        'count': len(REQUIRED_FEATURES),
+        'description': 'Lista de features requeridas para predicción'
+    })
+
+
+async def predict(scope, receive, send) -> None:
+    """
+    Endpoint de predicción individual (JSON o matriz binaria de una fila),
+    puntuado en micro-lotes.
+    """
+    current = _ready_predictor()
+    content_type = _content_type(scope)
+    body = await _read_body(receive)
+
+    if content_type in BINARY_CONTENT_TYPES:
+        try:
+            row, row_errors = decode_binary(body, content_type, current.schema.names)
+            if row.shape[0] != 1:
+                raise ValueError(f"Se espera una única fila, se recibieron {row.shape[0]}")
+        except ValueError as e:
+            logger.warning("Cuerpo binario inválido: %s", e)
+            return await _send_json(send, 400, {'error': 'Invalid input', 'message': str(e)})
+        errors = row_errors.get(0, [])
+    else:
+        data, error = _parse_json(scope, body)
+        if error:
+            return await _send_json(send, *error)
+
+        if not data or not isinstance(data, dict):
+            logger.warning("Request body vacío")
+            return await _send_json(send, 400, {
+                'error': 'Empty request',
+                'message': 'El body no puede estar vacío'
+            })
+
+        row, errors = current.parse_record(data)
+    if errors:
+        logger.warning("Validación fallida: %s", errors)
+        return await _send_json(send, 400, {
+            'error': 'Invalid input',
+            'message': 'Faltan features requeridas o valores inválidos',
+            'missing_features': errors,
+            'required_features': REQUIRED_FEATURES
+        })
+
+    try:
+        if _cache_bypassed(scope):
+            result = current.predict_batch(row, {}, use_cache=False)[0]
+        else:
+            result = await batcher.submit(row)
+    except Exception as e:
+        logger.error("Error inesperado en predicción: %s", e)
+        return await _send_json(send, 500, {
+            'error': 'Prediction failed',
+            'message': 'Error interno del servidor'
+        })
+
+    result = {key: value for key, value in result.items() if key != 'index'}
+    result['timestamp'] = datetime.now().isoformat()
+    await _send_json(send, 200, result)
+
+
+async def predict_batch(scope, receive, send) -> None:
+    """
+    Endpoint de predicción por lotes (lista de registros, ``instances``,
+    ``columns`` o matriz binaria).
+    """
+    current = _ready_predictor()
+    content_type = _content_type(scope)
+    body = await _read_body(receive)
+
+    try:
+        if content_type in BINARY_CONTENT_TYPES:
+            try:
+                features, row_errors = decode_binary(body, content_type, current.schema.names)
+            except ValueError as e:
+                logger.warning("Cuerpo binario inválido: %s", e)
+                return await _send_json(send, 400, {
+                    'error': 'Invalid input',
+                    'message': str(e),
+                    'required_features': REQUIRED_FEATURES
+                })
+            data = None
+            n_rows = features.shape[0]
+        else:
+            data, error = _parse_json(scope, body)
+            if error:
+                return await _send_json(send, *error)
+
+            if isinstance(data, dict) and 'instances' in data:
+                data = data['instances']
+
+            if isinstance(data, list):
+                n_rows = len(data)
+            elif isinstance(data, dict) and isinstance(data.get('columns'), dict):
+                n_rows = max((len(v) for v in data['columns'].values() if isinstance(v, list)), default=0)
+            elif not data:
+                n_rows = 0
+            else:
+                return await _send_json(send, 400, {
+                    'error': 'Invalid input',
+                    'message': 'Se espera una lista de registros, "instances" o "columns"'
+                })
+
+        if n_rows == 0:
+            logger.warning("Request body vacío")
+            return await _send_json(send, 400, {
+                'error': 'Empty request',
+                'message': 'El body no puede estar vacío'
+            })
+
+        if n_rows > MAX_BATCH_SIZE:
+            logger.warning("Lote demasiado grande: %s filas", n_rows)
+            return await _send_json(send, 413, {
+                'error': 'Batch too large',
+                'message': f'El lote no puede superar {MAX_BATCH_SIZE} filas'
+            })
+
+        if isinstance(data, list):
+            features, row_errors = current.records_to_matrix(data)
+        elif data is not None:
+            try:
+                features, row_errors = current.columns_to_matrix(data['columns'])
+            except ValueError as e:
+                logger.warning("Validación fallida: %s", e)
+                return await _send_json(send, 400, {
+                    'error': 'Invalid input',
+                    'message': str(e),
+                    'required_features': REQUIRED_FEATURES
+                })
+
+        results = current.predict_batch(features, row_errors, use_cache=not _cache_bypassed(scope))
+    except Exception as e:
+        logger.error("Error inesperado en predicción por lotes: %s", e)
+        return await _send_json(send, 500, {
+            'error': 'Prediction failed',
+            'message': 'Error interno del servidor'
+        })
+
+    await _send_json(send, 200, {
+        'predictions': results,
+        'count': len(results),
+        'errors_count': len(row_errors),
+        'timestamp': datetime.now().isoformat()
+    })
+
+
+async def metrics(scope, receive, send) -> None:
+    """
+    Endpoint de métricas en formato de texto de Prometheus.
+    """
+    body = REGISTRY.render().encode()
+    await send({
+        'type': 'http.response.start',
+        'status': 200,
+        'headers': [
+            (b'content-type', METRICS_CONTENT_TYPE.encode()),
+            (b'content-length', str(len(body)).encode())
+        ]
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+ROUTES = {
+    ('GET', '/'): health_check,
+    ('GET', '/features'): get_features,
+    ('GET', '/health/live'): liveness,
+    ('GET', '/health/ready'): readiness,
+    ('GET', '/metrics'): metrics,
+    ('POST', '/predict'): predict,
+    ('POST', '/predict/batch'): predict_batch
+}
+
+
+async def app(scope, receive, send) -> None:
+    """
+    Aplicación ASGI: despacha cada petición HTTP a su endpoint.
+    """
+    if scope['type'] == 'lifespan':
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                # Importar api.app no carga el modelo: en modo eager se carga
+                # aquí, para no hacerlo dentro del bucle de eventos con la
+                # primera petición; en modo lazy, en un hilo (ver /health/ready)
+                try:
+                    load_default_model(background=STARTUP_MODE == 'lazy')
+                except RuntimeError as e:
+                    await send({'type': 'lifespan.startup.failed', 'message': str(e)})
+                    return
+                enable_hot_reload()
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    if scope['type'] != 'http':
+        return
+
+    handler = ROUTES.get((scope['method'], scope['path']))
+    if handler is None:
+        return await _send_json(send, 404, {
+            'error': 'Not found',
+            'message': 'Endpoint no encontrado'
+        })
+
+    try:
+        await handler(scope, receive, send)
+    except ModelNotReady as e:
+        await _send_json(send, 503, {
+            'error': 'Model not ready',
+            'message': str(e)
+        }, headers=[(b'retry-after', str(READY_RETRY_AFTER).encode())])
@@ -0,0 +1,111 @@
+"""
+Micro-batching asíncrono de predicciones.
+
+Agrupa las filas que llegan de peticiones concurrentes durante una ventana
+acotada (tamaño máximo de lote y espera máxima en microsegundos), las puntúa
+como una única matriz y devuelve a cada petición su resultado.
+"""
+
+import asyncio
+import logging
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    """
+    Agrupador de filas para puntuarlas en lote desde un event loop asyncio.
+
+    La primera fila de un lote programa un vaciado tras ``max_wait_us``; si
+    antes se alcanzan ``max_batch_size`` filas, el lote se puntúa en el acto.
+    La latencia añadida a cada petición queda acotada por ``max_wait_us`` más
+    el tiempo de puntuar un lote.
+    """
+
+    def __init__(
+        self,
+        score_fn: Callable[[np.ndarray], List[Dict]],
+        max_batch_size: int = 64,
+        max_wait_us: int = 1000
+    ):
+        """
+        Inicializa el agrupador.
+
+        Args:
+            score_fn: Función que recibe una matriz N x n_features y devuelve
+                una lista de N resultados en el mismo orden
+            max_batch_size: Número máximo de filas por lote
+            max_wait_us: Espera máxima, en microsegundos, desde que llega la
+                primera fila de un lote hasta que se puntúa
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size debe ser mayor que 0")
+        if max_wait_us < 0:
+            raise ValueError("max_wait_us no puede ser negativo")
+
+        self.score_fn = score_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_us / 1_000_000
+        self._pending: List[Tuple[np.ndarray, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self.batches = 0
+        self.rows = 0
+
+    async def submit(self, row: np.ndarray) -> Dict:
+        """
+        Encola una fila y espera su resultado.
+
+        Args:
+            row: Vector de features de una petición
+
+        Returns:
+            Resultado de ``score_fn`` para esa fila
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((row, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        """
+        Puntúa las filas pendientes (hasta ``max_batch_size``) y resuelve
+        sus futuros.
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch = self._pending[:self.max_batch_size]
+        self._pending = self._pending[self.max_batch_size:]
+
+        if self._pending:
+            loop = asyncio.get_running_loop()
+            self._timer = loop.call_later(self.max_wait, self._flush)
+
+        if not batch:
+            return
+
+        self.batches += 1
+        self.rows += len(batch)
+
+        try:
+            results = self.score_fn(np.vstack([row for row, _ in batch]))
+        except Exception as e:
+            logger.error(f"Error puntuando micro-lote de {len(batch)} filas: {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
@@ -0,0 +1,206 @@
+"""
+Formatos binarios de entrada para clientes de alto volumen.
+
+Además de JSON, los endpoints de predicción aceptan matrices de features en
+tres formatos binarios, con las columnas en el orden de REQUIRED_FEATURES:
+
+- ``application/x-feature-matrix``: cabecera de 16 bytes seguida de la
+  matriz float32 o float64 little-endian por filas (ver ``encode_raw``).
+- ``application/x-npy``: un array NumPy serializado con ``np.save``.
+- ``application/vnd.apache.arrow.stream`` / ``.file``: una tabla Arrow IPC
+  con una columna por feature (requiere pyarrow, opcional).
+
+Las matrices raw y .npy se decodifican sin copia: el array que recibe el
+modelo es una vista sobre el cuerpo de la petición. Las tablas Arrow son
+columnares, así que se copian una vez para formar la matriz por filas.
+"""
+
+import importlib.util
+import io
+import struct
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from api.schema import non_finite_row_errors, not_a_number_error
+
+# pyarrow se importa con la primera tabla Arrow, no al arrancar la API
+HAS_PYARROW = importlib.util.find_spec('pyarrow') is not None
+
+RAW_CONTENT_TYPE = 'application/x-feature-matrix'
+NPY_CONTENT_TYPE = 'application/x-npy'
+ARROW_STREAM_CONTENT_TYPE = 'application/vnd.apache.arrow.stream'
+ARROW_FILE_CONTENT_TYPE = 'application/vnd.apache.arrow.file'
+
+BINARY_CONTENT_TYPES = (RAW_CONTENT_TYPE, NPY_CONTENT_TYPE) + (
+    (ARROW_STREAM_CONTENT_TYPE, ARROW_FILE_CONTENT_TYPE) if HAS_PYARROW else ()
+)
+
+# Cabecera raw: magia, versión, bytes por valor (4 u 8), reservado, filas, columnas
+RAW_MAGIC = b'BCFM'
+RAW_VERSION = 1
+RAW_HEADER = struct.Struct('<4sBBHII')
+RAW_DTYPES = {4: np.dtype('<f4'), 8: np.dtype('<f8')}
+
+
+def encode_raw(features: np.ndarray) -> bytes:
+    """
+    Serializa una matriz de features en el formato raw.
+
+    Args:
+        features: Matriz N x n_features float32 o float64
+
+    Returns:
+        Cabecera seguida de los valores little-endian por filas
+    """
+    features = np.asarray(features)
+    if features.ndim != 2 or features.dtype.itemsize not in RAW_DTYPES or features.dtype.kind != 'f':
+        raise ValueError("Se espera una matriz 2-D float32 o float64")
+
+    dtype = RAW_DTYPES[features.dtype.itemsize]
+    header = RAW_HEADER.pack(RAW_MAGIC, RAW_VERSION, dtype.itemsize, 0, *features.shape)
+    return header + np.ascontiguousarray(features, dtype=dtype).tobytes()
+
+
+def decode_raw(body: bytes, n_features: int) -> np.ndarray:
+    """
+    Decodifica una matriz raw sin copiar los datos.
+
+    Args:
+        body: Cuerpo de la petición
+        n_features: Número de columnas esperado
+
+    Returns:
+        Vista de solo lectura N x n_features sobre ``body``
+    """
+    if len(body) < RAW_HEADER.size:
+        raise ValueError("Cuerpo demasiado corto para la cabecera")
+
+    magic, version, itemsize, _, n_rows, n_columns = RAW_HEADER.unpack_from(body)
+    if magic != RAW_MAGIC or version != RAW_VERSION:
+        raise ValueError("Cabecera de matriz no reconocida")
+    if itemsize not in RAW_DTYPES:
+        raise ValueError("Los valores deben ser float32 o float64")
+    if n_columns != n_features:
+        raise ValueError(f"Se esperan {n_features} columnas, se recibieron {n_columns}")
+    if len(body) != RAW_HEADER.size + n_rows * n_columns * itemsize:
+        raise ValueError("El tamaño del cuerpo no coincide con la cabecera")
+
+    features = np.frombuffer(body, dtype=RAW_DTYPES[itemsize], count=n_rows * n_columns, offset=RAW_HEADER.size)
+    return features.reshape(n_rows, n_columns)
+
+
+def decode_npy(body: bytes, n_features: int) -> np.ndarray:
+    """
+    Decodifica un array ``.npy`` sin copiar los datos.
+
+    Args:
+        body: Cuerpo de la petición (salida de ``np.save``)
+        n_features: Número de columnas esperado
+
+    Returns:
+        Vista de solo lectura N x n_features sobre ``body``
+    """
+    header = io.BytesIO(body)
+    try:
+        version = np.lib.format.read_magic(header)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(header)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(header)
+    except ValueError as e:
+        raise ValueError(f"Archivo .npy inválido: {e}")
+
+    if dtype.kind != 'f':
+        raise ValueError("Los valores deben ser float32 o float64")
+    if len(shape) == 1:
+        shape = (1,) + shape
+    if len(shape) != 2 or shape[1] != n_features:
+        raise ValueError(f"Se espera una matriz N x {n_features}, se recibió {shape}")
+
+    count = shape[0] * shape[1]
+    if len(body) - header.tell() != count * dtype.itemsize:
+        raise ValueError("El tamaño del cuerpo no coincide con la cabecera")
+
+    features = np.frombuffer(body, dtype=dtype, count=count, offset=header.tell())
+    if fortran_order:
+        return features.reshape(shape[::-1]).T
+    return features.reshape(shape)
+
+
+def decode_arrow(body: bytes, feature_names: Sequence[str],
+                 stream: bool = True) -> Tuple[np.ndarray, Dict[int, List[str]]]:
+    """
+    Decodifica una tabla Arrow IPC con una columna por feature.
+
+    Args:
+        body: Cuerpo de la petición
+        feature_names: Columnas requeridas, en el orden del modelo
+        stream: True para el formato stream, False para el formato file
+
+    Returns:
+        Tupla (matriz_de_features, errores_por_fila). Las filas con valores
+        nulos se reportan como errores.
+    """
+    if not HAS_PYARROW:
+        raise ValueError("pyarrow no está instalado")
+    import pyarrow
+    import pyarrow.ipc
+
+    try:
+        buffer = pyarrow.py_buffer(body)
+        reader = pyarrow.ipc.open_stream(buffer) if stream else pyarrow.ipc.open_file(buffer)
+        table = reader.read_all()
+    except pyarrow.ArrowInvalid as e:
+        raise ValueError(f"Tabla Arrow inválida: {e}")
+
+    missing_features = [name for name in feature_names if name not in table.column_names]
+    if missing_features:
+        raise ValueError(f"Faltan columnas requeridas: {missing_features}")
+
+    features = np.empty((table.num_rows, len(feature_names)), dtype=np.float64)
+    row_errors = {}
+
+    for j, name in enumerate(feature_names):
+        column = table.column(name)
+        if not (pyarrow.types.is_floating(column.type) or pyarrow.types.is_integer(column.type)):
+            raise ValueError(f"La columna '{name}' debe ser numérica")
+        features[:, j] = column.to_numpy()
+        if column.null_count:
+            for i in np.flatnonzero(column.is_null().to_numpy(zero_copy_only=False)).tolist():
+                row_errors.setdefault(i, []).append(not_a_number_error(name))
+
+    return features, row_errors
+
+
+def decode(body: bytes, content_type: str, feature_names: Sequence[str]) -> Tuple[np.ndarray, Dict[int, List[str]]]:
+    """
+    Decodifica un cuerpo binario según su Content-Type.
+
+    Args:
+        body: Cuerpo de la petición
+        content_type: Uno de BINARY_CONTENT_TYPES
+        feature_names: Columnas requeridas, en el orden del modelo
+
+    Returns:
+        Tupla (matriz_de_features, errores_por_fila). Las filas con NaN o
+        infinitos se reportan como errores.
+
+    Raises:
+        ValueError: Si el cuerpo no es válido para el formato
+    """
+    if content_type == RAW_CONTENT_TYPE:
+        features, row_errors = decode_raw(body, len(feature_names)), {}
+    elif content_type == NPY_CONTENT_TYPE:
+        features, row_errors = decode_npy(body, len(feature_names)), {}
+    elif content_type in (ARROW_STREAM_CONTENT_TYPE, ARROW_FILE_CONTENT_TYPE):
+        features, row_errors = decode_arrow(body, feature_names, stream=content_type == ARROW_STREAM_CONTENT_TYPE)
+    else:
+        raise ValueError(f"Content-Type no soportado: {content_type}")
+
+    # NaN e infinitos se reportan por fila como en JSON (los nulos de Arrow
+    # ya tienen su error)
+    for i, errors in non_finite_row_errors(features, feature_names).items():
+        reported = row_errors.setdefault(i, [])
+        reported.extend(error for error in errors if error not in reported)
+    return features, row_errors
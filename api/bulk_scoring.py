@@ -0,0 +1,212 @@
+"""
+Puntuación masiva en streaming de archivos JSONL y CSV.
+
+Los registros se leen como un flujo, se agrupan en bloques de tamaño fijo,
+cada bloque se puntúa vectorizado con ``ModelPredictor`` y los resultados se
+escriben de inmediato. La memoria usada depende del tamaño de bloque, no del
+tamaño de la entrada.
+
+Uso:
+    python api/bulk_scoring.py entrada.jsonl -o salida.jsonl --chunk-size 1000
+"""
+
+import argparse
+import csv
+import io
+import logging
+import os
+import sys
+import time
+from typing import Dict, Iterable, Iterator, List, Optional
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from api.json_backend import dumps, loads
+
+logger = logging.getLogger(__name__)
+
+STREAM_FORMATS = ('jsonl', 'csv')
+DEFAULT_CHUNK_SIZE = int(os.environ.get('STREAM_CHUNK_SIZE', 1000))
+ID_FIELD = 'id'
+
+
+def detect_format(name: str) -> str:
+    """
+    Deduce el formato a partir de una extensión de archivo o un Content-Type.
+
+    Args:
+        name: Nombre de archivo o Content-Type
+
+    Returns:
+        'jsonl' o 'csv'
+    """
+    name = name.lower()
+    if name.endswith(('.jsonl', '.ndjson')):
+        return 'jsonl'
+    if name.endswith('.csv'):
+        return 'csv'
+    if 'ndjson' in name or 'jsonl' in name:
+        return 'jsonl'
+    if 'csv' in name:
+        return 'csv'
+    raise ValueError(f"Formato no soportado: {name}. Use uno de {STREAM_FORMATS}")
+
+
+def iter_records(lines: Iterable[str], fmt: str) -> Iterator[Optional[Dict]]:
+    """
+    Lee registros de un flujo de líneas de texto.
+
+    Args:
+        lines: Iterable de líneas (por ejemplo, un archivo abierto en texto)
+        fmt: 'jsonl' o 'csv'
+
+    Yields:
+        Un diccionario por registro, o None si la línea no es JSON válido
+    """
+    if fmt == 'csv':
+        yield from csv.DictReader(lines)
+        return
+
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield loads(line)
+        except ValueError:
+            yield None
+
+
+def score_stream(predictor, records: Iterable[Optional[Dict]], chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 id_field: str = ID_FIELD, use_cache: bool = False) -> Iterator[Dict]:
+    """
+    Puntúa un flujo de registros en bloques de ``chunk_size``.
+
+    Args:
+        predictor: ModelPredictor con el modelo cargado
+        records: Iterable de registros
+        chunk_size: Registros por bloque
+        id_field: Campo identificador que se copia al resultado si existe
+        use_cache: Si es True consulta y actualiza la caché de predicciones;
+            por defecto no, para que un archivo grande no desaloje las
+            entradas del tráfico online
+
+    Yields:
+        Un resultado (o error) por registro, en el orden de entrada y con el
+        índice global del registro
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size debe ser mayor que 0")
+
+    chunk: List[Optional[Dict]] = []
+    offset = 0
+
+    def flush() -> List[Dict]:
+        features, row_errors = predictor.records_to_matrix(chunk)
+        results = predictor.predict_batch(features, row_errors, use_cache=use_cache)
+        for record, result in zip(chunk, results):
+            result['index'] += offset
+            if isinstance(record, dict) and id_field in record:
+                result[id_field] = record[id_field]
+        return results
+
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= chunk_size:
+            yield from flush()
+            offset += len(chunk)
+            chunk = []
+
+    if chunk:
+        yield from flush()
+
+
+def format_results(results: Iterable[Dict], fmt: str, labels: List[str],
+                   id_field: str = ID_FIELD) -> Iterator[str]:
+    """
+    Serializa resultados como líneas JSONL o filas CSV.
+
+    Args:
+        results: Resultados de ``score_stream``
+        fmt: 'jsonl' o 'csv'
+        labels: Etiquetas de las clases (``ModelPredictor.labels``)
+        id_field: Campo identificador
+
+    Yields:
+        Fragmentos de texto listos para escribir
+    """
+    if fmt == 'jsonl':
+        for result in results:
+            yield dumps(result) + '\n'
+        return
+
+    probability_columns = [f"probability_{label.lower()}" for label in labels]
+    columns = ['index', id_field, 'prediction', 'prediction_label', *probability_columns, 'confidence', 'error']
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns, extrasaction='ignore')
+    writer.writeheader()
+
+    for result in results:
+        row = dict(result)
+        for label, column in zip(labels, probability_columns):
+            row[column] = result.get('probability', {}).get(label)
+        if 'errors' in result:
+            row['error'] = '; '.join(result['errors'])
+        writer.writerow(row)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+def main(argv=None):
+    """
+    Puntúa un archivo JSONL o CSV desde la línea de comandos.
+    """
+    parser = argparse.ArgumentParser(description="Puntuación masiva en streaming de archivos JSONL/CSV")
+    parser.add_argument('input', help="Archivo de entrada ('-' para la entrada estándar)")
+    parser.add_argument('-o', '--output', default='-', help="Archivo de salida ('-' para la salida estándar)")
+    parser.add_argument('--input-format', choices=STREAM_FORMATS, help='Por defecto se deduce de la extensión')
+    parser.add_argument('--output-format', choices=STREAM_FORMATS, help='Por defecto, el de entrada')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='Registros por bloque')
+    parser.add_argument('--id-field', default=ID_FIELD, help='Campo identificador que se copia a la salida')
+    args = parser.parse_args(argv)
+
+    from api.app import get_predictor
+
+    try:
+        input_format = args.input_format or detect_format(args.input)
+        output_format = args.output_format or (
+            detect_format(args.output) if args.output != '-' else input_format
+        )
+    except ValueError as e:
+        parser.error(f"{e}; indique --input-format/--output-format")
+    predictor = get_predictor()
+
+    source = sys.stdin if args.input == '-' else open(args.input, newline='', encoding='utf-8')
+    sink = sys.stdout if args.output == '-' else open(args.output, 'w', newline='', encoding='utf-8')
+
+    stats = {'count': 0, 'errors': 0}
+
+    def tally(results: Iterable[Dict]) -> Iterator[Dict]:
+        for result in results:
+            stats['count'] += 1
+            stats['errors'] += 'error' in result
+            yield result
+
+    start = time.perf_counter()
+    try:
+        results = score_stream(predictor, iter_records(source, input_format), args.chunk_size, args.id_field)
+        for fragment in format_results(tally(results), output_format, predictor.labels, args.id_field):
+            sink.write(fragment)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+
+    elapsed = time.perf_counter() - start
+    logger.info(f"Puntuados {stats['count']} registros ({stats['errors']} con errores) en {elapsed:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+"""
+Caché en proceso de resultados de predicción.
+
+Las probabilidades de cada fila se guardan en un LRU con expiración (TTL)
+indexado por un hash de los 30 valores de features canonicalizados y de la
+versión del modelo, de modo que un cambio de modelo invalida las entradas
+anteriores automáticamente.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+import numpy as np
+
+
+class PredictionCache:
+    """
+    Caché LRU con TTL, segura entre hilos, de probabilidades por fila.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl_seconds: float = 300.0):
+        """
+        Inicializa la caché.
+
+        Args:
+            max_size: Número máximo de entradas
+            ttl_seconds: Segundos de validez de cada entrada (0 = sin expiración)
+        """
+        if max_size < 1:
+            raise ValueError("max_size debe ser mayor que 0")
+
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[bytes, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(row: np.ndarray, model_version: str) -> bytes:
+        """
+        Calcula la clave de una fila de features.
+
+        Los valores se canonicalizan a float64, con -0.0 convertido en 0.0 y
+        un único NaN, para que entradas equivalentes compartan clave.
+
+        Args:
+            row: Vector de features en el orden de REQUIRED_FEATURES
+            model_version: Identificador de la versión del modelo
+
+        Returns:
+            Digest de 16 bytes
+        """
+        canonical = np.asarray(row, dtype=np.float64) + 0.0
+        canonical = np.where(np.isnan(canonical), np.nan, canonical)
+        digest = hashlib.blake2b(model_version.encode(), digest_size=16)
+        digest.update(np.ascontiguousarray(canonical).tobytes())
+        return digest.digest()
+
+    def get(self, key: bytes) -> Optional[np.ndarray]:
+        """
+        Devuelve el valor asociado a la clave, o None si no existe o expiró.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: bytes, value: np.ndarray) -> None:
+        """
+        Guarda un valor, desalojando la entrada menos usada si está llena.
+        """
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds > 0 else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """
+        Elimina todas las entradas.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        """
+        Devuelve tamaño y contadores de la caché.
+        """
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
@@ -0,0 +1,159 @@
+"""
+Motor de inferencia compilado para el Random Forest.
+
+Este módulo puntúa el bosque a partir de los arrays planos exportados por
+``models/train_model.py`` (feature, threshold, children y value por nodo),
+recorriendo todos los árboles de forma vectorizada con NumPy. No depende de
+scikit-learn ni de joblib, por lo que evita el coste de importación y el
+despacho por árbol de ``RandomForestClassifier.predict_proba``.
+
+Los artefactos son directorios de archivos ``.npy`` que se mapean en memoria
+(``mmap_mode='r'``): la carga es casi instantánea y todos los workers
+comparten una única copia de los arrays en la caché de páginas del sistema.
+"""
+
+import os
+from typing import Dict
+
+import numpy as np
+
+FOREST_ARRAYS = ('feature', 'threshold', 'children', 'value', 'roots')
+FOREST_SCALARS = ('max_depth', 'n_features', 'classes', 'fused')
+
+
+class CompiledForest:
+    """
+    Bosque aplanado en arrays contiguos que reproduce ``predict_proba`` de
+    scikit-learn.
+
+    Todos los nodos de todos los árboles comparten un único espacio de
+    índices. Las hojas son sus propios hijos en ``children``, de modo que
+    ``max_depth`` iteraciones llevan cada fila a su hoja en cada árbol.
+    """
+
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        """
+        Inicializa el motor a partir de los arrays exportados. Si ya tienen
+        el tipo y la disposición esperados no se copian, por lo que los
+        arrays mapeados en memoria siguen compartidos.
+
+        Args:
+            arrays: Diccionario con los arrays de ``FOREST_ARRAYS`` y los
+                escalares ``max_depth``, ``n_features`` y ``classes``
+        """
+        missing = [name for name in FOREST_ARRAYS if name not in arrays]
+        if missing:
+            raise ValueError(f"Artefacto compilado incompleto, faltan: {missing}")
+
+        self.feature = np.ascontiguousarray(arrays['feature'], dtype=np.intp)
+        self.threshold = np.ascontiguousarray(arrays['threshold'], dtype=np.float64)
+        # Hijos intercalados: children[2 * nodo] es el izquierdo y
+        # children[2 * nodo + 1] el derecho, para avanzar con un solo take.
+        self.children = np.ascontiguousarray(arrays['children'], dtype=np.intp)
+        self.value = np.ascontiguousarray(arrays['value'], dtype=np.float64)
+        self.roots = np.ascontiguousarray(arrays['roots'], dtype=np.intp)
+        self.max_depth = int(arrays['max_depth'])
+        self.n_features_in_ = int(arrays['n_features'])
+        self.classes_ = np.asarray(arrays['classes'])
+        self.n_estimators = len(self.roots)
+        # Un bosque fusionado tiene los umbrales en el espacio crudo y recibe
+        # las features sin escalar; se compara en float64 sin redondear.
+        self.fused = bool(arrays.get('fused', False))
+        self.input_dtype = np.float64 if self.fused else np.float32
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> 'CompiledForest':
+        """
+        Carga el motor desde el directorio generado en el entrenamiento.
+
+        Args:
+            path: Directorio del artefacto compilado
+            mmap: Si es True los arrays se mapean en memoria en solo lectura;
+                si es False se leen completos en memoria privada del proceso
+
+        Returns:
+            Instancia de CompiledForest
+        """
+        if not os.path.isdir(path):
+            raise FileNotFoundError(f"Artefacto compilado no encontrado: {path}")
+
+        # Solo se mapean los arrays que usa el motor: los artefactos de
+        # versiones anteriores pueden incluir otros (p. ej. left y right)
+        arrays = {}
+        for filename in os.listdir(path):
+            name, extension = os.path.splitext(filename)
+            if extension == '.npy' and name in FOREST_ARRAYS + FOREST_SCALARS:
+                arrays[name] = np.load(
+                    os.path.join(path, filename),
+                    mmap_mode='r' if mmap else None,
+                    allow_pickle=False
+                )
+        return cls(arrays)
+
+    def apply(self, X: np.ndarray) -> np.ndarray:
+        """
+        Devuelve el índice global de la hoja alcanzada por cada fila en cada
+        árbol.
+
+        Args:
+            X: Matriz N x n_features
+
+        Returns:
+            Matriz N x n_estimators de índices de nodo
+        """
+        # scikit-learn compara en float32 contra umbrales float64; se replica
+        # el mismo redondeo para obtener exactamente las mismas hojas.
+        with np.errstate(over='ignore'):
+            X = np.asarray(X, dtype=self.input_dtype)
+        if X.ndim != 2 or X.shape[1] != self.n_features_in_:
+            raise ValueError(
+                f"Se esperaban {self.n_features_in_} features, se recibió shape {X.shape}"
+            )
+        # Un NaN siempre iría a la izquierda y un infinito a un extremo: como
+        # scikit-learn, se rechazan (también los valores que desbordan float32).
+        if not np.isfinite(X).all():
+            raise ValueError("La entrada contiene NaN, infinito o un valor demasiado grande para float32")
+
+        n_rows = X.shape[0]
+        X_flat = np.ravel(X)
+        row_offsets = (np.arange(n_rows, dtype=np.intp) * self.n_features_in_)[:, None]
+        nodes = np.tile(self.roots, (n_rows, 1))
+
+        for _ in range(self.max_depth):
+            values = np.take(X_flat, row_offsets + np.take(self.feature, nodes))
+            go_right = values > np.take(self.threshold, nodes)
+            nodes = np.take(self.children, 2 * nodes + go_right)
+
+        return nodes
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """
+        Calcula las probabilidades de clase promediando las hojas de todos
+        los árboles, en el mismo orden de suma que scikit-learn.
+
+        Args:
+            X: Matriz N x n_features
+
+        Returns:
+            Matriz N x n_classes de probabilidades
+        """
+        leaf_values = np.take(self.value, self.apply(X), axis=0)
+
+        probabilities = np.zeros((leaf_values.shape[0], leaf_values.shape[2]), dtype=np.float64)
+        for tree in range(self.n_estimators):
+            probabilities += leaf_values[:, tree]
+        probabilities /= self.n_estimators
+
+        return probabilities
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """
+        Predice la clase de cada fila.
+
+        Args:
+            X: Matriz N x n_features
+
+        Returns:
+            Vector de clases predichas
+        """
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
@@ -0,0 +1,71 @@
+"""
+Configuración de Gunicorn para servir la API en producción.
+
+Uso:
+    gunicorn -c api/gunicorn_config.py api.app:app
+
+El modelo se carga una sola vez en el proceso maestro (``preload_app``) antes
+de crear los workers. Tras el ``fork`` los workers comparten esas páginas de
+memoria copy-on-write en lugar de mantener cada uno su propia copia del bosque.
+
+Con ``STARTUP_MODE=lazy`` no se precarga: cada worker importa la app (sin
+joblib ni scikit-learn), empieza a aceptar conexiones enseguida y carga el
+modelo en segundo plano; ``/health/ready`` indica cuándo puede predecir.
+Con ``MODEL_MMAP=true`` los workers siguen compartiendo el bosque a través
+de la caché de páginas del sistema.
+"""
+
+import gc
+import multiprocessing
+import os
+
+# Los pools BLAS/OpenMP se limitan antes de que la app (precargada) importe
+# NumPy: con varios workers cada pool con todos los núcleos sobresuscribe la CPU.
+for _variable in ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS',
+                  'BLIS_NUM_THREADS', 'VECLIB_MAXIMUM_THREADS', 'NUMEXPR_NUM_THREADS'):
+    os.environ.setdefault(_variable, os.environ.get('NATIVE_THREADS', '1'))
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count()))
+threads = int(os.environ.get('GUNICORN_THREADS', 1))
+worker_class = 'gthread' if threads > 1 else 'sync'
+
+preload_app = os.environ.get('STARTUP_MODE', 'eager').lower() != 'lazy'
+
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 0))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 0))
+
+accesslog = os.environ.get('GUNICORN_ACCESSLOG')
+errorlog = '-'
+loglevel = os.environ.get('GUNICORN_LOGLEVEL', 'info')
+
+
+def pre_fork(server, worker):
+    """
+    Congela los objetos ya creados en el maestro antes de cada fork.
+
+    Así el recolector de basura de los workers no recorre (ni escribe en las
+    cabeceras de) los objetos del modelo precargado, y sus páginas siguen
+    compartidas entre procesos.
+    """
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    """
+    Registra el arranque de cada worker.
+    """
+    server.log.info(f"Worker iniciado (pid: {worker.pid})")
+
+
+def post_worker_init(worker):
+    """
+    Activa la recarga en caliente del modelo en cada worker (SIGHUP enviado
+    al worker o vigilante de artefactos con MODEL_WATCH_INTERVAL).
+    """
+    from api.app import enable_hot_reload
+    enable_hot_reload()
@@ -0,0 +1,110 @@
+"""
+Backend JSON intercambiable para peticiones y respuestas.
+
+Con ``JSON_BACKEND=auto`` (por defecto) se usa orjson si está instalado y, si
+no, el módulo ``json`` de la biblioteca estándar. La API Flask, el servidor
+ASGI y la puntuación en streaming codifican y decodifican a través de este
+módulo, de modo que el backend se cambia en un solo sitio.
+"""
+
+import json
+import logging
+import os
+from typing import Any, Union
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depende del entorno
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+JSON_BACKENDS = ('auto', 'orjson', 'stdlib')
+JSON_BACKEND = os.environ.get('JSON_BACKEND', 'auto').lower()
+
+
+def _resolve_backend(name: str) -> str:
+    """
+    Elige el backend efectivo.
+
+    Args:
+        name: 'auto', 'orjson' o 'stdlib'
+
+    Returns:
+        'orjson' o 'stdlib'
+    """
+    if name not in JSON_BACKENDS:
+        raise ValueError(f"JSON_BACKEND debe ser uno de {JSON_BACKENDS}")
+    if name == 'stdlib':
+        return 'stdlib'
+    if orjson is None:
+        if name == 'orjson':
+            logger.warning("orjson no está instalado, se usa json de la biblioteca estándar")
+        return 'stdlib'
+    return 'orjson'
+
+
+BACKEND = _resolve_backend(JSON_BACKEND)
+
+if BACKEND == 'orjson':
+    _ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY
+
+    def dumps_bytes(obj: Any) -> bytes:
+        """
+        Codifica un objeto como JSON compacto en UTF-8.
+        """
+        return orjson.dumps(obj, option=_ORJSON_OPTIONS)
+
+    def dumps(obj: Any) -> str:
+        """
+        Codifica un objeto como texto JSON compacto.
+        """
+        return orjson.dumps(obj, option=_ORJSON_OPTIONS).decode()
+
+    loads = orjson.loads
+else:
+    _encoder = json.JSONEncoder(separators=(',', ':'))
+
+    def dumps_bytes(obj: Any) -> bytes:
+        """
+        Codifica un objeto como JSON compacto en UTF-8.
+        """
+        return _encoder.encode(obj).encode()
+
+    def dumps(obj: Any) -> str:
+        """
+        Codifica un objeto como texto JSON compacto.
+        """
+        return _encoder.encode(obj)
+
+    def loads(data: Union[str, bytes]) -> Any:
+        """
+        Decodifica texto o bytes JSON.
+        """
+        return json.loads(data)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    Proveedor JSON de Flask que usa el backend configurado.
+
+    Con el backend 'stdlib' se comporta igual que el proveedor por defecto.
+    """
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if BACKEND == 'stdlib' or kwargs:
+            return super().dumps(obj, **kwargs)
+        return dumps(obj)
+
+    def loads(self, s: Union[str, bytes], **kwargs: Any) -> Any:
+        if BACKEND == 'stdlib' or kwargs:
+            return super().loads(s, **kwargs)
+        return loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        if BACKEND == 'stdlib' or self._app.debug:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps_bytes(obj), mimetype=self.mimetype)
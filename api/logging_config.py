@@ -0,0 +1,153 @@
+"""
+Logging estructurado, asíncrono y muestreado para la API.
+
+Los registros se encolan en el hilo de la petición (``QueueHandler``) y un
+hilo en segundo plano (``QueueListener``) los formatea y escribe, de modo que
+el lock del handler y la escritura en el stream quedan fuera del camino de
+la petición. Con ``LOG_FORMAT=json`` cada registro es una línea JSON.
+
+Los logs por predicción se muestrean con ``PREDICTION_LOG_SAMPLE_RATE``
+(fracción entre 0 y 1) y solo se formatean si el registro se emite.
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+from typing import Optional
+
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO').upper()
+LOG_FORMAT = os.environ.get('LOG_FORMAT', 'json').lower()
+PREDICTION_LOG_SAMPLE_RATE = float(os.environ.get('PREDICTION_LOG_SAMPLE_RATE', 1.0))
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Atributos estándar de LogRecord; el resto se considera un campo extra
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[logging.handlers.QueueHandler] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formatea cada registro como una línea JSON con los campos extra.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'timestamp': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage()
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exception'] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class _PrerenderingQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler que no formatea en el hilo de la petición.
+
+    El ``prepare`` estándar formatea el mensaje antes de encolarlo; aquí solo
+    se conservan los argumentos y el formato se hace en el hilo del listener.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.exc_info:
+            # La traza no puede viajar a otro hilo de forma fiable: se renderiza aquí
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class PredictionSampler:
+    """
+    Decide si se registra cada predicción según la tasa de muestreo.
+    """
+
+    def __init__(self, rate: float = PREDICTION_LOG_SAMPLE_RATE):
+        """
+        Args:
+            rate: Fracción de predicciones a registrar (0 = ninguna, 1 = todas)
+        """
+        if not 0.0 <= rate <= 1.0:
+            raise ValueError("La tasa de muestreo debe estar entre 0 y 1")
+        self.rate = rate
+
+    def __call__(self) -> bool:
+        return self.rate >= 1.0 or (self.rate > 0.0 and random.random() < self.rate)
+
+
+def _build_formatter() -> logging.Formatter:
+    """
+    Devuelve el formateador configurado con LOG_FORMAT.
+    """
+    if LOG_FORMAT == 'json':
+        return JsonFormatter()
+    return logging.Formatter(TEXT_FORMAT)
+
+
+def _start_listener() -> None:
+    """
+    Crea una cola nueva y arranca el hilo que escribe los registros.
+    """
+    global _listener
+
+    stream_handler = logging.StreamHandler(sys.stderr)
+    stream_handler.setFormatter(_build_formatter())
+
+    log_queue = queue.SimpleQueue()
+    _queue_handler.queue = log_queue
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    _listener.start()
+
+
+def _restart_after_fork() -> None:
+    """
+    En el proceso hijo el hilo del listener no existe: se arranca uno nuevo
+    (los workers de Gunicorn se crean con fork tras importar la app).
+    """
+    if _queue_handler is not None:
+        _start_listener()
+
+
+def stop_logging() -> None:
+    """
+    Vacía la cola y detiene el hilo del listener.
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def configure_logging() -> None:
+    """
+    Configura el logger raíz con un QueueHandler y el listener en segundo
+    plano. Es idempotente.
+    """
+    global _queue_handler
+    if _queue_handler is not None:
+        return
+
+    _queue_handler = _PrerenderingQueueHandler(queue.SimpleQueue())
+    root = logging.getLogger()
+    root.setLevel(LOG_LEVEL)
+    root.addHandler(_queue_handler)
+    _start_listener()
+
+    atexit.register(stop_logging)
+    if hasattr(os, 'register_at_fork'):
+        os.register_at_fork(after_in_child=_restart_after_fork)
@@ -0,0 +1,269 @@
+"""
+Métricas de latencia y throughput en formato de texto de Prometheus.
+
+Cada hilo escribe en su propio fragmento (shard) de cada métrica, de modo
+que registrar una observación no toma ningún lock: solo el hilo dueño
+modifica su fragmento. Al exponer ``/metrics`` se suman los fragmentos de
+todos los hilos. Las métricas son por proceso; con varios workers de
+Gunicorn cada uno expone las suyas.
+"""
+
+import bisect
+import math
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+LATENCY_BUCKETS = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5
+)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 4096, 10000)
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = '') -> str:
+    """
+    Formatea las etiquetas de una muestra: ``{a="1",b="2"}``.
+    """
+    pairs = [
+        '{}="{}"'.format(name, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for name, value in zip(names, values)
+    ]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value: float) -> str:
+    """
+    Formatea un valor numérico de una muestra.
+    """
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """
+    Base de las métricas: un fragmento de datos por hilo.
+    """
+
+    metric_type = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards: List[Dict] = []
+        self._shards_lock = threading.Lock()
+
+    def _shard(self) -> Dict:
+        """
+        Devuelve el fragmento del hilo actual, creándolo la primera vez.
+        """
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = {}
+            with self._shards_lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+            return shard
+
+    def _snapshot(self) -> List[Dict]:
+        """
+        Copia superficial de los fragmentos de todos los hilos.
+        """
+        with self._shards_lock:
+            shards = list(self._shards)
+        return [dict(shard) for shard in shards]
+
+    def render(self) -> List[str]:
+        """
+        Devuelve las líneas de la métrica en formato de texto.
+        """
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.metric_type}"]
+        lines.extend(self._samples())
+        return lines
+
+    def _samples(self) -> Iterable[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """
+    Contador monótono con etiquetas.
+    """
+
+    metric_type = 'counter'
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        """
+        Incrementa el contador para los valores de etiqueta dados.
+        """
+        shard = self._shard()
+        shard[labels] = shard.get(labels, 0) + amount
+
+    def values(self) -> Dict[Tuple, float]:
+        """
+        Devuelve el total por combinación de etiquetas.
+        """
+        totals: Dict[Tuple, float] = {}
+        for shard in self._snapshot():
+            for labels, value in shard.items():
+                totals[labels] = totals.get(labels, 0) + value
+        return totals
+
+    def _samples(self) -> Iterable[str]:
+        for labels, value in sorted(self.values().items()):
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+
+
+class Histogram(_Metric):
+    """
+    Histograma con buckets fijos y etiquetas.
+    """
+
+    metric_type = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels: str) -> None:
+        """
+        Registra una observación para los valores de etiqueta dados.
+        """
+        self._observe(value, labels)
+
+    def _observe(self, value: float, labels: Tuple) -> None:
+        shard = self._shard()
+        entry = shard.get(labels)
+        if entry is None:
+            # [conteos por bucket (el último es +Inf), suma]
+            entry = shard[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+        entry[0][bisect.bisect_left(self.buckets, value)] += 1
+        entry[1] += value
+
+    def time(self, *labels: str) -> '_Timer':
+        """
+        Context manager que observa la duración del bloque en segundos.
+        """
+        return _Timer(self, labels)
+
+    def values(self) -> Dict[Tuple, Tuple[List[int], float]]:
+        """
+        Devuelve (conteos por bucket, suma) por combinación de etiquetas.
+        """
+        totals: Dict[Tuple, Tuple[List[int], float]] = {}
+        for shard in self._snapshot():
+            for labels, (counts, total) in shard.items():
+                counts = list(counts)
+                if labels in totals:
+                    previous_counts, previous_total = totals[labels]
+                    counts = [a + b for a, b in zip(previous_counts, counts)]
+                    total += previous_total
+                totals[labels] = (counts, total)
+        return totals
+
+    def _samples(self) -> Iterable[str]:
+        bounds = [_format_value(bound) for bound in self.buckets] + ['+Inf']
+        for labels, (counts, total) in sorted(self.values().items()):
+            cumulative = 0
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                bucket_labels = _format_labels(self.labelnames, labels, 'le="' + bound + '"')
+                yield f"{self.name}_bucket{bucket_labels} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(total)}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, labels)} {cumulative}"
+
+
+class CallbackMetric(_Metric):
+    """
+    Métrica cuyos valores se leen de una función al exponerla (por ejemplo,
+    los contadores de la caché de predicciones).
+    """
+
+    def __init__(self, name: str, documentation: str, metric_type: str,
+                 callback: Callable[[], Dict[Tuple, float]], labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self.metric_type = metric_type
+        self.callback = callback
+
+    def _samples(self) -> Iterable[str]:
+        for labels, value in sorted(self.callback().items()):
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+
+
+class _Timer:
+    """
+    Mide la duración de un bloque ``with`` y la registra en un histograma.
+    """
+
+    __slots__ = ('histogram', 'labels', 'start')
+
+    def __init__(self, histogram: Histogram, labels: Tuple):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self) -> '_Timer':
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.histogram._observe(time.perf_counter() - self.start, self.labels)
+
+
+class Registry:
+    """
+    Conjunto de métricas expuestas en ``/metrics``.
+    """
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        """
+        Añade una métrica y la devuelve.
+        """
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """
+        Devuelve todas las métricas en formato de texto de Prometheus.
+        """
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+REQUESTS = REGISTRY.register(Counter(
+    'http_requests_total', 'Peticiones HTTP atendidas', ('endpoint', 'method', 'status')
+))
+REQUEST_ERRORS = REGISTRY.register(Counter(
+    'http_request_errors_total', 'Peticiones con respuesta de error (4xx o 5xx)', ('endpoint', 'kind')
+))
+REQUEST_SECONDS = REGISTRY.register(Histogram(
+    'http_request_duration_seconds', 'Duración total de cada petición', ('endpoint',)
+))
+STAGE_SECONDS = REGISTRY.register(Histogram(
+    'prediction_stage_duration_seconds',
+    'Duración de cada etapa de una predicción (parse, validate, scale, model, serialize)',
+    ('stage',)
+))
+BATCH_SIZE = REGISTRY.register(Histogram(
+    'prediction_batch_size', 'Filas puntuadas por llamada al modelo', buckets=BATCH_SIZE_BUCKETS
+))
+ROWS = REGISTRY.register(Counter(
+    'prediction_rows_total', 'Filas recibidas para puntuar', ('outcome',)
+))
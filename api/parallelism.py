@@ -0,0 +1,115 @@
+"""
+Control del paralelismo intra-operación en la inferencia.
+
+El modelo se entrena con ``n_jobs=-1`` y ese valor queda guardado en el
+pickle: sin control, cada ``predict_proba`` de una sola fila despacharía
+hilos de joblib en todos los núcleos, compitiendo con los demás workers.
+Aquí la inferencia es serie por defecto y solo los lotes de al menos
+``PARALLEL_BATCH_THRESHOLD`` filas se reparten por bloques de filas en un
+pool de ``INFERENCE_N_JOBS`` hilos propio de cada proceso.
+
+Los pools nativos (BLAS/OpenMP) se limitan a ``NATIVE_THREADS`` hilos por
+proceso con ``limit_native_threads``; ``api/gunicorn_config.py`` fija además
+las variables ``*_NUM_THREADS`` antes de que la app importe NumPy.
+"""
+
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Por defecto cada worker usa su parte de los núcleos
+WEB_CONCURRENCY = max(1, int(os.environ.get('WEB_CONCURRENCY', 1)))
+INFERENCE_N_JOBS = int(os.environ.get('INFERENCE_N_JOBS', max(1, (os.cpu_count() or 1) // WEB_CONCURRENCY)))
+PARALLEL_BATCH_THRESHOLD = int(os.environ.get('PARALLEL_BATCH_THRESHOLD', 5000))
+NATIVE_THREADS = int(os.environ.get('NATIVE_THREADS', 1))
+
+
+def limit_native_threads(n_threads: int = NATIVE_THREADS) -> bool:
+    """
+    Limita en caliente los pools nativos ya cargados en el proceso.
+
+    Usa ``threadpoolctl`` (dependencia de scikit-learn) si está instalado.
+
+    Args:
+        n_threads: Hilos máximos de cada pool BLAS/OpenMP
+
+    Returns:
+        True si se aplicó el límite, False si threadpoolctl no está disponible
+    """
+    try:
+        from threadpoolctl import threadpool_limits
+    except ImportError:
+        logger.warning("threadpoolctl no está instalado: solo se aplican las variables de entorno")
+        return False
+
+    threadpool_limits(limits=n_threads)
+    return True
+
+
+class ParallelScorer:
+    """
+    Puntúa una matriz con ``model.predict_proba`` en serie o, para lotes
+    grandes, repartiendo bloques de filas en un pool de hilos.
+
+    Las filas se puntúan de forma independiente, por lo que el resultado es
+    idéntico al de una sola llamada. El pool se crea la primera vez que se
+    necesita y se vuelve a crear si el proceso cambia (tras un fork los
+    hilos del padre no existen).
+    """
+
+    def __init__(self, n_jobs: int = INFERENCE_N_JOBS, threshold: int = PARALLEL_BATCH_THRESHOLD):
+        """
+        Args:
+            n_jobs: Hilos del pool (1 = siempre en serie)
+            threshold: Filas mínimas de un lote para puntuarlo en paralelo
+        """
+        if n_jobs < 1:
+            raise ValueError("n_jobs debe ser al menos 1")
+        if threshold < 1:
+            raise ValueError("threshold debe ser al menos 1")
+        self.n_jobs = n_jobs
+        self.threshold = threshold
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def is_parallel(self, n_rows: int) -> bool:
+        """
+        Indica si un lote de ``n_rows`` filas se puntúa en paralelo.
+        """
+        return self.n_jobs > 1 and n_rows >= self.threshold
+
+    def predict_proba(self, model, features: np.ndarray) -> np.ndarray:
+        """
+        Calcula las probabilidades de la matriz con el modelo dado.
+
+        Args:
+            model: Objeto con ``predict_proba`` (bosque compilado o sklearn)
+            features: Matriz N x n_features ya preparada para el modelo
+
+        Returns:
+            Matriz N x n_classes de probabilidades
+        """
+        if not self.is_parallel(features.shape[0]):
+            return model.predict_proba(features)
+
+        blocks = np.array_split(features, min(self.n_jobs, features.shape[0]))
+        return np.concatenate(list(self._pool().map(model.predict_proba, blocks)))
+
+    def _pool(self) -> ThreadPoolExecutor:
+        """
+        Devuelve el pool de hilos del proceso actual, creándolo si hace falta.
+        """
+        pid = os.getpid()
+        if self._executor is None or self._executor_pid != pid:
+            with self._lock:
+                if self._executor is None or self._executor_pid != pid:
+                    self._executor = ThreadPoolExecutor(self.n_jobs, thread_name_prefix='inference')
+                    self._executor_pid = pid
+        return self._executor
@@ -0,0 +1,359 @@
+"""
+Registro local de versiones del modelo y pool LRU de versiones cargadas.
+
+Cada versión publicada se guarda en un directorio inmutable cuyo nombre es
+el SHA-256 de su contenido (``<raíz>/<digest>/``): publicar dos veces los
+mismos artefactos no crea una copia nueva y un directorio publicado nunca se
+reescribe. ``index.json`` asocia cada digest con su número de versión y
+guarda los alias (``latest``); se sustituye de forma atómica.
+
+La API mantiene varias versiones cargadas a la vez en ``ModelPool``, un LRU
+acotado por la memoria estimada de los artefactos: las comparaciones A/B y
+las vueltas atrás no requieren reiniciar workers ni volver a leer pickles.
+"""
+
+import copy
+import hashlib
+import json
+import logging
+import os
+import shutil
+import stat
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILE = 'index.json'
+MIN_DIGEST_PREFIX = 6
+
+
+class UnknownModelVersion(LookupError):
+    """
+    La referencia no corresponde a ninguna versión del registro.
+    """
+
+
+def content_digest(path: str) -> str:
+    """
+    SHA-256 del contenido de un directorio de artefactos: rutas relativas y
+    bytes de todos los archivos, en orden.
+
+    Args:
+        path: Directorio de artefactos
+
+    Returns:
+        Digest hexadecimal
+    """
+    digest = hashlib.sha256()
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for name in sorted(files):
+            file_path = os.path.join(root, name)
+            digest.update(os.path.relpath(file_path, path).replace(os.sep, '/').encode())
+            digest.update(b'\0')
+            with open(file_path, 'rb') as artifact:
+                for block in iter(lambda: artifact.read(1 << 20), b''):
+                    digest.update(block)
+    return digest.hexdigest()
+
+
+def directory_bytes(path: str) -> int:
+    """
+    Tamaño total de los archivos de un directorio (o de un archivo).
+    """
+    if not os.path.isdir(path):
+        return os.path.getsize(path)
+    return sum(
+        os.path.getsize(os.path.join(root, name))
+        for root, _, files in os.walk(path)
+        for name in files
+    )
+
+
+class ModelRegistry:
+    """
+    Registro de versiones del modelo en el sistema de archivos.
+    """
+
+    def __init__(self, root: str):
+        """
+        Args:
+            root: Directorio raíz del registro (se crea al publicar)
+        """
+        self.root = root
+        self._lock = threading.Lock()
+        # (clave del archivo, índice) en una sola tupla para sustituirla con
+        # una única asignación: la clave nunca queda desemparejada del índice
+        self._index_cache: Optional[Tuple[Tuple, Dict]] = None
+
+    def publish(self, artifact_paths: List[str], version: Optional[int] = None,
+                metadata: Optional[Dict] = None, alias: Optional[str] = 'latest') -> str:
+        """
+        Copia un conjunto de artefactos a un directorio inmutable del registro.
+
+        Args:
+            artifact_paths: Archivos y directorios del artefacto
+            version: Número de versión (por defecto, el siguiente)
+            metadata: Datos adicionales para el índice (fecha, versión padre...)
+            alias: Alias que pasa a apuntar a esta versión (None = ninguno)
+
+        Returns:
+            Digest de la versión publicada
+        """
+        os.makedirs(self.root, exist_ok=True)
+        staging = os.path.join(self.root, f".staging-{os.getpid()}-{threading.get_ident()}")
+        shutil.rmtree(staging, ignore_errors=True)
+        os.makedirs(staging)
+        try:
+            for path in artifact_paths:
+                target = os.path.join(staging, os.path.basename(path))
+                if os.path.isdir(path):
+                    shutil.copytree(path, target)
+                else:
+                    shutil.copy2(path, target)
+
+            digest = content_digest(staging)
+            final_path = os.path.join(self.root, digest)
+            if os.path.exists(final_path):
+                logger.info("La versión %s ya estaba publicada", digest[:12])
+            else:
+                _make_read_only(staging)
+                try:
+                    os.rename(staging, final_path)
+                except OSError:
+                    # Otro proceso publicó el mismo contenido a la vez
+                    if not os.path.exists(final_path):
+                        raise
+                logger.info("Versión %s publicada en %s", digest[:12], final_path)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+        with self._lock:
+            index = copy.deepcopy(self._read_index())
+            entry = index['versions'].get(digest)
+            if entry is None:
+                numbers = [item['version'] for item in index['versions'].values()]
+                entry = {
+                    'version': version if version is not None else max(numbers, default=0) + 1,
+                    'published': datetime.now().isoformat(),
+                    **(metadata or {})
+                }
+                index['versions'][digest] = entry
+            if alias:
+                index['aliases'][alias] = digest
+            self._write_index(index)
+
+        return digest
+
+    def resolve(self, ref: str) -> str:
+        """
+        Traduce una referencia a un digest.
+
+        Acepta el digest completo, un prefijo único de al menos
+        ``MIN_DIGEST_PREFIX`` caracteres, un número de versión (``3`` o
+        ``v3``) o un alias (``latest``).
+
+        Raises:
+            UnknownModelVersion: Si la referencia no existe o es ambigua
+        """
+        ref = str(ref).strip()
+        index = self._read_index()
+        versions = index['versions']
+
+        if ref in index['aliases']:
+            return index['aliases'][ref]
+        if ref in versions:
+            return ref
+
+        number = ref[1:] if ref[:1] in ('v', 'V') else ref
+        if number.isdigit():
+            matches = [digest for digest, entry in versions.items() if entry.get('version') == int(number)]
+            if matches:
+                return max(matches, key=lambda digest: versions[digest].get('published', ''))
+
+        if len(ref) >= MIN_DIGEST_PREFIX:
+            matches = [digest for digest in versions if digest.startswith(ref.lower())]
+            if len(matches) == 1:
+                return matches[0]
+            if len(matches) > 1:
+                raise UnknownModelVersion(f"Referencia ambigua: {ref}")
+
+        raise UnknownModelVersion(f"Versión del modelo no encontrada: {ref}")
+
+    def path(self, ref: str) -> str:
+        """
+        Directorio de artefactos de una referencia.
+        """
+        return os.path.join(self.root, self.resolve(ref))
+
+    def set_alias(self, alias: str, ref: str) -> str:
+        """
+        Hace que un alias apunte a una versión (p. ej. para volver atrás).
+
+        Returns:
+            Digest al que apunta el alias
+        """
+        digest = self.resolve(ref)
+        with self._lock:
+            index = copy.deepcopy(self._read_index())
+            index['aliases'][alias] = digest
+            self._write_index(index)
+        return digest
+
+    def versions(self) -> List[Dict]:
+        """
+        Versiones publicadas, de la más reciente a la más antigua.
+        """
+        index = self._read_index()
+        entries = [dict(entry, digest=digest) for digest, entry in index['versions'].items()]
+        for entry in entries:
+            entry['aliases'] = sorted(a for a, digest in index['aliases'].items() if digest == entry['digest'])
+        return sorted(entries, key=lambda entry: (entry.get('version', 0), entry.get('published', '')), reverse=True)
+
+    def _read_index(self) -> Dict:
+        """
+        Devuelve el índice, releyéndolo solo si el archivo ha cambiado (las
+        peticiones resuelven versiones con un ``stat`` y sin parsear JSON).
+        No debe modificarse el diccionario devuelto.
+        """
+        path = os.path.join(self.root, INDEX_FILE)
+        try:
+            info = os.stat(path)
+        except FileNotFoundError:
+            return {'versions': {}, 'aliases': {}}
+        key = (info.st_ino, info.st_mtime_ns, info.st_size)
+        cached = self._index_cache
+        if cached is None or cached[0] != key:
+            with open(path) as index_file:
+                cached = (key, json.load(index_file))
+            self._index_cache = cached
+        return cached[1]
+
+    def _write_index(self, index: Dict) -> None:
+        path = os.path.join(self.root, INDEX_FILE)
+        tmp_path = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+        with open(tmp_path, 'w') as index_file:
+            json.dump(index, index_file, indent=2, sort_keys=True)
+        os.replace(tmp_path, path)
+
+
+def _make_read_only(path: str) -> None:
+    """
+    Quita el permiso de escritura a todos los archivos de un directorio.
+    """
+    for root, _, files in os.walk(path):
+        for name in files:
+            file_path = os.path.join(root, name)
+            os.chmod(file_path, os.stat(file_path).st_mode & ~(stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH))
+
+
+class ModelPool:
+    """
+    Versiones del modelo cargadas, en un LRU acotado por memoria y seguro
+    entre hilos.
+
+    Cada versión se carga una sola vez aunque lleguen varias peticiones a la
+    vez. Al superar ``max_bytes`` se descartan las versiones usadas hace más
+    tiempo; la recién cargada se conserva siempre.
+    """
+
+    def __init__(self, registry: ModelRegistry, load_fn: Callable[[str, str], object], max_bytes: int):
+        """
+        Args:
+            registry: Registro del que se cargan las versiones
+            load_fn: Función ``(directorio, digest) -> predictor`` que carga y
+                valida una versión; el predictor debe exponer ``memory_bytes``
+            max_bytes: Memoria máxima estimada del pool
+        """
+        if max_bytes < 1:
+            raise ValueError("max_bytes debe ser mayor que 0")
+        self.registry = registry
+        self.load_fn = load_fn
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, object]" = OrderedDict()
+        self._load_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.loads = 0
+        self.evictions = 0
+
+    def get(self, ref: str):
+        """
+        Devuelve el predictor de una versión, cargándolo si hace falta.
+
+        Raises:
+            UnknownModelVersion: Si la versión no está en el registro
+        """
+        digest = self.registry.resolve(ref)
+        with self._lock:
+            predictor = self._lookup(digest)
+            if predictor is not None:
+                return predictor
+            load_lock = self._load_locks.setdefault(digest, threading.Lock())
+
+        with load_lock:
+            with self._lock:
+                predictor = self._lookup(digest)
+                if predictor is not None:
+                    return predictor
+
+            try:
+                start = time.perf_counter()
+                predictor = self.load_fn(os.path.join(self.registry.root, digest), digest)
+                logger.info("Versión %s cargada en %.2f s", digest[:12], time.perf_counter() - start)
+
+                with self._lock:
+                    self._entries[digest] = predictor
+                    self.loads += 1
+                    self._evict(keep=digest)
+            finally:
+                # También si la carga falla (artefactos corruptos, validación):
+                # la siguiente petición vuelve a intentarlo con un lock nuevo
+                with self._lock:
+                    if self._load_locks.get(digest) is load_lock:
+                        del self._load_locks[digest]
+        return predictor
+
+    def _lookup(self, digest: str):
+        predictor = self._entries.get(digest)
+        if predictor is not None:
+            self._entries.move_to_end(digest)
+            self.hits += 1
+        return predictor
+
+    def _evict(self, keep: str) -> None:
+        """
+        Descarta las versiones menos usadas hasta caber en ``max_bytes``.
+        """
+        while self.memory_bytes() > self.max_bytes and len(self._entries) > 1:
+            digest = next(iter(self._entries))
+            if digest == keep:
+                self._entries.move_to_end(digest)
+                continue
+            del self._entries[digest]
+            self.evictions += 1
+            logger.info("Versión %s descargada del pool", digest[:12])
+
+    def memory_bytes(self) -> int:
+        """
+        Memoria estimada de las versiones cargadas.
+        """
+        return sum(getattr(predictor, 'memory_bytes', 0) for predictor in list(self._entries.values()))
+
+    def stats(self) -> Dict:
+        """
+        Versiones cargadas (de la menos a la más reciente) y contadores.
+        """
+        with self._lock:
+            return {
+                'loaded': list(self._entries),
+                'memory_bytes': self.memory_bytes(),
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'loads': self.loads,
+                'evictions': self.evictions
+            }
@@ -0,0 +1,176 @@
+"""
+Recarga en caliente del modelo sin tiempo de inactividad.
+
+El nuevo predictor se carga, valida y calienta en un hilo en segundo plano
+mientras el actual sigue atendiendo peticiones. Solo si todo es correcto se
+sustituye la referencia en una única asignación atómica: cada petición usa el
+predictor que tomó al empezar, de modo que nunca ve una mezcla de modelo y
+scaler de versiones distintas.
+"""
+
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class ModelReloader:
+    """
+    Coordina las recargas del modelo: como mucho una en curso a la vez.
+    """
+
+    def __init__(self, load_fn: Callable[[], object], swap_fn: Callable[[object], None]):
+        """
+        Inicializa el coordinador.
+
+        Args:
+            load_fn: Función que carga, valida y calienta un predictor nuevo;
+                debe lanzar una excepción si los artefactos no son válidos
+            swap_fn: Función que publica el predictor nuevo
+        """
+        self.load_fn = load_fn
+        self.swap_fn = swap_fn
+        self._lock = threading.Lock()
+        self._watcher: Optional[threading.Thread] = None
+        self.loading = False
+        self.reloads = 0
+        self.failures = 0
+        self.last_reload: Optional[str] = None
+        self.last_error: Optional[str] = None
+        self.last_duration_seconds: Optional[float] = None
+
+    def reload(self, wait: bool = False) -> Optional[bool]:
+        """
+        Lanza una recarga en segundo plano.
+
+        Args:
+            wait: Si es True espera a que termine
+
+        Returns:
+            None si no se lanzó porque ya había una recarga en curso; True si
+            se lanzó (con ``wait=True``, True si tuvo éxito y False si falló)
+        """
+        if not self._lock.acquire(blocking=False):
+            logger.info("Recarga del modelo ya en curso, se ignora la solicitud")
+            return None
+
+        self.loading = True
+        # Resultado propio de esta recarga: tras el join, last_error puede
+        # ser ya el de otra recarga posterior
+        outcome: Dict = {}
+        thread = threading.Thread(target=self._run, args=(outcome,), name='model-reload', daemon=True)
+        thread.start()
+
+        if wait:
+            thread.join()
+            return outcome.get('error') is None
+        return True
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Espera a que termine la recarga en curso, si la hay.
+
+        Args:
+            timeout: Segundos máximos de espera (None = sin límite)
+
+        Returns:
+            True si no queda ninguna recarga en curso
+        """
+        if not self._lock.acquire(timeout=-1 if timeout is None else timeout):
+            return False
+        self._lock.release()
+        return True
+
+    def _run(self, outcome: Dict) -> None:
+        """
+        Carga el predictor nuevo y lo publica si es válido.
+
+        Args:
+            outcome: Diccionario donde se anota el error de esta recarga
+                (``'error'``, None si tuvo éxito)
+        """
+        start = time.perf_counter()
+        try:
+            logger.info("Recargando modelo en segundo plano")
+            new_predictor = self.load_fn()
+            self.swap_fn(new_predictor)
+            self.reloads += 1
+            self.last_error = outcome['error'] = None
+            self.last_reload = datetime.now().isoformat()
+            logger.info(f"Modelo recargado (versión: {getattr(new_predictor, 'model_version', 'N/A')})")
+        except Exception as e:
+            self.failures += 1
+            self.last_error = outcome['error'] = str(e)
+            logger.error(f"Recarga del modelo fallida, se mantiene el modelo actual: {e}")
+        finally:
+            self.last_duration_seconds = time.perf_counter() - start
+            self.loading = False
+            self._lock.release()
+
+    def watch(self, paths: Iterable[str], interval: float) -> threading.Thread:
+        """
+        Vigila los artefactos y recarga cuando cambian.
+
+        Un cambio solo dispara la recarga cuando la firma de los archivos
+        (tamaño y fecha de modificación) se mantiene estable durante un
+        intervalo completo, para no leer artefactos a medio escribir.
+
+        Args:
+            paths: Archivos a vigilar
+            interval: Segundos entre comprobaciones
+
+        Returns:
+            Hilo del vigilante (daemon)
+        """
+        paths = list(paths)
+        if self._watcher is not None and self._watcher.is_alive():
+            return self._watcher
+
+        def signature() -> Tuple:
+            entries = []
+            for path in paths:
+                try:
+                    stat = os.stat(path)
+                    entries.append((path, stat.st_size, stat.st_mtime_ns))
+                except OSError:
+                    entries.append((path, None, None))
+            return tuple(entries)
+
+        def run() -> None:
+            current = signature()
+            pending = None
+            while True:
+                time.sleep(interval)
+                observed = signature()
+                if observed == current:
+                    pending = None
+                elif observed == pending:
+                    logger.info("Cambio detectado en los artefactos del modelo")
+                    if self.reload():
+                        current = observed
+                        pending = None
+                else:
+                    pending = observed
+
+        self._watcher = threading.Thread(target=run, name='model-watcher', daemon=True)
+        self._watcher.start()
+        logger.info(f"Vigilando artefactos del modelo cada {interval}s")
+        return self._watcher
+
+    def status(self) -> Dict:
+        """
+        Devuelve el estado de las recargas.
+        """
+        return {
+            'loading': self.loading,
+            'reloads': self.reloads,
+            'failures': self.failures,
+            'last_reload': self.last_reload,
+            'last_error': self.last_error,
+            'last_duration_seconds': self.last_duration_seconds,
+            'watching': self._watcher is not None and self._watcher.is_alive()
+        }
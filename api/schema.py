@@ -0,0 +1,161 @@
+"""
+Esquema compilado de features para validar y convertir registros de entrada.
+
+El esquema se construye una sola vez a partir de la metadata del modelo y
+convierte cada registro en un vector float64 en una única pasada. Si el
+registro no es válido, se recorre de nuevo para reportar todos los campos
+erróneos a la vez en lugar de solo el primero.
+
+``float()`` acepta ``"nan"``, ``"inf"`` y ``1e999``: los valores no finitos
+se rechazan con el mismo error que los no numéricos, ya que el bosque no
+puede puntuarlos.
+"""
+
+import math
+import operator
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+NOT_A_DICT_ERROR = 'El registro debe ser un objeto JSON'
+
+
+def not_a_number_error(name: str) -> str:
+    """
+    Mensaje de error para una feature con un valor no numérico o no finito.
+    """
+    return f"Feature '{name}' debe ser un número"
+
+
+def non_finite_row_errors(features: np.ndarray, names: Iterable[str]) -> Dict[int, List[str]]:
+    """
+    Errores de las filas de una matriz con NaN o infinitos.
+
+    Args:
+        features: Matriz N x n_features
+        names: Nombres de las columnas, en orden
+
+    Returns:
+        Errores por fila (vacío si toda la matriz es finita)
+    """
+    finite = np.isfinite(features)
+    if finite.all():
+        return {}
+    names = tuple(names)
+    row_errors: Dict[int, List[str]] = {}
+    for i, j in zip(*np.nonzero(~finite)):
+        row_errors.setdefault(int(i), []).append(not_a_number_error(names[j]))
+    return row_errors
+
+
+class FeatureSchema:
+    """
+    Orden de columnas y conversión de registros a vectores de features.
+    """
+
+    def __init__(self, feature_names: Iterable[str]):
+        """
+        Inicializa el esquema.
+
+        Args:
+            feature_names: Nombres de las features en el orden del modelo
+        """
+        self.names = tuple(feature_names)
+        if not self.names:
+            raise ValueError("El esquema necesita al menos una feature")
+
+        self.n_features = len(self.names)
+        # Extrae los valores en el orden de las columnas con una sola llamada
+        self._getter = operator.itemgetter(*self.names)
+        if self.n_features == 1:
+            getter = self._getter
+            self._getter = lambda data: (getter(data),)
+
+    @classmethod
+    def from_metadata(cls, metadata: Optional[Dict], default: Iterable[str]) -> 'FeatureSchema':
+        """
+        Construye el esquema a partir de la metadata del modelo.
+
+        Los nombres de sklearn ('mean radius') se normalizan al formato de la
+        API ('mean_radius').
+
+        Args:
+            metadata: Metadata del modelo (puede no incluir ``feature_names``)
+            default: Nombres a usar si la metadata no los incluye
+
+        Returns:
+            Esquema de features
+        """
+        feature_names = (metadata or {}).get('feature_names')
+        if feature_names is None:
+            return cls(default)
+        return cls(str(name).replace(' ', '_') for name in feature_names)
+
+    def parse(self, data: Dict) -> Tuple[Optional[np.ndarray], List[str]]:
+        """
+        Valida un registro y lo convierte en un vector de features.
+
+        Args:
+            data: Diccionario con las features
+
+        Returns:
+            Tupla (vector, errores). Si hay errores el vector es None; los
+            errores son el nombre de cada feature ausente y un mensaje por
+            cada valor no numérico o no finito.
+        """
+        try:
+            row = np.fromiter(map(float, self._getter(data)), dtype=np.float64, count=self.n_features)
+        except (KeyError, ValueError, TypeError):
+            return None, self.errors(data)
+        if not np.isfinite(row).all():
+            return None, self.errors(data)
+        return row, []
+
+    def errors(self, data: Dict) -> List[str]:
+        """
+        Devuelve todos los errores de validación de un registro.
+
+        Args:
+            data: Diccionario con las features
+
+        Returns:
+            Lista de errores en el orden del esquema (vacía si es válido)
+        """
+        if not isinstance(data, dict):
+            return [NOT_A_DICT_ERROR]
+
+        errors = []
+        for name in self.names:
+            if name not in data:
+                errors.append(name)
+                continue
+            try:
+                valid = math.isfinite(float(data[name]))
+            except (ValueError, TypeError):
+                valid = False
+            if not valid:
+                errors.append(not_a_number_error(name))
+        return errors
+
+    def parse_many(self, records: List) -> Tuple[np.ndarray, Dict[int, List[str]]]:
+        """
+        Convierte una lista de registros en una matriz N x n_features.
+
+        Args:
+            records: Lista de diccionarios con las features
+
+        Returns:
+            Tupla (matriz_de_features, errores_por_fila). Las filas con
+            errores quedan a cero y no deben puntuarse.
+        """
+        features = np.zeros((len(records), self.n_features), dtype=np.float64)
+        row_errors = {}
+
+        for i, record in enumerate(records):
+            row, errors = self.parse(record)
+            if errors:
+                row_errors[i] = errors
+            else:
+                features[i] = row
+
+        return features, row_errors
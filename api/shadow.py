@@ -0,0 +1,230 @@
+"""
+Puntuación en sombra de un modelo candidato fuera del camino de la petición.
+
+Las peticiones de ``/predict`` (o una muestra, ``SHADOW_SAMPLE_RATE``) se
+encolan junto con la respuesta del modelo principal en una cola acotada
+(``SHADOW_QUEUE_SIZE``). Un pool de ``SHADOW_WORKERS`` hilos en segundo plano
+las puntúa con el modelo candidato y acumula el desacuerdo de clase, la
+diferencia de probabilidades y la latencia de ambos modelos.
+
+Encolar nunca bloquea: si la cola está llena la petición se descarta y se
+cuenta, de modo que la respuesta principal nunca espera al modelo en sombra.
+"""
+
+import logging
+import os
+import queue
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Optional, Sequence
+
+import numpy as np
+
+from api.logging_config import PredictionSampler
+from api.metrics import LATENCY_BUCKETS, REGISTRY, Counter, Histogram
+
+logger = logging.getLogger(__name__)
+
+SHADOW_MODEL_VERSION = os.environ.get('SHADOW_MODEL_VERSION', '')
+SHADOW_SAMPLE_RATE = float(os.environ.get('SHADOW_SAMPLE_RATE', 1.0))
+SHADOW_QUEUE_SIZE = int(os.environ.get('SHADOW_QUEUE_SIZE', 1000))
+SHADOW_WORKERS = int(os.environ.get('SHADOW_WORKERS', 1))
+
+# Observaciones recientes que se conservan para los percentiles de /shadow
+LATENCY_WINDOW = 10000
+
+PROBABILITY_DIFF_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+SHADOW_EVENTS = REGISTRY.register(Counter(
+    'shadow_requests_total', 'Peticiones enviadas al modelo en sombra por resultado', ('outcome',)
+))
+SHADOW_DISAGREEMENTS = REGISTRY.register(Counter(
+    'shadow_disagreements_total', 'Peticiones en las que el candidato predice otra clase'
+))
+SHADOW_SECONDS = REGISTRY.register(Histogram(
+    'shadow_model_duration_seconds', 'Latencia de puntuación de cada modelo en las peticiones en sombra',
+    ('model',), buckets=LATENCY_BUCKETS
+))
+SHADOW_PROBABILITY_DIFF = REGISTRY.register(Histogram(
+    'shadow_probability_difference', 'Diferencia absoluta máxima de probabilidad entre candidato y principal',
+    buckets=PROBABILITY_DIFF_BUCKETS
+))
+
+
+class ShadowScorer:
+    """
+    Cola acotada y pool de hilos que puntúan con el modelo candidato.
+
+    Los hilos se crean con la primera petición y se vuelven a crear si el
+    proceso cambia (tras el fork de Gunicorn los hilos del padre no existen).
+    """
+
+    def __init__(
+        self,
+        candidate_fn: Callable[[], object],
+        sample_rate: float = SHADOW_SAMPLE_RATE,
+        queue_size: int = SHADOW_QUEUE_SIZE,
+        n_workers: int = SHADOW_WORKERS
+    ):
+        """
+        Args:
+            candidate_fn: Función que devuelve el predictor candidato (se llama
+                en los hilos del pool para cada petición; debe ser barata, p.
+                ej. ``model_pool.get``)
+            sample_rate: Fracción de peticiones que se puntúan en sombra
+            queue_size: Peticiones pendientes máximas
+            n_workers: Hilos del pool
+        """
+        if queue_size < 1:
+            raise ValueError("queue_size debe ser al menos 1")
+        if n_workers < 1:
+            raise ValueError("n_workers debe ser al menos 1")
+        self.candidate_fn = candidate_fn
+        self.sampled = PredictionSampler(sample_rate)
+        self.queue_size = queue_size
+        self.n_workers = n_workers
+        self._queue: Optional[queue.Queue] = None
+        self._pid: Optional[int] = None
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._reset_stats()
+
+    def _reset_stats(self) -> None:
+        self.queued = 0
+        self.dropped = 0
+        self.scored = 0
+        self.failed = 0
+        self.disagreements = 0
+        self._probability_diff_sum = 0.0
+        self._primary_seconds = deque(maxlen=LATENCY_WINDOW)
+        self._candidate_seconds = deque(maxlen=LATENCY_WINDOW)
+        self.candidate_version: Optional[str] = None
+
+    def submit(self, features: np.ndarray, prediction: int, probabilities: Sequence[float],
+               primary_seconds: float) -> bool:
+        """
+        Encola una petición ya respondida por el modelo principal, sin bloquear.
+
+        Args:
+            features: Matriz 1 x 30 de features sin escalar
+            prediction: Índice de la clase devuelta por el modelo principal
+            probabilities: Probabilidades devueltas por el modelo principal
+            primary_seconds: Latencia de puntuación del modelo principal
+
+        Returns:
+            True si la petición se encoló; False si no entró en la muestra o
+            se descartó por tener la cola llena
+        """
+        if not self.sampled():
+            return False
+        item = (np.array(features, dtype=np.float64), prediction, np.asarray(probabilities), primary_seconds)
+        try:
+            self._work_queue().put_nowait(item)
+        except queue.Full:
+            SHADOW_EVENTS.inc('dropped')
+            with self._stats_lock:
+                self.dropped += 1
+            return False
+        SHADOW_EVENTS.inc('queued')
+        with self._stats_lock:
+            self.queued += 1
+        return True
+
+    def join(self) -> None:
+        """
+        Espera a que se procesen todas las peticiones encoladas.
+        """
+        if self._queue is not None and self._pid == os.getpid():
+            self._queue.join()
+
+    def _work_queue(self) -> queue.Queue:
+        """
+        Devuelve la cola del proceso actual, arrancando el pool si hace falta.
+        """
+        pid = os.getpid()
+        if self._pid != pid:
+            with self._start_lock:
+                if self._pid != pid:
+                    self._queue = queue.Queue(maxsize=self.queue_size)
+                    for i in range(self.n_workers):
+                        threading.Thread(
+                            target=self._run, args=(self._queue,), name=f'shadow-{i}', daemon=True
+                        ).start()
+                    self._pid = pid
+        return self._queue
+
+    def _run(self, work_queue: queue.Queue) -> None:
+        """
+        Bucle de cada hilo del pool.
+        """
+        while True:
+            features, prediction, probabilities, primary_seconds = work_queue.get()
+            try:
+                self._score(features, prediction, probabilities, primary_seconds)
+            except Exception as e:
+                SHADOW_EVENTS.inc('failed')
+                with self._stats_lock:
+                    self.failed += 1
+                logger.warning("Error en la puntuación en sombra: %s", e)
+            finally:
+                work_queue.task_done()
+
+    def _score(self, features: np.ndarray, prediction: int, probabilities: np.ndarray,
+               primary_seconds: float) -> None:
+        """
+        Puntúa una petición con el candidato y acumula la comparación.
+        """
+        candidate = self.candidate_fn()
+        start = time.perf_counter()
+        candidate_probabilities = candidate.predict_proba_matrix(features)
+        candidate_prediction = int(candidate.decide(candidate_probabilities)[0])
+        candidate_seconds = time.perf_counter() - start
+
+        difference = float(np.max(np.abs(candidate_probabilities[0] - probabilities)))
+        disagrees = candidate_prediction != prediction
+
+        SHADOW_EVENTS.inc('scored')
+        SHADOW_SECONDS.observe(primary_seconds, 'primary')
+        SHADOW_SECONDS.observe(candidate_seconds, 'candidate')
+        SHADOW_PROBABILITY_DIFF.observe(difference)
+        if disagrees:
+            SHADOW_DISAGREEMENTS.inc()
+
+        with self._stats_lock:
+            self.scored += 1
+            self.disagreements += disagrees
+            self._probability_diff_sum += difference
+            self._primary_seconds.append(primary_seconds)
+            self._candidate_seconds.append(candidate_seconds)
+            self.candidate_version = getattr(candidate, 'model_version', None)
+
+    def stats(self) -> Dict:
+        """
+        Contadores y comparación acumulada (latencias en ms sobre las últimas
+        ``LATENCY_WINDOW`` peticiones puntuadas).
+        """
+        def percentiles(values) -> Optional[Dict[str, float]]:
+            if not values:
+                return None
+            p50, p99 = np.percentile(np.asarray(values) * 1000, [50, 99])
+            return {'p50_ms': float(p50), 'p99_ms': float(p99)}
+
+        with self._stats_lock:
+            return {
+                'candidate_version': self.candidate_version,
+                'sample_rate': self.sampled.rate,
+                'queue_size': self.queue_size,
+                'pending': self._queue.qsize() if self._queue is not None else 0,
+                'queued': self.queued,
+                'dropped': self.dropped,
+                'scored': self.scored,
+                'failed': self.failed,
+                'disagreements': self.disagreements,
+                'disagreement_rate': self.disagreements / self.scored if self.scored else None,
+                'mean_probability_difference': self._probability_diff_sum / self.scored if self.scored else None,
+                'latency': {
+                    'primary': percentiles(self._primary_seconds),
+                    'candidate': percentiles(self._candidate_seconds)
+                }
+            }
@@ -0,0 +1,121 @@
+"""
+Benchmark del coste de serialización JSON por petición.
+
+Compara, para una petición individual y para lotes, el tiempo de decodificar
+el cuerpo, construir los resultados y codificar la respuesta con el módulo
+``json`` de la biblioteca estándar (como hace el proveedor por defecto de
+Flask) y con orjson, además de la construcción de resultados anterior
+(``.capitalize()`` y conversión a float por fila) frente a la actual.
+
+Uso:
+    python benchmarks/bench_json.py --batch-sizes 1,100,1000 --output bench_json.json
+"""
+
+import argparse
+import json
+import os
+import sys
+from datetime import datetime
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.common import SAMPLE_CASE, time_per_call, write_results
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def legacy_format(target_names, prediction, probabilities):
+    """
+    Construcción de un resultado tal como se hacía antes de precalcular las
+    etiquetas.
+    """
+    return {
+        'prediction': int(prediction),
+        'prediction_label': target_names[prediction].capitalize(),
+        'probability': {
+            target_names[0].capitalize(): float(probabilities[0]),
+            target_names[1].capitalize(): float(probabilities[1])
+        },
+        'confidence': float(probabilities[prediction])
+    }
+
+
+def measure(predictor, batch_size: int):
+    """
+    Mide cada etapa de serialización para un tamaño de lote.
+    """
+    from api.app import app
+
+    body = json.dumps(SAMPLE_CASE if batch_size == 1 else [SAMPLE_CASE] * batch_size)
+    features = np.tile(predictor.record_to_row(SAMPLE_CASE), (batch_size, 1))
+    probabilities = predictor.predict_proba_matrix(features)
+    predictions = predictor.decide(probabilities)
+    target_names = [str(name) for name in predictor.metadata.get('target_names', ['malignant', 'benign'])]
+
+    def build_legacy():
+        return [legacy_format(target_names, p, row) for p, row in zip(predictions, probabilities)]
+
+    def build_current():
+        return [
+            predictor._format_result(p, row)
+            for p, row in zip(predictions.tolist(), probabilities.tolist())
+        ]
+
+    results = build_current()
+    payload = results[0] if batch_size == 1 else {'predictions': results, 'count': batch_size}
+    payload = dict(payload, timestamp=datetime.now().isoformat())
+
+    with app.app_context():
+        stages = {
+            'decode_stdlib_us': lambda: json.loads(body),
+            'build_legacy_us': build_legacy,
+            'build_current_us': build_current,
+            'encode_flask_default_us': lambda: json.dumps(payload, sort_keys=True, separators=(',', ':')),
+            'response_provider_us': lambda: app.json.response(payload)
+        }
+        if orjson is not None:
+            stages['decode_orjson_us'] = lambda: orjson.loads(body)
+            stages['encode_orjson_us'] = lambda: orjson.dumps(payload)
+
+        report = {'batch_size': batch_size, 'request_bytes': len(body)}
+        for name, fn in stages.items():
+            report[name] = time_per_call(fn)['best_us']
+
+    report['stdlib_total_us'] = report['decode_stdlib_us'] + report['build_legacy_us'] + report['encode_flask_default_us']
+    if orjson is not None:
+        report['orjson_total_us'] = report['decode_orjson_us'] + report['build_current_us'] + report['encode_orjson_us']
+    return report
+
+
+def main(argv=None):
+    """
+    Ejecuta el benchmark y escribe los resultados en JSON.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--batch-sizes', default='1,100,1000', help='Tamaños de lote separados por comas')
+    parser.add_argument('--output', help='Archivo JSON de salida')
+    args = parser.parse_args(argv)
+
+    from api.app import get_predictor
+    from api.json_backend import BACKEND
+
+    predictor = get_predictor()
+    results = []
+    for batch_size in [int(value) for value in args.batch_sizes.split(',')]:
+        report = measure(predictor, batch_size)
+        results.append(report)
+        summary = f"lote {batch_size}: stdlib {report['stdlib_total_us']:.1f} us"
+        if 'orjson_total_us' in report:
+            summary += f", orjson {report['orjson_total_us']:.1f} us"
+        print(summary, file=sys.stderr)
+
+    write_results({'benchmark': 'json', 'backend': BACKEND, 'results': results}, args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""
+Generador de carga extremo a extremo contra un servidor local.
+
+Arranca la API (Gunicorn o Uvicorn), hace un calentamiento y recorre varios
+niveles de concurrencia en bucle cerrado, reportando throughput y latencias
+p50/p95/p99 de cada punto.
+
+Uso:
+    python benchmarks/bench_load.py --server gunicorn --concurrency 1,4,16 --duration 10
+    python benchmarks/bench_load.py --endpoint /predict/batch --batch-size 100
+"""
+
+import argparse
+import json
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.common import SAMPLE_CASE, free_port, run_load, start_server, stop_server, write_results
+
+SERVER_COMMANDS = {
+    'gunicorn': [sys.executable, '-m', 'gunicorn', '-c', 'api/gunicorn_config.py', 'api.app:app'],
+    'uvicorn': [sys.executable, '-m', 'uvicorn', 'api.asgi:app', '--host', '127.0.0.1',
+                '--port', '{port}', '--no-access-log']
+}
+
+ENDPOINTS = ('/predict', '/predict/batch')
+PAYLOAD_FORMATS = ('json', 'raw')
+
+
+def build_body(endpoint: str, batch_size: int, payload_format: str):
+    """
+    Construye el cuerpo y el Content-Type de cada petición.
+    """
+    from api.app import REQUIRED_FEATURES
+    from api.binary_formats import RAW_CONTENT_TYPE, encode_raw
+
+    rows = 1 if endpoint == '/predict' else batch_size
+    if payload_format == 'raw':
+        matrix = np.tile([SAMPLE_CASE[f] for f in REQUIRED_FEATURES], (rows, 1))
+        return encode_raw(matrix), RAW_CONTENT_TYPE
+
+    payload = SAMPLE_CASE if endpoint == '/predict' else [SAMPLE_CASE] * rows
+    return json.dumps(payload).encode(), 'application/json'
+
+
+def main(argv=None):
+    """
+    Ejecuta el barrido de concurrencia y escribe los resultados en JSON.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--server', choices=sorted(SERVER_COMMANDS), default='gunicorn')
+    parser.add_argument('--workers', type=int, default=1, help='Procesos worker del servidor')
+    parser.add_argument('--endpoint', choices=ENDPOINTS, default='/predict')
+    parser.add_argument('--batch-size', type=int, default=100, help='Filas por petición en /predict/batch')
+    parser.add_argument('--format', choices=PAYLOAD_FORMATS, default='json', help='Formato del cuerpo')
+    parser.add_argument('--concurrency', default='1,2,4,8,16', help='Lista de clientes concurrentes')
+    parser.add_argument('--duration', type=float, default=10.0, help='Segundos por punto')
+    parser.add_argument('--warmup', type=float, default=2.0, help='Segundos de calentamiento descartados')
+    parser.add_argument('--output', help='Archivo JSON de salida')
+    args = parser.parse_args(argv)
+
+    body, content_type = build_body(args.endpoint, args.batch_size, args.format)
+    concurrencies = [int(c) for c in args.concurrency.split(',')]
+    rows_per_request = 1 if args.endpoint == '/predict' else args.batch_size
+
+    port = free_port()
+    command = [arg.format(port=port) for arg in SERVER_COMMANDS[args.server]]
+    if args.server == 'uvicorn':
+        command += ['--workers', str(args.workers)]
+    server = start_server(command, port, env={'WEB_CONCURRENCY': str(args.workers)})
+
+    points = []
+    try:
+        if args.warmup > 0:
+            run_load(port, args.endpoint, body, max(concurrencies), args.warmup, content_type)
+        for concurrency in concurrencies:
+            point = run_load(port, args.endpoint, body, concurrency, args.duration, content_type)
+            point['rows_per_second'] = point['throughput_rps'] * rows_per_request
+            points.append(point)
+            print(f"c={concurrency}: {point['throughput_rps']:.0f} req/s, "
+                  f"p50={point['p50_ms']:.2f} ms, p95={point['p95_ms']:.2f} ms, "
+                  f"p99={point['p99_ms']:.2f} ms, errores={point['errors']}", file=sys.stderr)
+    finally:
+        stop_server(server)
+
+    write_results({
+        'benchmark': 'load',
+        'server': args.server,
+        'workers': args.workers,
+        'endpoint': args.endpoint,
+        'format': args.format,
+        'rows_per_request': rows_per_request,
+        'request_bytes': len(body),
+        'duration': args.duration,
+        'results': points
+    }, args.output)
+
+
+if __name__ == '__main__':
+    main()
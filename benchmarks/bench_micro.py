@@ -0,0 +1,92 @@
+"""
+Micro-benchmarks de ``ModelPredictor``.
+
+Mide en proceso, sin servidor HTTP, el coste por llamada de la validación de
+entrada, la predicción individual y por lotes, y la carga del modelo con cada
+motor de inferencia disponible. La caché de predicciones se desactiva para
+medir siempre el camino completo.
+
+Uso:
+    python benchmarks/bench_micro.py --output bench_micro.json
+"""
+
+import argparse
+import logging
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.common import SAMPLE_CASE, time_per_call, write_results
+
+
+def benchmarks(predictor, batch_size: int):
+    """
+    Devuelve los micro-benchmarks a ejecutar como (nombre, función).
+    """
+    from api.app import REQUIRED_FEATURES
+
+    invalid_case = dict(SAMPLE_CASE, mean_radius='abc')
+    del invalid_case['worst_area']
+    records = [SAMPLE_CASE] * batch_size
+    row = predictor.record_to_row(SAMPLE_CASE)
+    matrix = np.tile(row, (batch_size, 1))
+    features, row_errors = predictor.records_to_matrix(records)
+    columns = {feature: [SAMPLE_CASE[feature]] * batch_size for feature in REQUIRED_FEATURES}
+
+    return [
+        ('validate_input', lambda: predictor.validate_input(SAMPLE_CASE)),
+        ('validate_input_invalid', lambda: predictor.validate_input(invalid_case)),
+        ('parse_record', lambda: predictor.parse_record(SAMPLE_CASE)),
+        ('predict', lambda: predictor.predict(SAMPLE_CASE, use_cache=False)),
+        ('predict_proba_1', lambda: predictor.predict_proba_matrix(row)),
+        (f'records_to_matrix_{batch_size}', lambda: predictor.records_to_matrix(records)),
+        (f'columns_to_matrix_{batch_size}', lambda: predictor.columns_to_matrix(columns)),
+        (f'predict_proba_{batch_size}', lambda: predictor.predict_proba_matrix(matrix)),
+        (f'predict_batch_{batch_size}', lambda: predictor.predict_batch(features, row_errors, use_cache=False))
+    ]
+
+
+def main(argv=None):
+    """
+    Ejecuta los micro-benchmarks y escribe los resultados en JSON.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--batch-size', type=int, default=1000, help='Filas de los benchmarks por lotes')
+    parser.add_argument('--min-seconds', type=float, default=0.2, help='Duración mínima de cada repetición')
+    parser.add_argument('--repeat', type=int, default=5, help='Repeticiones por benchmark')
+    parser.add_argument('--output', help='Archivo JSON de salida')
+    args = parser.parse_args(argv)
+
+    from api.app import COMPILED_MODEL_PATH, FUSED_MODEL_PATH, ModelPredictor
+
+    # Los logs por predicción medirían el handler de logging, no el predictor
+    logging.disable(logging.INFO)
+
+    predictor = ModelPredictor(cache_size=0)
+    results = {}
+    for name, fn in benchmarks(predictor, args.batch_size):
+        results[name] = time_per_call(fn, args.min_seconds, args.repeat)
+        print(f"{name}: {results[name]['best_us']:.1f} us", file=sys.stderr)
+
+    backends = ['sklearn']
+    backends += ['compiled'] if os.path.exists(COMPILED_MODEL_PATH) else []
+    backends += ['fused'] if os.path.exists(FUSED_MODEL_PATH) else []
+    for backend in backends:
+        name = f'model_load_{backend}'
+        results[name] = time_per_call(lambda: ModelPredictor(backend=backend, cache_size=0),
+                                      args.min_seconds, args.repeat)
+        print(f"{name}: {results[name]['best_us'] / 1000:.1f} ms", file=sys.stderr)
+
+    write_results({
+        'benchmark': 'micro',
+        'inference_backend': predictor.backend,
+        'batch_size': args.batch_size,
+        'results': results
+    }, args.output)
+
+
+if __name__ == '__main__':
+    main()
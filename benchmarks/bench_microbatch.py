@@ -0,0 +1,82 @@
+"""
+Benchmark del servidor asíncrono con micro-batching.
+
+Compara, con un solo proceso, el servidor WSGI (Gunicorn, worker síncrono)
+con el servidor ASGI (Uvicorn + ``MicroBatcher``) para varias ventanas de
+espera y niveles de concurrencia.
+
+Uso:
+    python benchmarks/bench_microbatch.py --concurrency 1,8,32 --wait-us 0,500,2000
+"""
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.common import SAMPLE_CASE, free_port, run_load, start_server, stop_server, write_results
+
+
+def sweep(command, env, concurrencies, duration, body):
+    """
+    Arranca un servidor y mide cada nivel de concurrencia.
+
+    ``{port}`` en los argumentos del comando se sustituye por el puerto libre.
+    """
+    port = free_port()
+    server = start_server([arg.format(port=port) for arg in command], port, env=env)
+    try:
+        return [run_load(port, '/predict', body, c, duration) for c in concurrencies]
+    finally:
+        stop_server(server)
+
+
+def main(argv=None):
+    """
+    Ejecuta el benchmark y escribe los resultados en JSON.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--concurrency', default='1,8,32', help='Lista de clientes concurrentes')
+    parser.add_argument('--wait-us', default='0,500,2000', help='Lista de esperas máximas del micro-lote')
+    parser.add_argument('--max-batch-size', type=int, default=64)
+    parser.add_argument('--duration', type=float, default=5.0, help='Segundos por punto')
+    parser.add_argument('--output', help='Archivo JSON de salida')
+    args = parser.parse_args(argv)
+
+    body = json.dumps(SAMPLE_CASE).encode()
+    concurrencies = [int(c) for c in args.concurrency.split(',')]
+    results = []
+
+    results.append({
+        'server': 'gunicorn-sync',
+        'points': sweep(
+            [sys.executable, '-m', 'gunicorn', '-c', 'api/gunicorn_config.py', 'api.app:app'],
+            {'WEB_CONCURRENCY': '1'}, concurrencies, args.duration, body
+        )
+    })
+
+    for wait_us in [int(w) for w in args.wait_us.split(',')]:
+        results.append({
+            'server': 'uvicorn-microbatch',
+            'max_wait_us': wait_us,
+            'points': sweep(
+                [sys.executable, '-m', 'uvicorn', 'api.asgi:app', '--host', '127.0.0.1',
+                 '--port', '{port}', '--no-access-log'],
+                {'MICROBATCH_MAX_SIZE': str(args.max_batch_size), 'MICROBATCH_MAX_WAIT_US': str(wait_us)},
+                concurrencies, args.duration, body
+            )
+        })
+
+    for result in results:
+        for point in result['points']:
+            print(f"{result['server']} wait={result.get('max_wait_us', '-')} "
+                  f"c={point['concurrency']}: {point['throughput_rps']:.0f} req/s, "
+                  f"p99={point['p99_ms']:.2f} ms", file=sys.stderr)
+
+    write_results({'benchmark': 'microbatch', 'results': results}, args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmark del paralelismo intra-operación de la inferencia.
+
+Mide ``predict_proba`` en serie y repartido en un pool de hilos
+(``ParallelScorer``) para varios tamaños de lote y números de hilos, con
+cada motor de inferencia disponible, y reporta el punto de cruce: el lote
+más pequeño a partir del cual el pool es más rápido que la ejecución en
+serie. Ese valor es el que debe usarse como ``PARALLEL_BATCH_THRESHOLD``.
+
+Uso:
+    python benchmarks/bench_parallel.py --batch-sizes 1,100,1000,10000 --n-jobs 2,4
+"""
+
+import argparse
+import logging
+import os
+import sys
+import warnings
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.common import SAMPLE_CASE, time_per_call, write_results
+
+
+def crossover(points, n_jobs: int):
+    """
+    Devuelve el lote más pequeño desde el que ``n_jobs`` hilos son más
+    rápidos que la ejecución en serie para todos los lotes mayores, o None
+    si el pool nunca compensa.
+    """
+    threshold = None
+    for point in sorted(points, key=lambda p: p['batch_size'], reverse=True):
+        if point['parallel_us'][str(n_jobs)] >= point['serial_us']:
+            break
+        threshold = point['batch_size']
+    return threshold
+
+
+def main(argv=None):
+    """
+    Ejecuta el barrido y escribe los resultados en JSON.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--batch-sizes', default='1,10,100,1000,5000,20000', help='Lista de tamaños de lote')
+    parser.add_argument('--n-jobs', default='2,4', help='Lista de hilos del pool')
+    parser.add_argument('--min-seconds', type=float, default=0.2, help='Duración mínima de cada repetición')
+    parser.add_argument('--repeat', type=int, default=3, help='Repeticiones por punto')
+    parser.add_argument('--output', help='Archivo JSON de salida')
+    args = parser.parse_args(argv)
+
+    from api.app import COMPILED_MODEL_PATH, FUSED_MODEL_PATH, REQUIRED_FEATURES, ModelPredictor
+    from api.parallelism import ParallelScorer
+
+    logging.disable(logging.INFO)
+    # El scaler se ajustó con un DataFrame; aquí recibe arrays sin nombres
+    warnings.filterwarnings('ignore', message='X does not have valid feature names')
+
+    batch_sizes = [int(b) for b in args.batch_sizes.split(',')]
+    n_jobs_values = [int(n) for n in args.n_jobs.split(',')]
+    row = np.array([[SAMPLE_CASE[f] for f in REQUIRED_FEATURES]])
+
+    backends = ['sklearn']
+    backends += ['compiled'] if os.path.exists(COMPILED_MODEL_PATH) else []
+    backends += ['fused'] if os.path.exists(FUSED_MODEL_PATH) else []
+
+    results = []
+    for backend in backends:
+        predictor = ModelPredictor(backend=backend, cache_size=0)
+        serial = ParallelScorer(n_jobs=1)
+        pools = {n: ParallelScorer(n_jobs=n, threshold=1) for n in n_jobs_values}
+        points = []
+
+        for batch_size in batch_sizes:
+            features = np.tile(row, (batch_size, 1))
+            if predictor.scaler is not None:
+                features = predictor.scaler.transform(features)
+            point = {
+                'batch_size': batch_size,
+                'serial_us': time_per_call(lambda: serial.predict_proba(predictor.model, features),
+                                           args.min_seconds, args.repeat)['best_us'],
+                'parallel_us': {}
+            }
+            for n, pool in pools.items():
+                point['parallel_us'][str(n)] = time_per_call(
+                    lambda: pool.predict_proba(predictor.model, features), args.min_seconds, args.repeat
+                )['best_us']
+            points.append(point)
+            timings = ', '.join(f"{n} hilos {us:.0f} us" for n, us in point['parallel_us'].items())
+            print(f"{backend} lote={batch_size}: serie {point['serial_us']:.0f} us, {timings}", file=sys.stderr)
+
+        crossovers = {str(n): crossover(points, n) for n in n_jobs_values}
+        print(f"{backend}: punto de cruce {crossovers}", file=sys.stderr)
+        results.append({'configuration': backend, 'crossover_batch_size': crossovers, 'points': points})
+
+    write_results({
+        'benchmark': 'parallel',
+        'cpu_count': os.cpu_count(),
+        'results': results
+    }, args.output)
+
+
+if __name__ == '__main__':
+    main()
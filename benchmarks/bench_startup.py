@@ -0,0 +1,173 @@
+"""
+Benchmark de arranque y memoria de los workers.
+
+Lanza N procesos que importan la API (y con ella cargan el modelo) con cada
+combinación de motor de inferencia y modo de carga de los artefactos, y
+reporta el tiempo de arranque, el tiempo de carga del modelo y la memoria
+(RSS y PSS) de cada proceso mientras todos están vivos a la vez. La PSS
+reparte las páginas compartidas entre los procesos que las mapean, así que
+refleja cuánto cuesta realmente cada worker adicional.
+
+Además mide el arranque en frío con cada ``STARTUP_MODE``: tiempo de
+``import api.app``, de ``create_app()`` (a partir del cual el proceso ya
+responde a /health/live), hasta /health/ready y hasta la primera predicción
+correcta, más el tiempo total del proceso incluido el intérprete.
+
+Uso:
+    python benchmarks/bench_startup.py --workers 4 --runs 5
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.common import ROOT_DIR, SAMPLE_CASE, memory_usage, write_results
+
+CHILD_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+sys.path.insert(0, {root!r})
+import numpy as np
+from api.app import ModelPredictor, get_predictor
+predictor = get_predictor()
+predictor.predict_proba_matrix(np.zeros((1, 30)))
+startup = time.perf_counter() - start
+start = time.perf_counter()
+ModelPredictor()
+load = time.perf_counter() - start
+print(json.dumps({{'startup_seconds': startup, 'model_load_seconds': load}}), flush=True)
+sys.stdin.read()
+"""
+
+COLD_START_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+sys.path.insert(0, {root!r})
+import api.app
+imported = time.perf_counter()
+app = api.app.create_app({mode!r})
+created = time.perf_counter()
+client = app.test_client()
+while client.get('/health/ready').status_code == 503:
+    time.sleep(0.01)
+ready = time.perf_counter()
+response = client.post('/predict', json={case!r})
+if response.status_code != 200:
+    raise SystemExit(response.get_data(as_text=True))
+first_prediction = time.perf_counter()
+print(json.dumps({{
+    'import_seconds': imported - start,
+    'create_app_seconds': created - start,
+    'ready_seconds': ready - start,
+    'first_prediction_seconds': first_prediction - start,
+    'modules_loaded': {{name: name in sys.modules for name in ('joblib', 'sklearn', 'pyarrow')}}
+}}), flush=True)
+"""
+
+STARTUP_MODES = ('eager', 'lazy')
+
+CONFIGURATIONS = [
+    {'name': 'sklearn', 'INFERENCE_BACKEND': 'sklearn', 'MODEL_MMAP': 'false'},
+    {'name': 'fused-copy', 'INFERENCE_BACKEND': 'fused', 'MODEL_MMAP': 'false'},
+    {'name': 'fused-mmap', 'INFERENCE_BACKEND': 'fused', 'MODEL_MMAP': 'true'}
+]
+
+
+def measure(configuration, workers):
+    """
+    Arranca ``workers`` procesos con una configuración y mide cada uno.
+    """
+    env = dict(os.environ, **{k: v for k, v in configuration.items() if k != 'name'})
+    script = CHILD_SCRIPT.format(root=ROOT_DIR)
+    processes = [
+        subprocess.Popen(
+            [sys.executable, '-c', script], cwd=ROOT_DIR, env=env,
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+        )
+        for _ in range(workers)
+    ]
+    try:
+        reports = [json.loads(process.stdout.readline()) for process in processes]
+        for process, report in zip(processes, reports):
+            report.update(memory_usage(process.pid))
+    finally:
+        for process in processes:
+            process.stdin.close()
+            process.wait()
+
+    summary = {'configuration': configuration['name'], 'workers': workers, 'per_worker': reports}
+    for key in ('startup_seconds', 'model_load_seconds', 'rss_mb', 'pss_mb'):
+        values = [report[key] for report in reports if key in report]
+        if values:
+            summary[f'mean_{key}'] = sum(values) / len(values)
+    return summary
+
+
+def measure_cold_start(configuration, mode, runs):
+    """
+    Arranca ``runs`` procesos de uno en uno con un modo de arranque y
+    devuelve la mediana de cada tiempo (en segundos desde el inicio del
+    script; ``process_seconds`` incluye además el arranque del intérprete).
+    """
+    env = dict(os.environ, **{k: v for k, v in configuration.items() if k != 'name'})
+    script = COLD_START_SCRIPT.format(root=ROOT_DIR, mode=mode, case=SAMPLE_CASE)
+    reports = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        completed = subprocess.run(
+            [sys.executable, '-c', script], cwd=ROOT_DIR, env=env,
+            capture_output=True, text=True, check=True
+        )
+        report = json.loads(completed.stdout.strip().splitlines()[-1])
+        report['process_seconds'] = time.perf_counter() - start
+        reports.append(report)
+
+    summary = {'configuration': configuration['name'], 'startup_mode': mode, 'runs': runs,
+               'modules_loaded': reports[-1]['modules_loaded']}
+    for key in ('import_seconds', 'create_app_seconds', 'ready_seconds', 'first_prediction_seconds',
+                'process_seconds'):
+        summary[f'median_{key}'] = statistics.median(report[key] for report in reports)
+    return summary
+
+
+def main(argv=None):
+    """
+    Ejecuta el benchmark y escribe los resultados en JSON.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--workers', type=int, default=4, help='Procesos simultáneos por configuración')
+    parser.add_argument('--runs', type=int, default=5, help='Arranques en frío por configuración y modo')
+    parser.add_argument('--output', help='Archivo JSON de salida')
+    args = parser.parse_args(argv)
+
+    results = []
+    for configuration in CONFIGURATIONS:
+        summary = measure(configuration, args.workers)
+        results.append(summary)
+        print(f"{summary['configuration']}: arranque {summary['mean_startup_seconds'] * 1000:.0f} ms, "
+              f"carga {summary['mean_model_load_seconds'] * 1000:.1f} ms, "
+              f"RSS {summary.get('mean_rss_mb', float('nan')):.1f} MB, "
+              f"PSS {summary.get('mean_pss_mb', float('nan')):.1f} MB", file=sys.stderr)
+
+    cold_start = []
+    for configuration in CONFIGURATIONS:
+        for mode in STARTUP_MODES:
+            summary = measure_cold_start(configuration, mode, args.runs)
+            cold_start.append(summary)
+            print(f"{summary['configuration']} ({mode}): import {summary['median_import_seconds'] * 1000:.0f} ms, "
+                  f"app {summary['median_create_app_seconds'] * 1000:.0f} ms, "
+                  f"ready {summary['median_ready_seconds'] * 1000:.0f} ms, "
+                  f"primera predicción {summary['median_first_prediction_seconds'] * 1000:.0f} ms, "
+                  f"proceso {summary['median_process_seconds'] * 1000:.0f} ms", file=sys.stderr)
+
+    write_results({'benchmark': 'startup', 'results': results, 'cold_start': cold_start}, args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark de escalado del servidor de producción con el número de workers.
+
+Arranca Gunicorn con la configuración de ``api/gunicorn_config.py`` para cada
+número de workers, genera carga concurrente contra ``/predict`` y reporta el
+throughput, los percentiles de latencia y la memoria de cada worker (la PSS
+muestra cuánto del modelo precargado se comparte copy-on-write).
+
+Uso:
+    python benchmarks/bench_workers.py --workers 1,2,4 --duration 10
+"""
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.common import (
+    SAMPLE_CASE,
+    free_port,
+    memory_usage,
+    run_load,
+    start_server,
+    stop_server,
+    write_results
+)
+
+
+def worker_pids(master_pid: int):
+    """
+    Devuelve los pids de los workers hijos del maestro de Gunicorn.
+    """
+    try:
+        with open(f'/proc/{master_pid}/task/{master_pid}/children') as children:
+            return [int(pid) for pid in children.read().split()]
+    except OSError:
+        return []
+
+
+def main(argv=None):
+    """
+    Ejecuta el barrido de workers y escribe los resultados en JSON.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--workers', default='1,2,4', help='Lista de números de workers')
+    parser.add_argument('--concurrency', type=int, default=0,
+                        help='Clientes concurrentes (por defecto 2 por worker)')
+    parser.add_argument('--duration', type=float, default=10.0, help='Segundos por punto')
+    parser.add_argument('--output', help='Archivo JSON de salida')
+    args = parser.parse_args(argv)
+
+    body = json.dumps(SAMPLE_CASE).encode()
+    results = []
+
+    for workers in [int(w) for w in args.workers.split(',')]:
+        port = free_port()
+        server = start_server(
+            [sys.executable, '-m', 'gunicorn', '-c', 'api/gunicorn_config.py', 'api.app:app'],
+            port,
+            env={'WEB_CONCURRENCY': str(workers)}
+        )
+        try:
+            concurrency = args.concurrency or 2 * workers
+            result = run_load(port, '/predict', body, concurrency, args.duration)
+            result['workers'] = workers
+            result['worker_memory'] = [memory_usage(pid) for pid in worker_pids(server.pid)]
+            results.append(result)
+            print(f"workers={workers}: {result['throughput_rps']:.0f} req/s, "
+                  f"p99={result['p99_ms']:.2f} ms", file=sys.stderr)
+        finally:
+            stop_server(server)
+
+    write_results({'benchmark': 'workers', 'results': results}, args.output)
+
+
+if __name__ == '__main__':
+    main()
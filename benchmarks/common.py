@@ -0,0 +1,243 @@
+"""
+Utilidades compartidas por los benchmarks del servicio de predicción.
+
+Incluye el arranque de servidores locales, un generador de carga basado en
+hilos y la escritura de resultados en JSON.
+"""
+
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+import timeit
+from typing import Callable, Dict, List, Optional
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+SAMPLE_CASE = {
+    "mean_radius": 20.57, "mean_texture": 17.77, "mean_perimeter": 132.9,
+    "mean_area": 1326.0, "mean_smoothness": 0.08474, "mean_compactness": 0.07864,
+    "mean_concavity": 0.0869, "mean_concave_points": 0.07017, "mean_symmetry": 0.1812,
+    "mean_fractal_dimension": 0.05667, "radius_error": 0.5435, "texture_error": 0.7339,
+    "perimeter_error": 3.398, "area_error": 74.08, "smoothness_error": 0.005225,
+    "compactness_error": 0.01308, "concavity_error": 0.0186, "concave_points_error": 0.0134,
+    "symmetry_error": 0.01389, "fractal_dimension_error": 0.003532, "worst_radius": 24.99,
+    "worst_texture": 23.41, "worst_perimeter": 158.8, "worst_area": 1956.0,
+    "worst_smoothness": 0.1238, "worst_compactness": 0.1866, "worst_concavity": 0.2416,
+    "worst_concave_points": 0.186, "worst_symmetry": 0.275, "worst_fractal_dimension": 0.08902
+}
+
+
+def percentile(values: List[float], q: float) -> float:
+    """
+    Percentil por interpolación lineal (q entre 0 y 100).
+    """
+    if not values:
+        return float('nan')
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q / 100.0
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def summarize(latencies: List[float]) -> Dict[str, float]:
+    """
+    Resume una lista de latencias en segundos como p50/p95/p99 en milisegundos.
+    """
+    return {
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p95_ms': percentile(latencies, 95) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+        'mean_ms': (sum(latencies) / len(latencies) * 1000) if latencies else float('nan')
+    }
+
+
+def time_per_call(fn: Callable[[], object], min_seconds: float = 0.2, repeat: int = 5) -> Dict[str, float]:
+    """
+    Mide el tiempo por llamada de ``fn`` en microsegundos.
+
+    El número de llamadas por repetición se ajusta para que cada repetición
+    dure al menos ``min_seconds``.
+
+    Returns:
+        Diccionario con el mejor tiempo, la mediana y el número de llamadas
+    """
+    timer = timeit.Timer(fn)
+    number, elapsed = timer.autorange()
+    if elapsed < min_seconds:
+        number = max(1, int(number * min_seconds / max(elapsed, 1e-9)))
+    timings = sorted(t / number * 1e6 for t in timer.repeat(number=number, repeat=repeat))
+    return {'best_us': timings[0], 'median_us': timings[len(timings) // 2], 'calls': number}
+
+
+def git_revision() -> Optional[str]:
+    """
+    Devuelve el commit actual del repositorio (con sufijo '-dirty' si hay
+    cambios sin confirmar), o None si no es un repositorio git.
+    """
+    try:
+        revision = subprocess.run(
+            ['git', 'rev-parse', '--short=12', 'HEAD'], cwd=ROOT_DIR,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ['git', 'status', '--porcelain', '--untracked-files=no'], cwd=ROOT_DIR,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return revision + ('-dirty' if dirty else '')
+
+
+def free_port() -> int:
+    """
+    Devuelve un puerto TCP libre en localhost.
+    """
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(command: List[str], port: int, env: Optional[Dict[str, str]] = None,
+                 timeout: float = 60.0) -> subprocess.Popen:
+    """
+    Arranca un servidor local y espera a que responda en ``/``.
+
+    Args:
+        command: Comando a ejecutar desde la raíz del repositorio
+        port: Puerto donde escuchará el servidor
+        env: Variables de entorno adicionales
+        timeout: Segundos máximos de espera
+
+    Returns:
+        Proceso del servidor
+    """
+    process_env = dict(os.environ, PORT=str(port), **(env or {}))
+    process = subprocess.Popen(
+        command, cwd=ROOT_DIR, env=process_env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"El servidor terminó al arrancar: {' '.join(command)}")
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            connection.request('GET', '/')
+            if connection.getresponse().status == 200:
+                return process
+        except OSError:
+            time.sleep(0.1)
+
+    stop_server(process)
+    raise RuntimeError(f"El servidor no respondió en {timeout}s: {' '.join(command)}")
+
+
+def stop_server(process: subprocess.Popen) -> None:
+    """
+    Detiene un servidor arrancado con ``start_server``.
+    """
+    process.terminate()
+    try:
+        process.wait(timeout=15)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+def run_load(port: int, path: str, body: bytes, concurrency: int, duration: float,
+             content_type: str = 'application/json') -> Dict[str, float]:
+    """
+    Genera carga con ``concurrency`` clientes durante ``duration`` segundos.
+
+    Cada cliente mantiene su propia conexión y envía peticiones en bucle
+    cerrado (la siguiente sale al recibir la respuesta anterior).
+
+    Returns:
+        Diccionario con throughput, errores y percentiles de latencia
+    """
+    latencies: List[float] = []
+    errors = [0]
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def client() -> None:
+        connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+        own_latencies = []
+        own_errors = 0
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            try:
+                connection.request('POST', path, body=body, headers={'Content-Type': content_type})
+                response = connection.getresponse()
+                response.read()
+                if response.status != 200:
+                    own_errors += 1
+                    continue
+            except (OSError, http.client.HTTPException):
+                own_errors += 1
+                connection.close()
+                continue
+            own_latencies.append(time.perf_counter() - start)
+        connection.close()
+        with lock:
+            latencies.extend(own_latencies)
+            errors[0] += own_errors
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    result = {
+        'concurrency': concurrency,
+        'requests': len(latencies),
+        'errors': errors[0],
+        'throughput_rps': len(latencies) / elapsed
+    }
+    result.update(summarize(latencies))
+    return result
+
+
+def memory_usage(pid: int) -> Dict[str, float]:
+    """
+    Devuelve RSS, PSS y memoria compartida de un proceso en MB (solo Linux).
+    """
+    usage = {}
+    try:
+        with open(f'/proc/{pid}/smaps_rollup') as smaps:
+            for line in smaps:
+                key, _, rest = line.partition(':')
+                if key in ('Rss', 'Pss', 'Shared_Clean', 'Shared_Dirty'):
+                    usage[key.lower() + '_mb'] = int(rest.split()[0]) / 1024
+    except OSError:
+        pass
+    return usage
+
+
+def write_results(results: Dict, output: Optional[str]) -> None:
+    """
+    Escribe los resultados en JSON en ``output`` o en la salida estándar.
+    """
+    results = dict(
+        results,
+        commit=git_revision(),
+        python=sys.version.split()[0],
+        cpu_count=os.cpu_count(),
+        timestamp=time.strftime('%Y-%m-%dT%H:%M:%S')
+    )
+    text = json.dumps(results, indent=2)
+    if output:
+        with open(output, 'w') as handle:
+            handle.write(text + '\n')
+    else:
+        print(text)
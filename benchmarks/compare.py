@@ -0,0 +1,116 @@
+"""
+Compara dos resultados de benchmark para detectar regresiones.
+
+Recorre las métricas numéricas de ambos JSON (por ejemplo, la salida de
+``bench_micro.py`` en dos commits) y reporta las que empeoran más que el
+umbral: tiempos, latencias y memoria que suben, o throughput que baja.
+Termina con código 1 si hay alguna regresión, para poder usarlo en CI.
+
+Uso:
+    python benchmarks/compare.py base.json nuevo.json --threshold 10
+"""
+
+import argparse
+import json
+import sys
+from typing import Dict, List, Optional, Tuple
+
+LOWER_IS_BETTER = ('_ms', '_us', '_seconds', '_mb')
+HIGHER_IS_BETTER = ('throughput_rps', 'rows_per_second')
+IGNORED_KEYS = ('calls', 'requests', 'concurrency', 'batch_size', 'workers', 'cpu_count')
+# Campos que identifican cada elemento de una lista de resultados
+IDENTITY_KEYS = ('configuration', 'server', 'max_wait_us', 'concurrency', 'batch_size', 'workers')
+
+
+def direction(path: str) -> Optional[int]:
+    """
+    Devuelve 1 si la métrica mejora al subir, -1 si mejora al bajar, o None
+    si no es una métrica comparable.
+    """
+    key = path.rsplit('.', 1)[-1]
+    if key in IGNORED_KEYS:
+        return None
+    if key.endswith(HIGHER_IS_BETTER):
+        return 1
+    if key.endswith(LOWER_IS_BETTER):
+        return -1
+    return None
+
+
+def flatten(data, prefix: str = '') -> Dict[str, float]:
+    """
+    Aplana un JSON de resultados en {ruta: valor} con las métricas numéricas.
+    """
+    values = {}
+    if isinstance(data, dict):
+        for key, value in data.items():
+            values.update(flatten(value, f"{prefix}.{key}" if prefix else key))
+    elif isinstance(data, list):
+        for i, item in enumerate(data):
+            identity = [f"{key}={item[key]}" for key in IDENTITY_KEYS if isinstance(item, dict) and key in item]
+            values.update(flatten(item, f"{prefix}[{','.join(identity) or i}]"))
+    elif isinstance(data, (int, float)) and not isinstance(data, bool):
+        values[prefix] = float(data)
+    return values
+
+
+def compare(base: Dict, new: Dict, threshold: float) -> Tuple[List[Dict], List[Dict]]:
+    """
+    Compara dos resultados.
+
+    Args:
+        base: Resultados de referencia
+        new: Resultados a evaluar
+        threshold: Porcentaje de empeoramiento tolerado
+
+    Returns:
+        Tupla (regresiones, mejoras) con la ruta, ambos valores y el cambio
+        porcentual de cada métrica que supera el umbral
+    """
+    base_values = flatten(base.get('results', base))
+    new_values = flatten(new.get('results', new))
+    regressions, improvements = [], []
+
+    for path in sorted(base_values.keys() & new_values.keys()):
+        sign = direction(path)
+        before, after = base_values[path], new_values[path]
+        if sign is None or before == 0:
+            continue
+        change = (after - before) / abs(before) * 100
+        entry = {'metric': path, 'base': before, 'new': after, 'change_pct': change}
+        if -sign * change > threshold:
+            regressions.append(entry)
+        elif sign * change > threshold:
+            improvements.append(entry)
+
+    return regressions, improvements
+
+
+def main(argv=None):
+    """
+    Compara dos archivos de resultados e imprime el informe.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('base', help='JSON de referencia')
+    parser.add_argument('new', help='JSON a evaluar')
+    parser.add_argument('--threshold', type=float, default=10.0, help='Porcentaje de cambio tolerado')
+    args = parser.parse_args(argv)
+
+    with open(args.base) as handle:
+        base = json.load(handle)
+    with open(args.new) as handle:
+        new = json.load(handle)
+
+    regressions, improvements = compare(base, new, args.threshold)
+
+    print(f"{base.get('commit')} -> {new.get('commit')} (umbral {args.threshold:.0f}%)")
+    for title, entries in (('Regresiones', regressions), ('Mejoras', improvements)):
+        print(f"{title}: {len(entries)}")
+        for entry in entries:
+            print(f"  {entry['metric']}: {entry['base']:.4g} -> {entry['new']:.4g} ({entry['change_pct']:+.1f}%)")
+
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,283 @@
+"""
+Fuentes de datos en streaming para el entrenamiento fuera de memoria.
+
+Cada fuente recorre un archivo CSV, JSONL o Parquet por bloques de filas y
+devuelve, por bloque, la matriz de features en el orden del esquema y el
+vector de clases. Nunca se carga el archivo completo: la memoria depende
+del tamaño de bloque.
+
+Los nombres de columna se comparan normalizando espacios a guiones bajos,
+de modo que se aceptan tanto los nombres de scikit-learn (``mean radius``)
+como los de la API (``mean_radius``).
+"""
+
+import logging
+import os
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - dependencia opcional
+    pq = None
+
+logger = logging.getLogger(__name__)
+
+TARGET_COLUMN = 'target'
+DATA_FORMATS = ('csv', 'jsonl', 'parquet')
+
+
+def normalize_name(name: str) -> str:
+    """
+    Normaliza un nombre de columna (espacios a guiones bajos).
+    """
+    return str(name).strip().replace(' ', '_')
+
+
+def rows_for_memory(memory_mb: float, n_features: int, copies: float) -> int:
+    """
+    Filas que caben en ``memory_mb`` si cada fila ocupa ``copies`` copias
+    de ``n_features`` float64.
+    """
+    return max(1, int(memory_mb * (1 << 20) / (n_features * 8 * copies)))
+
+
+class DataSource:
+    """
+    Base de las fuentes de datos por bloques.
+    """
+
+    data_format = None
+
+    def __init__(self, path: str, feature_names: Sequence[str], target_column: str = TARGET_COLUMN):
+        """
+        Args:
+            path: Ruta del archivo
+            feature_names: Features a extraer, en el orden del modelo
+            target_column: Columna con la clase (entero)
+        """
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Archivo de datos no encontrado: {path}")
+        self.path = path
+        self.feature_names = list(feature_names)
+        self.target_column = target_column
+        self.skipped_rows = 0
+
+    def iter_chunks(self, chunk_size: int) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Recorre el archivo por bloques.
+
+        Args:
+            chunk_size: Filas por bloque
+
+        Yields:
+            Tupla (matriz_de_features float64, vector_de_clases int64). Las
+            filas con valores ausentes o no numéricos se descartan y se
+            cuentan en ``skipped_rows``.
+        """
+        self.skipped_rows = 0
+        for frame in self._iter_frames(chunk_size):
+            X, y = self._to_arrays(frame)
+            if len(y):
+                yield X, y
+
+    def _iter_frames(self, chunk_size: int) -> Iterator[pd.DataFrame]:
+        raise NotImplementedError
+
+    def _to_arrays(self, frame: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Extrae features y clase de un bloque.
+        """
+        columns = {normalize_name(column): column for column in frame.columns}
+        wanted = self.feature_names + [self.target_column]
+        missing = [name for name in wanted if normalize_name(name) not in columns]
+        if missing:
+            raise ValueError(f"Faltan columnas en {self.path}: {missing}")
+
+        selected = frame[[columns[normalize_name(name)] for name in wanted]]
+        # Solo las columnas no numéricas (p. ej. con textos) se convierten
+        non_numeric = [c for c in selected.columns if not pd.api.types.is_numeric_dtype(selected[c])]
+        if non_numeric:
+            selected = selected.assign(**{c: pd.to_numeric(selected[c], errors='coerce') for c in non_numeric})
+        values = selected.to_numpy(dtype=np.float64)
+        valid = ~np.isnan(values).any(axis=1)
+        if not valid.all():
+            self.skipped_rows += int(len(valid) - valid.sum())
+            values = values[valid]
+        return np.ascontiguousarray(values[:, :-1]), values[:, -1].astype(np.int64)
+
+
+class CSVDataSource(DataSource):
+    """
+    Archivo CSV con cabecera.
+    """
+
+    data_format = 'csv'
+
+    def _iter_frames(self, chunk_size: int) -> Iterator[pd.DataFrame]:
+        yield from pd.read_csv(self.path, chunksize=chunk_size)
+
+
+class JSONLDataSource(DataSource):
+    """
+    Archivo JSONL (un objeto JSON por línea).
+    """
+
+    data_format = 'jsonl'
+
+    def _iter_frames(self, chunk_size: int) -> Iterator[pd.DataFrame]:
+        with pd.read_json(self.path, lines=True, chunksize=chunk_size) as reader:
+            yield from reader
+
+
+class ParquetDataSource(DataSource):
+    """
+    Archivo Parquet, leído por lotes de filas con pyarrow.
+    """
+
+    data_format = 'parquet'
+
+    def __init__(self, path: str, feature_names: Sequence[str], target_column: str = TARGET_COLUMN):
+        if pq is None:
+            raise ImportError("pyarrow es necesario para leer archivos Parquet")
+        super().__init__(path, feature_names, target_column)
+
+    def _iter_frames(self, chunk_size: int) -> Iterator[pd.DataFrame]:
+        parquet_file = pq.ParquetFile(self.path)
+        for batch in parquet_file.iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+
+
+SOURCES = {source.data_format: source for source in (CSVDataSource, JSONLDataSource, ParquetDataSource)}
+
+
+def open_source(path: str, feature_names: Sequence[str], target_column: str = TARGET_COLUMN,
+                data_format: Optional[str] = None) -> DataSource:
+    """
+    Crea la fuente adecuada para un archivo.
+
+    Args:
+        path: Ruta del archivo
+        feature_names: Features a extraer
+        target_column: Columna con la clase
+        data_format: 'csv', 'jsonl' o 'parquet' (por defecto, según la extensión)
+
+    Returns:
+        Fuente de datos
+    """
+    if data_format is None:
+        extension = os.path.splitext(path)[1].lower()
+        data_format = {'.csv': 'csv', '.jsonl': 'jsonl', '.ndjson': 'jsonl',
+                       '.parquet': 'parquet', '.pq': 'parquet'}.get(extension)
+    if data_format not in SOURCES:
+        raise ValueError(f"Formato no soportado: {path}. Use uno de {DATA_FORMATS}")
+    return SOURCES[data_format](path, feature_names, target_column)
+
+
+class StratifiedStreamSplitter:
+    """
+    División train/test estratificada en una sola pasada.
+
+    Dentro de cada clase las filas se reparten por muestreo sistemático (con
+    una fase aleatoria por clase): de cada ``1 / test_size`` filas de una
+    clase, una va a test. Así cada clase aporta exactamente su proporción
+    al test sin conocer de antemano cuántas filas hay.
+    """
+
+    def __init__(self, test_size: float = 0.2, random_state: int = 42):
+        """
+        Args:
+            test_size: Proporción de cada clase que va a test
+            random_state: Semilla de las fases
+        """
+        if not 0.0 < test_size < 1.0:
+            raise ValueError("test_size debe estar entre 0 y 1")
+        self.test_size = test_size
+        self._rng = np.random.RandomState(random_state)
+        self._seen = {}
+        self._phase = {}
+
+    def split(self, y: np.ndarray) -> np.ndarray:
+        """
+        Decide qué filas de un bloque van a test.
+
+        Args:
+            y: Clases del bloque
+
+        Returns:
+            Máscara booleana, True para las filas de test
+        """
+        is_test = np.zeros(len(y), dtype=bool)
+        for label in np.unique(y).tolist():
+            rows = np.flatnonzero(y == label)
+            start = self._seen.get(label, 0)
+            phase = self._phase.setdefault(label, self._rng.rand())
+            positions = start + phase + np.arange(len(rows))
+            is_test[rows] = np.floor((positions + 1) * self.test_size) > np.floor(positions * self.test_size)
+            self._seen[label] = start + len(rows)
+        return is_test
+
+
+class ArraySpool:
+    """
+    Matriz que se escribe en disco por bloques y se lee por tramos.
+
+    Los tramos se leen con ``np.fromfile`` en memoria privada en lugar de
+    mapear el archivo: al liberar el tramo la memoria vuelve al sistema y
+    el pico de memoria del proceso no crece con el tamaño del archivo.
+    """
+
+    def __init__(self, path: str, n_columns: Optional[int] = None, dtype=np.float64):
+        """
+        Args:
+            path: Archivo binario destino (se sobrescribe)
+            n_columns: Columnas de cada fila (None = vector)
+            dtype: Tipo de los elementos
+        """
+        self.path = path
+        self.n_columns = n_columns
+        self.dtype = np.dtype(dtype)
+        self.rows = 0
+        self._file = open(path, 'wb')
+
+    def append(self, values: np.ndarray) -> None:
+        """
+        Añade filas al final del archivo.
+        """
+        values = np.ascontiguousarray(values, dtype=self.dtype)
+        self._file.write(values.tobytes())
+        self.rows += len(values)
+
+    def close(self) -> None:
+        """
+        Cierra el archivo de escritura.
+        """
+        if not self._file.closed:
+            self._file.close()
+
+    def read(self, rows: slice) -> np.ndarray:
+        """
+        Lee un tramo contiguo de filas.
+
+        Args:
+            rows: Tramo de filas (``slice`` con paso 1)
+
+        Returns:
+            Array con las filas del tramo
+        """
+        self.close()
+        start, stop, _ = rows.indices(self.rows)
+        width = self.n_columns or 1
+        with open(self.path, 'rb') as spool_file:
+            spool_file.seek(start * width * self.dtype.itemsize)
+            values = np.fromfile(spool_file, dtype=self.dtype, count=max(stop - start, 0) * width)
+        return values if self.n_columns is None else values.reshape(-1, self.n_columns)
+
+
+def shard_slices(n_rows: int, n_shards: int) -> List[slice]:
+    """
+    Divide ``n_rows`` filas en ``n_shards`` tramos contiguos de tamaño casi igual.
+    """
+    return [slice(n_rows * i // n_shards, n_rows * (i + 1) // n_shards) for i in range(n_shards)]
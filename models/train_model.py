@@ -3,35 +3,711 @@ Módulo para entrenar y serializar el modelo de predicción de cáncer de mama.
 
 Este módulo carga el dataset Breast Cancer Wisconsin, entrena un modelo
 Random Forest y lo guarda para su uso posterior en la API.
+
+Con ``--tune`` los hiperparámetros del bosque se eligen con una búsqueda
+aleatoria por halving sucesivo (en paralelo en un pool de procesos) cuyo
+objetivo combina la precisión con la latencia de inferencia estimada, de
+modo que se prefieren bosques más pequeños o menos profundos dentro del
+presupuesto de p99.
+
+Con ``--compress`` el bosque entrenado se comprime (menos árboles y menor
+profundidad) mientras la concordancia de ``predict_proba`` y las métricas de
+test se mantengan dentro de la tolerancia, y se guarda un informe de
+latencia, tamaño y precisión en ``compression_report.json``.
+
+Con ``--data`` el modelo se entrena fuera de memoria sobre un archivo CSV,
+JSONL o Parquet (por ejemplo, los casos acumulados en producción): el
+archivo se recorre por bloques, el scaler se ajusta con ``partial_fit``, la
+división train/test se hace estratificada sobre el flujo y el bosque se
+combina a partir de bosques entrenados por fragmentos (shards). La memoria
+máxima se fija con ``--memory-mb``.
+
+Con ``--incremental --data`` el modelo actual se actualiza solo con los
+casos nuevos del archivo: las estadísticas del scaler se acumulan con
+``partial_fit`` (y los umbrales de los árboles existentes se trasladan a la
+nueva escala), se añaden árboles entrenados con ``warm_start`` sobre esos
+casos y, con ``--replace-weakest``, se retiran los árboles que peor los
+clasifican. El tiempo depende del tamaño de los datos nuevos, no del
+histórico. Cada entrenamiento publica además el artefacto como una versión
+inmutable en el registro ``models/registry`` (``api/registry.py``).
+
+Uso:
+    python models/train_model.py
+    python models/train_model.py --data casos.parquet --memory-mb 512
+    python models/train_model.py --incremental --data casos_nuevos.csv --new-trees 10
+    python models/train_model.py --tune --latency-budget-ms 1.0
+    python models/train_model.py --compress --metric-tolerance 0.01
 """
 
+import argparse
+import copy
+import json
+import math
 import os
 import logging
+import resource
+import shutil
+import sys
+import tempfile
+import time
 from datetime import datetime
-from typing import Tuple
+from typing import Dict, List, Optional, Tuple
 
 import joblib
 import numpy as np
 import pandas as pd
 from sklearn.datasets import load_breast_cancer
+from sklearn.base import clone
 from sklearn.ensemble import RandomForestClassifier
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
 from sklearn.metrics import (
     accuracy_score,
     classification_report,
     confusion_matrix,
     f1_score,
     precision_score,
-    recall_score
+    recall_score,
+    roc_auc_score
 )
-from sklearn.model_selection import cross_val_score, train_test_split
+from sklearn.model_selection import HalvingRandomSearchCV, cross_val_score, train_test_split
 from sklearn.preprocessing import StandardScaler
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from api.forest_engine import CompiledForest
+from api.registry import ModelRegistry
+from models.data_sources import (
+    ArraySpool,
+    DataSource,
+    StratifiedStreamSplitter,
+    open_source,
+    rows_for_memory,
+    shard_slices
+)
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger(__name__)
 
+# Configuración fija del bosque cuando no se buscan hiperparámetros
+FOREST_PARAMS = {
+    'n_estimators': 100,
+    'max_depth': 10,
+    'min_samples_split': 5,
+    'min_samples_leaf': 2
+}
+
+# Memoria máxima del entrenamiento fuera de memoria y copias de cada fila
+# (en float64) que se asumen al leer un bloque (medido con el parser CSV de
+# pandas: tokens, DataFrame y matriz) y al entrenar un shard (matriz cruda,
+# escalada, copia float32 del bosque e índices)
+TRAINING_MEMORY_MB = float(os.environ.get('TRAINING_MEMORY_MB', 512))
+CHUNK_ROW_COPIES = 10
+SHARD_ROW_COPIES = 8
+
+# Presupuesto de p99 por fila del motor compilado y peso de la latencia en
+# el objetivo de la búsqueda (precisión - peso * latencia / presupuesto)
+LATENCY_BUDGET_MS = float(os.environ.get('LATENCY_BUDGET_MS', 1.0))
+LATENCY_WEIGHT = float(os.environ.get('LATENCY_WEIGHT', 0.02))
+
+# Tolerancias de la compresión: fracción de filas cuya clase puede cambiar
+# respecto al bosque completo, diferencia media de sus probabilidades y
+# caída máxima de cada métrica de test
+COMPRESSION_AGREEMENT_TOLERANCE = float(os.environ.get('COMPRESSION_AGREEMENT_TOLERANCE', 0.01))
+COMPRESSION_PROBABILITY_TOLERANCE = float(os.environ.get('COMPRESSION_PROBABILITY_TOLERANCE', 0.05))
+COMPRESSION_METRIC_TOLERANCE = float(os.environ.get('COMPRESSION_METRIC_TOLERANCE', 0.01))
+
+# Árboles que añade cada actualización incremental
+INCREMENTAL_NEW_TREES = int(os.environ.get('INCREMENTAL_NEW_TREES', 10))
+
+# Subdirectorio del registro de versiones del artefacto
+REGISTRY_DIR = 'registry'
+
+# Métricas de evaluación ya calculadas, por hash de datos y modelo
+EVALUATION_CACHE_DIR = os.environ.get('EVALUATION_CACHE_DIR', os.path.join('.cache', 'evaluation'))
+
+PARAM_DISTRIBUTIONS = {
+    'n_estimators': [25, 50, 100, 200, 300],
+    'max_depth': [4, 6, 8, 10, 12, 16, None],
+    'min_samples_split': [2, 5, 10],
+    'min_samples_leaf': [1, 2, 4],
+    'max_features': ['sqrt', 'log2', 0.5]
+}
+
+
+def flatten_forest(model: RandomForestClassifier) -> Dict[str, np.ndarray]:
+    """
+    Aplana los árboles de un Random Forest en arrays NumPy contiguos.
+
+    Todos los nodos comparten un espacio de índices global. ``children``
+    intercala los hijos izquierdo (``2 * nodo``) y derecho (``2 * nodo + 1``)
+    de cada nodo; las hojas son sus propios hijos para que el recorrido
+    vectorizado de ``api/forest_engine.py`` pueda iterar ``max_depth`` veces
+    sin ramas.
+    Los arrays se generan ya con los tipos que usa el motor, de modo que se
+    pueden mapear en memoria sin conversiones.
+
+    Args:
+        model: Random Forest entrenado
+
+    Returns:
+        Diccionario con los arrays del bosque
+    """
+    features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+    offset = 0
+    
+    for estimator in model.estimators_:
+        tree = estimator.tree_
+        node_ids = np.arange(tree.node_count)
+        is_leaf = tree.children_left == -1
+        
+        value = tree.value[:, 0, :].astype(np.float64)
+        normalizer = value.sum(axis=1, keepdims=True)
+        normalizer[normalizer == 0.0] = 1.0
+        
+        features.append(np.where(is_leaf, 0, tree.feature))
+        thresholds.append(np.where(is_leaf, 0.0, tree.threshold))
+        lefts.append(np.where(is_leaf, node_ids, tree.children_left) + offset)
+        rights.append(np.where(is_leaf, node_ids, tree.children_right) + offset)
+        values.append(value / normalizer)
+        roots.append(offset)
+        offset += tree.node_count
+    
+    children = np.column_stack((np.concatenate(lefts), np.concatenate(rights)))
+    
+    return {
+        'feature': np.concatenate(features).astype(np.intp),
+        'threshold': np.concatenate(thresholds).astype(np.float64),
+        'children': np.ravel(children).astype(np.intp),
+        'value': np.ascontiguousarray(np.concatenate(values)),
+        'roots': np.array(roots, dtype=np.intp),
+        'max_depth': np.array(max(e.tree_.max_depth for e in model.estimators_)),
+        'n_features': np.array(model.n_features_in_),
+        'classes': np.asarray(model.classes_)
+    }
+
+
+def _float_to_ordered(values: np.ndarray) -> np.ndarray:
+    """
+    Mapea floats a enteros cuyo orden coincide con el de los floats.
+    """
+    bits = values.view(np.int64)
+    return np.where(bits < 0, -(bits & np.int64(0x7FFFFFFFFFFFFFFF)), bits)
+
+
+def _ordered_to_float(keys: np.ndarray) -> np.ndarray:
+    """
+    Inversa de ``_float_to_ordered``.
+    """
+    bits = np.where(keys < 0, (-keys) | np.int64(np.iinfo(np.int64).min), keys)
+    return bits.view(np.float64)
+
+
+def _raw_thresholds(feature: np.ndarray, threshold: np.ndarray, mean: np.ndarray,
+                    scale: np.ndarray) -> np.ndarray:
+    """
+    Para cada nodo, el mayor valor crudo ``x`` (float64) que cumple
+    ``float32((x - mean) / scale) <= threshold``.
+    """
+    node_mean = mean[feature]
+    node_scale = scale[feature]
+    
+    def goes_left(x: np.ndarray) -> np.ndarray:
+        scaled = ((x - node_mean) / node_scale).astype(np.float32)
+        return scaled <= threshold
+    
+    max_float = np.finfo(np.float64).max
+    low = _float_to_ordered(np.full(len(threshold), -max_float))
+    high = _float_to_ordered(np.full(len(threshold), max_float))
+    
+    # Invariante: goes_left(low) es cierto y goes_left(high) es falso.
+    with np.errstate(over='ignore'):
+        for _ in range(64):
+            middle = (low >> 1) + (high >> 1) + (low & high & 1)
+            left = goes_left(_ordered_to_float(middle))
+            low = np.where(left, middle, low)
+            high = np.where(left, high, middle)
+    
+    return _ordered_to_float(low)
+
+
+def fuse_scaler(arrays: Dict[str, np.ndarray], scaler: StandardScaler) -> Dict[str, np.ndarray]:
+    """
+    Integra el StandardScaler en los umbrales de un bosque aplanado.
+
+    Para cada nodo busca el mayor valor crudo ``x`` (float64) que cumple
+    ``float32((x - mean) / scale) <= threshold``, es decir, la misma decisión
+    que toma el pipeline scaler + bosque. Como esa transformación es monótona,
+    la búsqueda binaria sobre la representación ordenada de los float64 da el
+    umbral exacto y el artefacto resultante predice lo mismo sin escalar.
+
+    Args:
+        arrays: Arrays del bosque devueltos por ``flatten_forest``
+        scaler: Scaler ajustado en el entrenamiento
+
+    Returns:
+        Copia de los arrays con los umbrales en el espacio de features crudas
+    """
+    n_features = int(arrays['n_features'])
+    mean = scaler.mean_ if scaler.mean_ is not None else np.zeros(n_features)
+    scale = scaler.scale_ if scaler.scale_ is not None else np.ones(n_features)
+    
+    left = arrays['children'][0::2]
+    is_split = left != np.arange(len(left))
+    raw_threshold = _raw_thresholds(arrays['feature'][is_split], arrays['threshold'][is_split], mean, scale)
+    
+    fused = dict(arrays)
+    fused['threshold'] = arrays['threshold'].copy()
+    fused['threshold'][is_split] = raw_threshold
+    fused['fused'] = np.array(True)
+    
+    return fused
+
+
+def save_forest_arrays(arrays: Dict[str, np.ndarray], path: str) -> None:
+    """
+    Guarda un bosque aplanado como un directorio de archivos ``.npy`` sin
+    comprimir, que la API carga con ``np.load(mmap_mode='r')``.
+
+    Los archivos se escriben en un directorio temporal que luego sustituye
+    al anterior: nunca se truncan archivos que otro proceso pueda tener
+    mapeados en memoria.
+
+    Args:
+        arrays: Arrays del bosque
+        path: Directorio destino
+    """
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    old_path = f"{path}.old-{os.getpid()}"
+    
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+    for name, array in arrays.items():
+        np.save(os.path.join(tmp_path, f"{name}.npy"), np.asarray(array), allow_pickle=False)
+    
+    if os.path.exists(path):
+        os.rename(path, old_path)
+    os.rename(tmp_path, path)
+    shutil.rmtree(old_path, ignore_errors=True)
+
+
+def measure_p99_ms(model: RandomForestClassifier, X: np.ndarray, n_calls: int = 200) -> float:
+    """
+    Mide la latencia p99 de una predicción de una fila con el motor
+    compilado que usa la API.
+
+    Args:
+        model: Random Forest entrenado
+        X: Matriz de la que se toma la fila de prueba
+        n_calls: Número de predicciones medidas
+
+    Returns:
+        Latencia p99 en milisegundos
+    """
+    compiled = CompiledForest(flatten_forest(model))
+    row = np.asarray(X[:1])
+    compiled.predict_proba(row)
+    
+    timings = []
+    for _ in range(n_calls):
+        start = time.perf_counter()
+        compiled.predict_proba(row)
+        timings.append(time.perf_counter() - start)
+    return float(np.percentile(timings, 99) * 1000)
+
+
+class InferenceLatencyModel:
+    """
+    Estima la latencia p99 por fila del motor compilado de un bosque.
+
+    El motor recorre todos los árboles a la vez durante ``max_depth``
+    iteraciones, así que su coste es lineal en árboles x profundidad. La
+    recta se calibra una vez, en serie, y la estimación es determinista: no
+    depende de la carga de los procesos de la búsqueda.
+    """
+
+    def __init__(self, base_ms: float, per_node_ms: float):
+        """
+        Args:
+            base_ms: Coste fijo por predicción
+            per_node_ms: Coste por árbol y nivel de profundidad
+        """
+        self.base_ms = base_ms
+        self.per_node_ms = per_node_ms
+
+    @staticmethod
+    def forest_size(model: RandomForestClassifier) -> int:
+        """
+        Árboles x profundidad máxima alcanzada del bosque entrenado.
+        """
+        return len(model.estimators_) * max(e.tree_.max_depth for e in model.estimators_)
+
+    @classmethod
+    def calibrate(cls, X: np.ndarray, y: np.ndarray, random_state: int = 42) -> 'InferenceLatencyModel':
+        """
+        Ajusta la recta midiendo un bosque pequeño y uno grande.
+
+        Args:
+            X: Features de entrenamiento
+            y: Target de entrenamiento
+            random_state: Semilla de los bosques de calibración
+
+        Returns:
+            Modelo de latencia calibrado
+        """
+        points = []
+        for n_estimators, max_depth in ((20, 4), (200, 12)):
+            forest = RandomForestClassifier(
+                n_estimators=n_estimators, max_depth=max_depth, random_state=random_state
+            ).fit(X, y)
+            points.append((cls.forest_size(forest), measure_p99_ms(forest, X)))
+        
+        (small_size, small_ms), (large_size, large_ms) = points
+        per_node_ms = max(large_ms - small_ms, 0.0) / (large_size - small_size)
+        return cls(max(small_ms - per_node_ms * small_size, 0.0), per_node_ms)
+
+    def estimate_ms(self, model: RandomForestClassifier) -> float:
+        """
+        Latencia p99 estimada por fila del bosque entrenado.
+        """
+        return self.base_ms + self.per_node_ms * self.forest_size(model)
+
+
+class LatencyAwareScorer:
+    """
+    Objetivo de la búsqueda: precisión penalizada por la latencia estimada.
+
+    Dentro del presupuesto la penalización es proporcional a la latencia
+    (a igual precisión gana el bosque más rápido); fuera del presupuesto se
+    resta además 1, lo que descarta al candidato.
+    """
+
+    def __init__(self, latency_model: InferenceLatencyModel, budget_ms: float = LATENCY_BUDGET_MS,
+                 weight: float = LATENCY_WEIGHT):
+        self.latency_model = latency_model
+        self.budget_ms = budget_ms
+        self.weight = weight
+
+    def __call__(self, estimator: RandomForestClassifier, X: np.ndarray, y: np.ndarray) -> float:
+        latency_ms = self.latency_model.estimate_ms(estimator)
+        score = accuracy_score(y, estimator.predict(X)) - self.weight * latency_ms / self.budget_ms
+        return score - 1.0 if latency_ms > self.budget_ms else score
+
+
+def score_metrics(y_true: np.ndarray, y_pred: np.ndarray) -> Dict[str, float]:
+    """
+    Calcula las métricas de test que reporta ``evaluate_model``.
+
+    Args:
+        y_true: Clases reales
+        y_pred: Clases predichas
+
+    Returns:
+        Diccionario con accuracy, precision, recall y f1 (ponderadas)
+    """
+    return {
+        'accuracy': float(accuracy_score(y_true, y_pred)),
+        'precision': float(precision_score(y_true, y_pred, average='weighted')),
+        'recall': float(recall_score(y_true, y_pred, average='weighted')),
+        'f1': float(f1_score(y_true, y_pred, average='weighted'))
+    }
+
+
+def truncate_tree(estimator, max_depth: int):
+    """
+    Devuelve una copia del árbol podado a ``max_depth`` niveles.
+
+    Los nodos de la última profundidad pasan a ser hojas con la distribución
+    de clases de las muestras que los alcanzan, y los subárboles que
+    cuelgan de ellos se eliminan (los nodos se renumeran en preorden, como
+    los genera scikit-learn).
+
+    Args:
+        estimator: DecisionTreeClassifier entrenado
+        max_depth: Profundidad máxima del árbol podado
+
+    Returns:
+        DecisionTreeClassifier podado
+    """
+    pruned = copy.deepcopy(estimator)
+    state = pruned.tree_.__getstate__()
+    nodes = state['nodes']
+    
+    kept, depths = [], []
+    stack = [(0, 0)]
+    while stack:
+        node, depth = stack.pop()
+        kept.append(node)
+        depths.append(depth)
+        if nodes['left_child'][node] != -1 and depth < max_depth:
+            stack.append((nodes['right_child'][node], depth + 1))
+            stack.append((nodes['left_child'][node], depth + 1))
+    
+    new_index = {node: i for i, node in enumerate(kept)}
+    new_nodes = nodes[kept].copy()
+    for i, (node, depth) in enumerate(zip(kept, depths)):
+        if nodes['left_child'][node] == -1 or depth == max_depth:
+            new_nodes['left_child'][i] = new_nodes['right_child'][i] = -1
+            new_nodes['feature'][i] = -2
+            new_nodes['threshold'][i] = -2.0
+        else:
+            new_nodes['left_child'][i] = new_index[nodes['left_child'][node]]
+            new_nodes['right_child'][i] = new_index[nodes['right_child'][node]]
+    
+    state.update(
+        nodes=new_nodes,
+        values=np.ascontiguousarray(state['values'][kept]),
+        node_count=len(kept),
+        max_depth=max(depths)
+    )
+    pruned.tree_.__setstate__(state)
+    return pruned
+
+
+def greedy_tree_order(tree_probabilities: np.ndarray, target: np.ndarray) -> List[int]:
+    """
+    Ordena los árboles por selección voraz: en cada paso añade el árbol
+    cuyo promedio con los ya elegidos más se acerca a las probabilidades
+    del bosque completo.
+
+    Args:
+        tree_probabilities: Array árboles x filas x clases
+        target: Probabilidades del bosque completo (filas x clases)
+
+    Returns:
+        Índices de los árboles en orden de selección
+    """
+    remaining = list(range(len(tree_probabilities)))
+    total = np.zeros_like(target)
+    order = []
+    
+    for size in range(1, len(tree_probabilities) + 1):
+        candidates = (total + tree_probabilities[remaining]) / size
+        errors = ((candidates - target) ** 2).sum(axis=(1, 2))
+        best = remaining.pop(int(np.argmin(errors)))
+        total += tree_probabilities[best]
+        order.append(best)
+    
+    return order
+
+
+def forest_nodes(model: RandomForestClassifier) -> int:
+    """
+    Número total de nodos del bosque.
+    """
+    return sum(e.tree_.node_count for e in model.estimators_)
+
+
+def compress_forest(
+    model: RandomForestClassifier,
+    X_select: np.ndarray,
+    X_test: np.ndarray,
+    y_test: np.ndarray,
+    agreement_tolerance: float = COMPRESSION_AGREEMENT_TOLERANCE,
+    metric_tolerance: float = COMPRESSION_METRIC_TOLERANCE,
+    probability_tolerance: float = COMPRESSION_PROBABILITY_TOLERANCE
+) -> Tuple[RandomForestClassifier, Dict]:
+    """
+    Busca el bosque más barato (árboles x profundidad, el coste del motor
+    compilado) que reproduce al bosque completo dentro de las tolerancias.
+
+    Para cada profundidad, de la máxima hacia abajo, poda todos los árboles
+    a esa profundidad, los ordena con ``greedy_tree_order`` sobre
+    ``X_select`` y toma el prefijo más corto que cumple:
+
+    - la clase difiere del bosque completo en como mucho una fracción
+      ``agreement_tolerance`` de las filas de ``X_select`` y de ``X_test``
+    - la diferencia absoluta media de ``predict_proba`` con el bosque
+      completo no supera ``probability_tolerance`` en ninguno de los dos
+    - ninguna métrica de ``score_metrics`` en test cae más de
+      ``metric_tolerance``
+
+    Args:
+        model: Random Forest entrenado
+        X_select: Features con las que se eligen los árboles (entrenamiento)
+        X_test: Features de test
+        y_test: Target de test
+        agreement_tolerance: Fracción máxima de filas con distinta clase
+        metric_tolerance: Caída máxima permitida de cada métrica de test
+        probability_tolerance: Diferencia media máxima de las probabilidades
+
+    Returns:
+        Tupla (bosque_comprimido, detalles) con la profundidad, los árboles
+        elegidos y la concordancia obtenida
+    """
+    full_select = model.predict_proba(X_select)
+    full_test = model.predict_proba(X_test)
+    full_classes = (full_select.argmax(axis=1), full_test.argmax(axis=1))
+    reference = score_metrics(y_test, model.classes_[full_test.argmax(axis=1)])
+    max_depth = max(e.tree_.max_depth for e in model.estimators_)
+    
+    best = None
+    for depth in range(max_depth, 0, -1):
+        trees = [truncate_tree(e, depth) for e in model.estimators_]
+        select_probabilities = np.stack([t.predict_proba(X_select) for t in trees])
+        test_probabilities = np.stack([t.predict_proba(X_test) for t in trees])
+        order = greedy_tree_order(select_probabilities, full_select)
+        
+        select_sum = np.cumsum(select_probabilities[order], axis=0)
+        test_sum = np.cumsum(test_probabilities[order], axis=0)
+        found = None
+        for k in range(1, len(order) + 1):
+            select_classes = select_sum[k - 1].argmax(axis=1)
+            test_classes = test_sum[k - 1].argmax(axis=1)
+            agreement = (np.mean(select_classes == full_classes[0]), np.mean(test_classes == full_classes[1]))
+            if min(agreement) < 1.0 - agreement_tolerance:
+                continue
+            probability_diff = (
+                np.abs(select_sum[k - 1] / k - full_select).mean(),
+                np.abs(test_sum[k - 1] / k - full_test).mean()
+            )
+            if max(probability_diff) > probability_tolerance:
+                continue
+            metrics = score_metrics(y_test, model.classes_[test_classes])
+            if all(reference[name] - metrics[name] <= metric_tolerance for name in reference):
+                found = (k, agreement, probability_diff, metrics)
+                break
+        
+        # Con menos profundidad los árboles solo pierden información
+        if found is None:
+            break
+        k, agreement, probability_diff, metrics = found
+        cost = k * max(t.tree_.max_depth for t in (trees[i] for i in order[:k]))
+        if best is None or cost < best['cost']:
+            best = {
+                'cost': cost,
+                'depth': depth,
+                'trees': [trees[i] for i in order[:k]],
+                'tree_indices': [int(i) for i in order[:k]],
+                'agreement_select': float(agreement[0]),
+                'agreement_test': float(agreement[1]),
+                'mean_probability_diff_select': float(probability_diff[0]),
+                'mean_probability_diff_test': float(probability_diff[1]),
+                'max_probability_diff_test': float(np.abs(test_sum[k - 1] / k - full_test).max()),
+                'metrics': metrics
+            }
+    
+    if best is None:
+        # Ni el bosque completo reordenado cumple (redondeo con tolerancia 0)
+        return model, {
+            'depth': max_depth,
+            'tree_indices': list(range(len(model.estimators_))),
+            'agreement_select': 1.0,
+            'agreement_test': 1.0,
+            'mean_probability_diff_select': 0.0,
+            'mean_probability_diff_test': 0.0,
+            'max_probability_diff_test': 0.0,
+            'metrics': reference
+        }
+    
+    compressed = copy.copy(model)
+    compressed.estimators_ = best.pop('trees')
+    compressed.n_estimators = len(compressed.estimators_)
+    compressed.max_depth = best['depth']
+    return compressed, best
+
+
+def combine_forests(forests: List[RandomForestClassifier]) -> RandomForestClassifier:
+    """
+    Une los árboles de varios bosques entrenados con las mismas clases en un
+    único bosque (promedia las probabilidades de todos los árboles).
+
+    Args:
+        forests: Bosques entrenados
+
+    Returns:
+        Bosque con todos los árboles
+
+    Raises:
+        ValueError: Si los bosques no tienen las mismas clases
+    """
+    for forest in forests[1:]:
+        if not np.array_equal(forest.classes_, forests[0].classes_):
+            raise ValueError("Todos los shards deben contener las mismas clases")
+    
+    combined = copy.copy(forests[0])
+    combined.estimators_ = [tree for forest in forests for tree in forest.estimators_]
+    combined.n_estimators = len(combined.estimators_)
+    return combined
+
+
+def rescale_thresholds(model: RandomForestClassifier, old_scaler: StandardScaler,
+                       new_scaler: StandardScaler) -> None:
+    """
+    Traslada los umbrales de todos los árboles de la escala de ``old_scaler``
+    a la de ``new_scaler``, de modo que cada árbol toma las mismas
+    decisiones sobre las features crudas tras actualizar el scaler.
+
+    Como ``(x - mean) / scale`` es creciente por feature, cada umbral se
+    pasa al mayor valor crudo que va a la izquierda (``_raw_thresholds``) y
+    de ahí, redondeado a float32 como las features, a la nueva escala: solo
+    cambian de rama los valores que la nueva escala no distingue del umbral
+    en float32.
+
+    Args:
+        model: Bosque entrenado sobre features escaladas con ``old_scaler``
+        old_scaler: Scaler con el que se entrenaron los árboles
+        new_scaler: Scaler actualizado
+    """
+    n_features = model.n_features_in_
+    old_mean = old_scaler.mean_ if old_scaler.mean_ is not None else np.zeros(n_features)
+    old_scale = old_scaler.scale_ if old_scaler.scale_ is not None else np.ones(n_features)
+    new_mean = new_scaler.mean_ if new_scaler.mean_ is not None else np.zeros(n_features)
+    new_scale = new_scaler.scale_ if new_scaler.scale_ is not None else np.ones(n_features)
+    
+    for estimator in model.estimators_:
+        state = estimator.tree_.__getstate__()
+        nodes = state['nodes']
+        is_split = nodes['left_child'] != -1
+        feature = nodes['feature'][is_split]
+        raw = _raw_thresholds(feature, nodes['threshold'][is_split], old_mean, old_scale)
+        scaled = ((raw - new_mean[feature]) / new_scale[feature]).astype(np.float32)
+        nodes['threshold'][is_split] = scaled
+        estimator.tree_.__setstate__(state)
+
+
+def next_version(model_dir: str) -> int:
+    """
+    Número de la siguiente versión del artefacto de ``model_dir`` (los
+    artefactos anteriores a las versiones cuentan como la 1).
+    """
+    metadata_path = os.path.join(model_dir, 'model_metadata.pkl')
+    if not os.path.exists(metadata_path):
+        return 1
+    return int(joblib.load(metadata_path).get('version', 1)) + 1
+
+
+def metrics_from_confusion(matrix: np.ndarray) -> Dict[str, float]:
+    """
+    Métricas de ``score_metrics`` (ponderadas por soporte) a partir de una
+    matriz de confusión acumulada.
+    """
+    matrix = np.asarray(matrix, dtype=np.float64)
+    true_positive = np.diag(matrix)
+    support = matrix.sum(axis=1)
+    predicted = matrix.sum(axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        precision = np.nan_to_num(true_positive / predicted)
+        recall = np.nan_to_num(true_positive / support)
+        f1 = np.nan_to_num(2 * precision * recall / (precision + recall))
+    weights = support / support.sum()
+    return {
+        'accuracy': float(true_positive.sum() / matrix.sum()),
+        'precision': float((precision * weights).sum()),
+        'recall': float((recall * weights).sum()),
+        'f1': float((f1 * weights).sum())
+    }
+
+
+def peak_memory_mb() -> float:
+    """
+    Memoria residente máxima del proceso en MB.
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1 << 20) if sys.platform == 'darwin' else peak / 1024
+
 
 class BreastCancerModelTrainer:
     """
@@ -52,6 +728,32 @@ class BreastCancerModelTrainer:
         self.scaler = None
         self.feature_names = None
         self.target_names = None
+        self.tuning_results = None
+        self.compression_report = None
+        self.incremental_report = None
+        self.version = None
+        self.parent_version = None
+
+    def load_artifacts(self, model_dir: str = 'models') -> None:
+        """
+        Carga el modelo, el scaler y la metadata guardados por ``save_model``
+        para actualizarlos.
+
+        Args:
+            model_dir: Directorio del artefacto
+
+        Raises:
+            FileNotFoundError: Si falta alguno de los archivos
+        """
+        self.model = joblib.load(os.path.join(model_dir, 'breast_cancer_model.pkl'))
+        self.scaler = joblib.load(os.path.join(model_dir, 'scaler.pkl'))
+        metadata = joblib.load(os.path.join(model_dir, 'model_metadata.pkl'))
+        
+        self.feature_names = np.asarray(metadata['feature_names'])
+        self.target_names = np.asarray(metadata['target_names'])
+        self.tuning_results = metadata.get('tuning')
+        self.parent_version = int(metadata.get('version', 1))
+        logger.info(f"Artefacto v{self.parent_version} cargado: {len(self.model.estimators_)} árboles")
 
     def load_data(self) -> Tuple[pd.DataFrame, pd.Series]:
         """
@@ -117,53 +819,476 @@ class BreastCancerModelTrainer:
         """
         logger.info("Entrenando modelo Random Forest")
         
-        self.model = RandomForestClassifier(
-            n_estimators=100,
-            max_depth=10,
-            min_samples_split=5,
-            min_samples_leaf=2,
-            random_state=self.random_state,
-            n_jobs=-1
-        )
+        self.model = RandomForestClassifier(**FOREST_PARAMS, random_state=self.random_state, n_jobs=-1)
         
         self.model.fit(X_train, y_train)
         logger.info("Modelo entrenado exitosamente")
 
+    def train_out_of_core(
+        self,
+        source: DataSource,
+        memory_mb: float = TRAINING_MEMORY_MB,
+        work_dir: Optional[str] = None,
+        n_estimators: int = FOREST_PARAMS['n_estimators']
+    ) -> Dict:
+        """
+        Entrena el scaler y el bosque recorriendo una fuente por bloques, sin
+        cargarla entera en memoria.
+
+        1. Una pasada por la fuente: cada bloque se divide con
+           ``StratifiedStreamSplitter``, el scaler se ajusta con
+           ``partial_fit`` sobre las filas de train y las filas se escriben
+           en disco (train en un archivo por clase, test en otro).
+        2. Las filas de train se reparten en shards estratificados (el mismo
+           tramo de cada clase) de un tamaño que cabe en ``memory_mb``; cada
+           shard se escala y entrena un bosque con su parte de los árboles.
+        3. Los bosques se combinan en uno y se evalúa sobre el test por
+           bloques, acumulando la matriz de confusión.
+
+        Args:
+            source: Fuente de datos (``models/data_sources.py``)
+            memory_mb: Memoria máxima para un bloque o un shard
+            work_dir: Directorio para los datos intermedios (por defecto uno
+                temporal que se borra al terminar)
+            n_estimators: Árboles totales del bosque combinado
+
+        Returns:
+            Diccionario con las métricas de test y los tamaños del entrenamiento
+        """
+        n_features = len(source.feature_names)
+        chunk_rows = rows_for_memory(memory_mb, n_features, CHUNK_ROW_COPIES)
+        shard_rows = rows_for_memory(memory_mb, n_features, SHARD_ROW_COPIES)
+        logger.info(
+            f"Entrenamiento fuera de memoria desde {source.path}: "
+            f"bloques de {chunk_rows} filas, shards de hasta {shard_rows} filas ({memory_mb:.0f} MB)"
+        )
+        
+        self.feature_names = np.asarray(source.feature_names)
+        if self.target_names is None:
+            self.target_names = np.asarray(['malignant', 'benign'])
+        
+        owns_work_dir = work_dir is None
+        work_dir = work_dir or tempfile.mkdtemp(prefix='train-')
+        os.makedirs(work_dir, exist_ok=True)
+        try:
+            splitter = StratifiedStreamSplitter(self.test_size, self.random_state)
+            self.scaler = StandardScaler()
+            train_spools = {}
+            test_features = ArraySpool(os.path.join(work_dir, 'test_X.bin'), n_features)
+            test_labels = ArraySpool(os.path.join(work_dir, 'test_y.bin'), dtype=np.int64)
+            
+            for X, y in source.iter_chunks(chunk_rows):
+                is_test = splitter.split(y)
+                is_train = ~is_test
+                if is_train.any():
+                    self.scaler.partial_fit(X[is_train])
+                for label in np.unique(y[is_train]).tolist():
+                    if label not in train_spools:
+                        train_spools[label] = ArraySpool(os.path.join(work_dir, f'train_{label}.bin'), n_features)
+                    train_spools[label].append(X[is_train & (y == label)])
+                test_features.append(X[is_test])
+                test_labels.append(y[is_test])
+            
+            if source.skipped_rows:
+                logger.warning(f"Filas descartadas por valores ausentes o no numéricos: {source.skipped_rows}")
+            
+            for spool in [test_features, test_labels, *train_spools.values()]:
+                spool.close()
+            train_spools = dict(sorted(train_spools.items()))
+            n_train = sum(spool.rows for spool in train_spools.values())
+            if len(train_spools) < 2:
+                raise ValueError("Los datos de entrenamiento deben contener al menos dos clases")
+            
+            n_shards = max(1, math.ceil(n_train / shard_rows))
+            trees_per_shard = max(1, round(n_estimators / n_shards))
+            logger.info(f"Train: {n_train} filas en {n_shards} shards de {trees_per_shard} árboles; "
+                        f"test: {test_labels.rows} filas")
+            
+            params = dict(FOREST_PARAMS, n_estimators=trees_per_shard)
+            slices = {label: shard_slices(spool.rows, n_shards) for label, spool in train_spools.items()}
+            forests = []
+            for shard in range(n_shards):
+                parts = {label: spool.read(slices[label][shard]) for label, spool in train_spools.items()}
+                features = np.concatenate(list(parts.values()))
+                labels = np.concatenate([np.full(len(rows), label) for label, rows in parts.items()])
+                del parts
+                forest = RandomForestClassifier(**params, random_state=self.random_state + shard, n_jobs=-1)
+                forests.append(forest.fit(self.scaler.transform(features), labels))
+                del features, labels
+            
+            self.model = combine_forests(forests)
+            logger.info(f"Bosque combinado: {self.model.n_estimators} árboles")
+            
+            classes = self.model.classes_
+            confusion = np.zeros((len(classes), len(classes)), dtype=np.int64)
+            n_test = test_labels.rows
+            for rows in shard_slices(n_test, max(1, math.ceil(n_test / chunk_rows))):
+                y_pred = self.model.predict(self.scaler.transform(test_features.read(rows)))
+                confusion += confusion_matrix(test_labels.read(rows), y_pred, labels=classes)
+        finally:
+            if owns_work_dir:
+                shutil.rmtree(work_dir, ignore_errors=True)
+        
+        test_metrics = metrics_from_confusion(confusion)
+        metrics = {
+            'test_accuracy': test_metrics['accuracy'],
+            'test_precision': test_metrics['precision'],
+            'test_recall': test_metrics['recall'],
+            'test_f1': test_metrics['f1'],
+            'training_date': datetime.now().isoformat(),
+            'n_samples_train': n_train,
+            'n_samples_test': n_test,
+            'n_features': n_features,
+            'n_shards': n_shards,
+            'skipped_rows': source.skipped_rows,
+            'peak_memory_mb': peak_memory_mb()
+        }
+        
+        logger.info(f"Test Accuracy: {metrics['test_accuracy']:.4f}")
+        logger.info(f"Test F1-Score: {metrics['test_f1']:.4f}")
+        logger.info("\nMatriz de Confusión:")
+        print(confusion)
+        logger.info(f"Memoria máxima del proceso: {metrics['peak_memory_mb']:.0f} MB")
+        
+        return metrics
+
+    def update_model(
+        self,
+        source: DataSource,
+        n_new_trees: int = INCREMENTAL_NEW_TREES,
+        replace_weakest: bool = False,
+        memory_mb: float = TRAINING_MEMORY_MB
+    ) -> Dict:
+        """
+        Actualiza el modelo cargado con ``load_artifacts`` usando solo los
+        casos nuevos de ``source``.
+
+        1. Los casos se dividen en train/validación estratificados.
+        2. El scaler acumula las estadísticas de los casos de train con
+           ``partial_fit`` y los umbrales de los árboles existentes se
+           trasladan a la nueva escala (``rescale_thresholds``).
+        3. Con ``replace_weakest`` se retiran los ``n_new_trees`` árboles
+           con menor accuracy sobre los casos de train.
+        4. Se añaden ``n_new_trees`` árboles entrenados con ``warm_start``
+           sobre los casos de train; los hiperparámetros son los del modelo.
+
+        Args:
+            source: Fuente con los casos nuevos etiquetados
+            n_new_trees: Árboles que se añaden
+            replace_weakest: Si es True el bosque mantiene su tamaño
+            memory_mb: Memoria máxima de cada bloque leído
+
+        Returns:
+            Informe con los tamaños, los árboles añadidos y retirados y las
+            métricas de validación antes y después de actualizar
+
+        Raises:
+            ValueError: Si los casos nuevos no contienen todas las clases del modelo
+        """
+        if self.model is None or self.scaler is None:
+            raise ValueError("No hay modelo cargado: llame antes a load_artifacts")
+        if n_new_trees < 1:
+            raise ValueError("n_new_trees debe ser al menos 1")
+        if replace_weakest and n_new_trees >= len(self.model.estimators_):
+            raise ValueError("No se pueden reemplazar todos los árboles del modelo")
+        
+        start = time.perf_counter()
+        chunk_rows = rows_for_memory(memory_mb, len(source.feature_names), CHUNK_ROW_COPIES)
+        splitter = StratifiedStreamSplitter(self.test_size, self.random_state)
+        train_parts, validation_parts = [], []
+        for X, y in source.iter_chunks(chunk_rows):
+            is_validation = splitter.split(y)
+            train_parts.append((X[~is_validation], y[~is_validation]))
+            validation_parts.append((X[is_validation], y[is_validation]))
+        if source.skipped_rows:
+            logger.warning(f"Filas descartadas por valores ausentes o no numéricos: {source.skipped_rows}")
+        
+        X_train = np.concatenate([X for X, _ in train_parts]) if train_parts else np.empty((0, 0))
+        y_train = np.concatenate([y for _, y in train_parts]) if train_parts else np.empty(0, dtype=np.int64)
+        X_validation = np.concatenate([X for X, _ in validation_parts]) if validation_parts else X_train[:0]
+        y_validation = np.concatenate([y for _, y in validation_parts]) if validation_parts else y_train[:0]
+        del train_parts, validation_parts
+        
+        missing = set(self.model.classes_.tolist()) - set(np.unique(y_train).tolist())
+        if missing:
+            raise ValueError(f"Los casos nuevos de train no contienen las clases {sorted(missing)}")
+        logger.info(f"Actualización incremental con {len(y_train)} casos de train "
+                    f"y {len(y_validation)} de validación")
+        
+        old_scaler = copy.deepcopy(self.scaler)
+        self.scaler.partial_fit(X_train)
+        rescale_thresholds(self.model, old_scaler, self.scaler)
+        X_train = self.scaler.transform(X_train)
+        X_validation = self.scaler.transform(X_validation)
+        
+        def validation_metrics() -> Optional[Dict[str, float]]:
+            if not len(y_validation):
+                return None
+            return score_metrics(y_validation, self.model.predict(X_validation))
+        
+        before = validation_metrics()
+        
+        replaced = []
+        if replace_weakest:
+            labels = np.searchsorted(self.model.classes_, y_train)
+            accuracies = np.array([
+                np.mean(np.argmax(tree.predict_proba(X_train), axis=1) == labels)
+                for tree in self.model.estimators_
+            ])
+            replaced = sorted(np.argsort(accuracies, kind='stable')[:n_new_trees].tolist())
+            dropped = set(replaced)
+            self.model.estimators_ = [
+                tree for i, tree in enumerate(self.model.estimators_) if i not in dropped
+            ]
+            logger.info(f"Árboles retirados: {len(replaced)} (accuracy media "
+                        f"{accuracies[replaced].mean():.4f} frente a {accuracies.mean():.4f})")
+        
+        self.model.set_params(warm_start=True, n_estimators=len(self.model.estimators_) + n_new_trees)
+        self.model.fit(X_train, y_train)
+        self.model.set_params(warm_start=False)
+        
+        after = validation_metrics()
+        self.incremental_report = {
+            'parent_version': self.parent_version,
+            'n_samples_train': int(len(y_train)),
+            'n_samples_validation': int(len(y_validation)),
+            'skipped_rows': source.skipped_rows,
+            'added_trees': n_new_trees,
+            'replaced_trees': replaced,
+            'n_estimators': len(self.model.estimators_),
+            'scaler_samples_seen': int(np.max(self.scaler.n_samples_seen_)),
+            'validation_before': before,
+            'validation_after': after,
+            'seconds': time.perf_counter() - start
+        }
+        
+        logger.info(f"Bosque actualizado: {len(self.model.estimators_)} árboles "
+                    f"en {self.incremental_report['seconds']:.2f} s")
+        if before is not None:
+            logger.info(f"Accuracy de validación: {before['accuracy']:.4f} -> {after['accuracy']:.4f}")
+        
+        return self.incremental_report
+
+    def tune_model(
+        self,
+        X_train: np.ndarray,
+        y_train: np.ndarray,
+        n_candidates: int = 27,
+        latency_budget_ms: float = LATENCY_BUDGET_MS,
+        n_jobs: int = -1,
+        min_resources: int = 50,
+        param_distributions: Optional[Dict] = None
+    ) -> Dict:
+        """
+        Busca los hiperparámetros del bosque y entrena el mejor candidato.
+
+        La búsqueda es aleatoria con halving sucesivo: todos los candidatos
+        se evalúan primero con ``min_resources`` muestras y solo el mejor
+        tercio pasa a la siguiente ronda con el triple de muestras (parada
+        temprana de los malos candidatos). Las validaciones cruzadas se
+        reparten en ``n_jobs`` procesos.
+
+        Args:
+            X_train: Features de entrenamiento
+            y_train: Target de entrenamiento
+            n_candidates: Candidatos muestreados en la primera ronda
+            latency_budget_ms: Presupuesto de p99 por fila del motor compilado
+            n_jobs: Procesos de la búsqueda (-1 = todos los núcleos)
+            min_resources: Muestras por candidato en la primera ronda
+            param_distributions: Espacio de búsqueda (por defecto PARAM_DISTRIBUTIONS)
+
+        Returns:
+            Diccionario con los parámetros elegidos, su puntuación y latencia
+        """
+        logger.info("Calibrando el modelo de latencia del motor compilado")
+        latency_model = InferenceLatencyModel.calibrate(X_train, y_train, self.random_state)
+        
+        logger.info(
+            "Buscando hiperparámetros: %d candidatos, presupuesto p99 %.2f ms", n_candidates, latency_budget_ms
+        )
+        search = HalvingRandomSearchCV(
+            RandomForestClassifier(random_state=self.random_state, n_jobs=1),
+            param_distributions or PARAM_DISTRIBUTIONS,
+            n_candidates=n_candidates,
+            factor=3,
+            min_resources=min_resources,
+            cv=5,
+            scoring=LatencyAwareScorer(latency_model, latency_budget_ms),
+            refit=True,
+            n_jobs=n_jobs,
+            random_state=self.random_state
+        )
+        start = time.perf_counter()
+        search.fit(X_train, y_train)
+        elapsed = time.perf_counter() - start
+        
+        self.model = search.best_estimator_
+        measured_p99_ms = measure_p99_ms(self.model, X_train)
+        
+        self.tuning_results = {
+            'best_params': search.best_params_,
+            'best_score': float(search.best_score_),
+            'estimated_p99_ms': latency_model.estimate_ms(self.model),
+            'measured_p99_ms': measured_p99_ms,
+            'latency_budget_ms': latency_budget_ms,
+            'n_candidates': int(search.n_candidates_[0]),
+            'n_iterations': int(search.n_iterations_),
+            'search_seconds': elapsed
+        }
+        
+        logger.info("Mejores hiperparámetros: %s", search.best_params_)
+        logger.info(
+            "Objetivo: %.4f, p99 estimado %.3f ms, medido %.3f ms (%d candidatos, %d rondas, %.1f s)",
+            search.best_score_, self.tuning_results['estimated_p99_ms'], measured_p99_ms,
+            self.tuning_results['n_candidates'], self.tuning_results['n_iterations'], elapsed
+        )
+        if measured_p99_ms > latency_budget_ms:
+            logger.warning(
+                "El bosque elegido supera el presupuesto de latencia: %.3f ms > %.2f ms",
+                measured_p99_ms, latency_budget_ms
+            )
+        
+        return self.tuning_results
+
+    def compress_model(
+        self,
+        X_train: np.ndarray,
+        X_test: np.ndarray,
+        y_test: np.ndarray,
+        agreement_tolerance: float = COMPRESSION_AGREEMENT_TOLERANCE,
+        metric_tolerance: float = COMPRESSION_METRIC_TOLERANCE,
+        probability_tolerance: float = COMPRESSION_PROBABILITY_TOLERANCE
+    ) -> Dict:
+        """
+        Sustituye el modelo por su versión comprimida con ``compress_forest``
+        y genera el informe de latencia, tamaño y precisión.
+
+        Args:
+            X_train: Features de entrenamiento (selección de árboles)
+            X_test: Features de testing
+            y_test: Target de testing
+            agreement_tolerance: Fracción máxima de filas con distinta clase
+            metric_tolerance: Caída máxima permitida de cada métrica de test
+            probability_tolerance: Diferencia media máxima de las probabilidades
+
+        Returns:
+            Informe de la compresión
+        """
+        logger.info("Comprimiendo el bosque")
+        
+        def summary(model: RandomForestClassifier) -> Dict:
+            arrays = flatten_forest(model)
+            return {
+                'n_estimators': len(model.estimators_),
+                'max_depth': int(arrays['max_depth']),
+                'n_nodes': forest_nodes(model),
+                'size_bytes': int(sum(np.asarray(a).nbytes for a in arrays.values())),
+                'p99_ms': measure_p99_ms(model, X_test),
+                'metrics': score_metrics(y_test, model.predict(X_test))
+            }
+        
+        original = summary(self.model)
+        compressed, details = compress_forest(
+            self.model, X_train, X_test, y_test, agreement_tolerance, metric_tolerance, probability_tolerance
+        )
+        self.model = compressed
+        
+        self.compression_report = {
+            'original': original,
+            'compressed': summary(compressed),
+            'tree_indices': details['tree_indices'],
+            'agreement_train': details['agreement_select'],
+            'agreement_test': details['agreement_test'],
+            'mean_probability_diff_train': details['mean_probability_diff_select'],
+            'mean_probability_diff_test': details['mean_probability_diff_test'],
+            'max_probability_diff_test': details['max_probability_diff_test'],
+            'agreement_tolerance': agreement_tolerance,
+            'probability_tolerance': probability_tolerance,
+            'metric_tolerance': metric_tolerance
+        }
+        
+        report = self.compression_report
+        logger.info(
+            "Bosque comprimido: %d -> %d árboles, profundidad %d -> %d, %d -> %d nodos",
+            original['n_estimators'], report['compressed']['n_estimators'],
+            original['max_depth'], report['compressed']['max_depth'],
+            original['n_nodes'], report['compressed']['n_nodes']
+        )
+        logger.info(
+            "p99 por fila: %.3f -> %.3f ms; accuracy de test: %.4f -> %.4f; concordancia en test: %.4f",
+            original['p99_ms'], report['compressed']['p99_ms'],
+            original['metrics']['accuracy'], report['compressed']['metrics']['accuracy'],
+            report['agreement_test']
+        )
+        
+        return self.compression_report
+
     def evaluate_model(
         self,
         X_train: np.ndarray,
         X_test: np.ndarray,
         y_train: np.ndarray,
-        y_test: np.ndarray
+        y_test: np.ndarray,
+        n_jobs: int = -1,
+        cache_dir: Optional[str] = EVALUATION_CACHE_DIR
     ) -> dict:
         """
         Evalúa el rendimiento del modelo.
 
+        Cada partición se puntúa con una sola pasada de ``predict_proba`` de
+        la que salen todas las métricas. Los folds de la validación cruzada
+        se ajustan en paralelo en ``n_jobs`` procesos con clones de un solo
+        hilo (sin paralelismo anidado). El resultado se guarda en
+        ``cache_dir`` con una clave derivada de los datos, los
+        hiperparámetros y el modelo entrenado: si nada ha cambiado, la
+        evaluación se omite. ``training_date`` no se guarda en la caché: es
+        siempre la fecha de esta ejecución.
+
         Args:
             X_train: Features de entrenamiento
             X_test: Features de testing
             y_train: Target de entrenamiento
             y_test: Target de testing
+            n_jobs: Procesos de la validación cruzada (-1 = todos los núcleos)
+            cache_dir: Directorio de la caché de evaluaciones (None = sin caché)
 
         Returns:
             Diccionario con métricas de evaluación
         """
         logger.info("Evaluando modelo")
         
-        y_train_pred = self.model.predict(X_train)
-        y_test_pred = self.model.predict(X_test)
+        cache_path = None
+        if cache_dir:
+            key = joblib.hash((X_train, X_test, y_train, y_test, self.model.get_params(), self.model))
+            cache_path = os.path.join(cache_dir, f"{key}.json")
+            if os.path.exists(cache_path):
+                with open(cache_path) as cache_file:
+                    metrics = json.load(cache_file)
+                logger.info(f"Evaluación reutilizada de la caché: {cache_path}")
+                logger.info(f"Test Accuracy: {metrics['test_accuracy']:.4f}")
+                logger.info(f"CV Mean: {metrics['cv_mean']:.4f} (+/- {metrics['cv_std'] * 2:.4f})")
+                return dict(metrics, training_date=datetime.now().isoformat())
+        
+        classes = self.model.classes_
+        train_probabilities = self.model.predict_proba(X_train)
+        test_probabilities = self.model.predict_proba(X_test)
+        y_train_pred = classes[train_probabilities.argmax(axis=1)]
+        y_test_pred = classes[test_probabilities.argmax(axis=1)]
         
         train_accuracy = accuracy_score(y_train, y_train_pred)
-        test_accuracy = accuracy_score(y_test, y_test_pred)
-        test_precision = precision_score(y_test, y_test_pred, average='weighted')
-        test_recall = recall_score(y_test, y_test_pred, average='weighted')
-        test_f1 = f1_score(y_test, y_test_pred, average='weighted')
+        test_metrics = score_metrics(y_test, y_test_pred)
+        test_accuracy = test_metrics['accuracy']
+        test_precision = test_metrics['precision']
+        test_recall = test_metrics['recall']
+        test_f1 = test_metrics['f1']
+        test_roc_auc = roc_auc_score(y_test, test_probabilities[:, 1])
         
         logger.info(f"Train Accuracy: {train_accuracy:.4f}")
         logger.info(f"Test Accuracy: {test_accuracy:.4f}")
         logger.info(f"Test Precision: {test_precision:.4f}")
         logger.info(f"Test Recall: {test_recall:.4f}")
         logger.info(f"Test F1-Score: {test_f1:.4f}")
+        logger.info(f"Test ROC AUC: {test_roc_auc:.4f}")
         
         logger.info("\nReporte de Clasificación:")
         print(classification_report(y_test, y_test_pred, target_names=self.target_names))
@@ -172,8 +1297,8 @@ class BreastCancerModelTrainer:
         print(confusion_matrix(y_test, y_test_pred))
         
         cv_scores = cross_val_score(
-            self.model, X_train, y_train,
-            cv=5, scoring='accuracy'
+            clone(self.model).set_params(n_jobs=1), X_train, y_train,
+            cv=5, scoring='accuracy', n_jobs=n_jobs
         )
         logger.info(f"\nCross-validation scores: {cv_scores}")
         logger.info(f"CV Mean: {cv_scores.mean():.4f} (+/- {cv_scores.std() * 2:.4f})")
@@ -187,24 +1312,37 @@ class BreastCancerModelTrainer:
         print(feature_importance.head(10))
         
         metrics = {
-            'train_accuracy': train_accuracy,
+            'train_accuracy': float(train_accuracy),
             'test_accuracy': test_accuracy,
             'test_precision': test_precision,
             'test_recall': test_recall,
             'test_f1': test_f1,
-            'cv_mean': cv_scores.mean(),
-            'cv_std': cv_scores.std(),
-            'training_date': datetime.now().isoformat(),
+            'test_roc_auc': float(test_roc_auc),
+            'cv_mean': float(cv_scores.mean()),
+            'cv_std': float(cv_scores.std()),
             'n_samples_train': len(X_train),
             'n_samples_test': len(X_test),
             'n_features': len(self.feature_names)
         }
         
-        return metrics
+        if cache_path is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp_path = f"{cache_path}.tmp-{os.getpid()}"
+            with open(tmp_path, 'w') as cache_file:
+                json.dump(metrics, cache_file, indent=2)
+            os.replace(tmp_path, cache_path)
+        
+        return dict(metrics, training_date=datetime.now().isoformat())
 
     def save_model(self, model_dir: str = 'models') -> None:
         """
-        Guarda el modelo y el scaler en disco.
+        Guarda el modelo, el scaler y los bosques compilados (con y sin el
+        scaler integrado) en disco.
+
+        Los archivos de ``model_dir`` son los que la API sirve por defecto;
+        además se publican como una versión inmutable en el registro
+        (``model_dir/registry``, ver ``api/registry.py``), desde donde la API
+        puede servir cualquier versión por petición.
 
         Args:
             model_dir: Directorio donde guardar los archivos
@@ -212,44 +1350,149 @@ class BreastCancerModelTrainer:
         if not os.path.exists(model_dir):
             os.makedirs(model_dir)
             logger.info(f"Directorio {model_dir} creado")
+        if self.version is None:
+            self.version = next_version(model_dir)
         
         model_path = os.path.join(model_dir, 'breast_cancer_model.pkl')
         scaler_path = os.path.join(model_dir, 'scaler.pkl')
         metadata_path = os.path.join(model_dir, 'model_metadata.pkl')
+        compiled_path = os.path.join(model_dir, 'compiled_forest')
+        fused_path = os.path.join(model_dir, 'fused_forest')
         
         joblib.dump(self.model, model_path)
         joblib.dump(self.scaler, scaler_path)
         
+        forest_arrays = flatten_forest(self.model)
+        save_forest_arrays(forest_arrays, compiled_path)
+        save_forest_arrays(fuse_scaler(forest_arrays, self.scaler), fused_path)
+        
         metadata = {
             'feature_names': self.feature_names,
             'target_names': self.target_names,
             'model_type': 'RandomForestClassifier',
+            'model_params': self.model.get_params(),
+            'tuning': self.tuning_results,
+            'compression': self.compression_report,
+            'incremental': self.incremental_report,
+            'version': self.version,
+            'parent_version': self.parent_version,
             'training_date': datetime.now().isoformat()
         }
         joblib.dump(metadata, metadata_path)
         
+        artifact_paths = [model_path, scaler_path, metadata_path, compiled_path, fused_path]
+        if self.compression_report is not None:
+            report_path = os.path.join(model_dir, 'compression_report.json')
+            with open(report_path, 'w') as report_file:
+                json.dump(self.compression_report, report_file, indent=2)
+            artifact_paths.append(report_path)
+            logger.info(f"Informe de compresión guardado en: {report_path}")
+        
+        registry = ModelRegistry(os.path.join(model_dir, REGISTRY_DIR))
+        digest = registry.publish(
+            artifact_paths,
+            version=self.version,
+            metadata={'parent_version': self.parent_version, 'training_date': metadata['training_date']}
+        )
+        
         logger.info(f"Modelo guardado en: {model_path}")
         logger.info(f"Scaler guardado en: {scaler_path}")
+        logger.info(f"Bosque compilado guardado en: {compiled_path}")
+        logger.info(f"Bosque fusionado con el scaler guardado en: {fused_path}")
         logger.info(f"Metadata guardada en: {metadata_path}")
+        logger.info(f"Versión {self.version} publicada en el registro: {digest[:12]}")
+
+
+def train_in_memory(trainer: BreastCancerModelTrainer, args: argparse.Namespace) -> Dict:
+    """
+    Entrena con el dataset de scikit-learn cargado en memoria (búsqueda de
+    hiperparámetros y compresión opcionales) y devuelve las métricas.
+    """
+    X, y = trainer.load_data()
+    
+    X_train, X_test, y_train, y_test = trainer.preprocess_data(X, y)
+    
+    if args.tune:
+        trainer.tune_model(
+            X_train, y_train,
+            n_candidates=args.n_candidates,
+            latency_budget_ms=args.latency_budget_ms,
+            n_jobs=args.n_jobs
+        )
+    else:
+        trainer.train_model(X_train, y_train)
+    
+    if args.compress:
+        trainer.compress_model(
+            X_train, X_test, y_test,
+            agreement_tolerance=args.agreement_tolerance,
+            metric_tolerance=args.metric_tolerance,
+            probability_tolerance=args.probability_tolerance
+        )
+    
+    metrics = trainer.evaluate_model(
+        X_train, X_test, y_train, y_test,
+        n_jobs=args.n_jobs,
+        cache_dir=None if args.no_eval_cache else EVALUATION_CACHE_DIR
+    )
+    
+    return metrics
 
 
-def main():
+def main(argv=None):
     """
     Función principal para entrenar y guardar el modelo.
     """
+    parser = argparse.ArgumentParser(description='Entrena y guarda el modelo de cáncer de mama')
+    parser.add_argument('--data', help='Archivo CSV, JSONL o Parquet para entrenar fuera de memoria')
+    parser.add_argument('--target-column', default='target', help='Columna con la clase en --data')
+    parser.add_argument('--memory-mb', type=float, default=TRAINING_MEMORY_MB,
+                        help='Memoria máxima por bloque o shard con --data')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Actualizar el modelo actual con los casos nuevos de --data')
+    parser.add_argument('--new-trees', type=int, default=INCREMENTAL_NEW_TREES,
+                        help='Árboles que añade la actualización incremental')
+    parser.add_argument('--replace-weakest', action='store_true',
+                        help='Retirar tantos árboles como se añaden (los de peor accuracy en los casos nuevos)')
+    parser.add_argument('--tune', action='store_true', help='Buscar hiperparámetros en lugar de la configuración fija')
+    parser.add_argument('--n-candidates', type=int, default=27, help='Candidatos de la búsqueda')
+    parser.add_argument('--latency-budget-ms', type=float, default=LATENCY_BUDGET_MS,
+                        help='Presupuesto de p99 por fila del motor compilado')
+    parser.add_argument('--n-jobs', type=int, default=-1, help='Procesos de la búsqueda')
+    parser.add_argument('--no-eval-cache', action='store_true', help='Evaluar siempre, sin usar la caché')
+    parser.add_argument('--compress', action='store_true', help='Comprimir el bosque tras entrenarlo')
+    parser.add_argument('--agreement-tolerance', type=float, default=COMPRESSION_AGREEMENT_TOLERANCE,
+                        help='Fracción máxima de filas cuya clase puede cambiar al comprimir')
+    parser.add_argument('--probability-tolerance', type=float, default=COMPRESSION_PROBABILITY_TOLERANCE,
+                        help='Diferencia media máxima de predict_proba al comprimir')
+    parser.add_argument('--metric-tolerance', type=float, default=COMPRESSION_METRIC_TOLERANCE,
+                        help='Caída máxima de cada métrica de test al comprimir')
+    args = parser.parse_args(argv)
+    if args.data and (args.tune or args.compress):
+        parser.error("--tune y --compress necesitan los datos en memoria y no se pueden usar con --data")
+    if args.incremental and not args.data:
+        parser.error("--incremental necesita los casos nuevos en --data")
+    
     logger.info("=" * 60)
     logger.info("Iniciando entrenamiento del modelo")
     logger.info("=" * 60)
     
     trainer = BreastCancerModelTrainer(test_size=0.2, random_state=42)
     
-    X, y = trainer.load_data()
-    
-    X_train, X_test, y_train, y_test = trainer.preprocess_data(X, y)
-    
-    trainer.train_model(X_train, y_train)
-    
-    metrics = trainer.evaluate_model(X_train, X_test, y_train, y_test)
+    if args.incremental:
+        trainer.load_artifacts()
+        source = open_source(args.data, trainer.feature_names, args.target_column)
+        metrics = trainer.update_model(
+            source,
+            n_new_trees=args.new_trees,
+            replace_weakest=args.replace_weakest,
+            memory_mb=args.memory_mb
+        )
+    elif args.data:
+        source = open_source(args.data, load_breast_cancer().feature_names, args.target_column)
+        metrics = trainer.train_out_of_core(source, memory_mb=args.memory_mb)
+    else:
+        metrics = train_in_memory(trainer, args)
     
     trainer.save_model()
     
@@ -0,0 +1,254 @@
+"""
+Tests del servidor ASGI y del micro-batching.
+
+Las peticiones se envían directamente a la aplicación ASGI, sin servidor
+HTTP, para verificar los endpoints y la agrupación en lotes.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import threading
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import api.app as app_module
+import api.asgi as asgi_module
+from api.app import REQUIRED_FEATURES, get_predictor
+from api.asgi import app, batcher
+from api.batching import MicroBatcher
+from api.binary_formats import RAW_CONTENT_TYPE, encode_raw
+from api.reload import ModelReloader
+from tests.test_endpoints import BENIGN_CASE, MALIGNANT_CASE
+
+
+async def call(method, path, payload=None, content_type='application/json'):
+    """
+    Ejecuta una petición contra la aplicación ASGI y devuelve (status, json).
+    ``payload`` puede ser un objeto JSON o el cuerpo ya serializado en bytes.
+    """
+    if isinstance(payload, bytes):
+        body = payload
+    else:
+        body = json.dumps(payload).encode() if payload is not None else b''
+    scope = {
+        'type': 'http',
+        'method': method,
+        'path': path,
+        'headers': [(b'content-type', content_type.encode())]
+    }
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': body, 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    await app(scope, receive, send)
+    return messages[0]['status'], json.loads(messages[1]['body'])
+
+
+def test_asgi_health_check():
+    """
+    Test del endpoint de health check.
+    """
+    status, data = asyncio.run(call('GET', '/'))
+    assert status == 200
+    assert data['status'] == 'ok'
+    assert 'micro_batching' in data
+
+
+def test_asgi_predict_matches_batch():
+    """
+    Test de que /predict micro-batched coincide con /predict/batch.
+    """
+    async def scenario():
+        single = await call('POST', '/predict', MALIGNANT_CASE)
+        batch = await call('POST', '/predict/batch', [MALIGNANT_CASE])
+        return single, batch
+
+    (status, single), (batch_status, batch) = asyncio.run(scenario())
+
+    assert status == 200
+    assert batch_status == 200
+    assert single['prediction'] == batch['predictions'][0]['prediction']
+    assert single['probability'] == batch['predictions'][0]['probability']
+    assert 'timestamp' in single
+
+
+def test_asgi_concurrent_requests_are_batched():
+    """
+    Test de que peticiones concurrentes se puntúan en un mismo lote.
+    """
+    batches_before = batcher.batches
+
+    async def scenario():
+        cases = [MALIGNANT_CASE, BENIGN_CASE] * 8
+        return await asyncio.gather(*(call('POST', '/predict', case) for case in cases))
+
+    responses = asyncio.run(scenario())
+
+    assert all(status == 200 for status, _ in responses)
+    assert batcher.batches - batches_before < len(responses)
+
+
+def test_asgi_predict_invalid_input():
+    """
+    Test de validación en el servidor ASGI.
+    """
+    status, data = asyncio.run(call('POST', '/predict', {'mean_radius': 20.57}))
+    assert status == 400
+    assert data['error'] == 'Invalid input'
+
+    status, _ = asyncio.run(call('POST', '/predict', MALIGNANT_CASE, content_type='text/plain'))
+    assert status == 400
+
+    status, _ = asyncio.run(call('GET', '/nonexistent'))
+    assert status == 404
+
+
+def test_asgi_accepts_binary_and_columnar_bodies():
+    """
+    Test de que /predict admite una matriz binaria de una fila y
+    /predict/batch el payload columnar, como la app Flask.
+    """
+    cases = [MALIGNANT_CASE, BENIGN_CASE]
+    matrix = np.array([[case[f] for f in REQUIRED_FEATURES] for case in cases])
+    columns = {f: [case[f] for case in cases] for f in REQUIRED_FEATURES}
+
+    async def scenario():
+        single = await call('POST', '/predict', encode_raw(matrix[:1]), content_type=RAW_CONTENT_TYPE)
+        two_rows = await call('POST', '/predict', encode_raw(matrix), content_type=RAW_CONTENT_TYPE)
+        batch = await call('POST', '/predict/batch', {'columns': columns})
+        return single, two_rows, batch
+
+    (status, single), (two_rows_status, _), (batch_status, batch) = asyncio.run(scenario())
+
+    assert status == 200
+    assert two_rows_status == 400
+    assert batch_status == 200
+    assert batch['predictions'][0]['probability'] == single['probability']
+    assert batch['predictions'][0]['prediction'] != batch['predictions'][1]['prediction']
+
+
+def test_asgi_batch_scoring_error_returns_json(monkeypatch):
+    """
+    Test de que un error al puntuar un lote devuelve el JSON de error.
+    """
+    def failing_predict_batch(*args, **kwargs):
+        raise RuntimeError("fallo")
+
+    monkeypatch.setattr(get_predictor(), 'predict_batch', failing_predict_batch)
+
+    status, data = asyncio.run(call('POST', '/predict/batch', [MALIGNANT_CASE]))
+
+    assert status == 500
+    assert data['error'] == 'Prediction failed'
+
+
+async def lifespan_startup():
+    """
+    Envía el evento de arranque del lifespan y devuelve la respuesta.
+    """
+    messages = []
+    events = iter([{'type': 'lifespan.startup'}, {'type': 'lifespan.shutdown'}])
+
+    async def receive():
+        return next(events)
+
+    async def send(message):
+        messages.append(message)
+
+    await app({'type': 'lifespan'}, receive, send)
+    return messages[0]
+
+
+def test_asgi_lazy_startup(monkeypatch):
+    """
+    Test de que con STARTUP_MODE=lazy el lifespan termina sin esperar al
+    modelo y las predicciones responden 503 hasta readiness.
+    """
+    current = get_predictor()
+    release = threading.Event()
+
+    def gated_load():
+        release.wait(5)
+        return current
+
+    reloader = ModelReloader(gated_load, app_module._swap_predictor)
+    monkeypatch.setattr(app_module, '_active_predictor', None)
+    monkeypatch.setattr(app_module, 'reloader', reloader)
+    monkeypatch.setattr(asgi_module, 'reloader', reloader)
+    monkeypatch.setattr(asgi_module, 'STARTUP_MODE', 'lazy')
+
+    assert asyncio.run(lifespan_startup())['type'] == 'lifespan.startup.complete'
+    assert asyncio.run(call('GET', '/health/live'))[0] == 200
+    assert asyncio.run(call('GET', '/health/ready'))[0] == 503
+    assert asyncio.run(call('POST', '/predict', MALIGNANT_CASE))[0] == 503
+
+    release.set()
+    assert reloader.wait(5)
+
+    assert asyncio.run(call('GET', '/health/ready'))[0] == 200
+    assert asyncio.run(call('POST', '/predict', MALIGNANT_CASE))[0] == 200
+
+
+def test_asgi_failed_eager_startup(monkeypatch):
+    """
+    Test de que si la carga falla en modo eager el lifespan lo notifica.
+    """
+    def failing_load():
+        raise ValueError("artefactos inválidos")
+
+    monkeypatch.setattr(app_module, '_active_predictor', None)
+    monkeypatch.setattr(app_module, 'reloader', ModelReloader(failing_load, app_module._swap_predictor))
+    monkeypatch.setattr(asgi_module, 'STARTUP_MODE', 'eager')
+
+    message = asyncio.run(lifespan_startup())
+
+    assert message['type'] == 'lifespan.startup.failed'
+    assert 'artefactos inválidos' in message['message']
+
+
+def test_micro_batcher_respects_max_batch_size():
+    """
+    Test de que el agrupador corta los lotes en max_batch_size y conserva
+    el orden de los resultados.
+    """
+    batch_sizes = []
+
+    def score(features):
+        batch_sizes.append(len(features))
+        return [float(row[0]) for row in features]
+
+    micro_batcher = MicroBatcher(score, max_batch_size=4, max_wait_us=50_000)
+
+    async def scenario():
+        return await asyncio.gather(*(micro_batcher.submit(np.array([float(i)])) for i in range(10)))
+
+    results = asyncio.run(scenario())
+
+    assert results == [float(i) for i in range(10)]
+    assert max(batch_sizes) <= 4
+    assert sum(batch_sizes) == 10
+
+
+def test_micro_batcher_propagates_errors():
+    """
+    Test de que un error al puntuar se propaga a todas las peticiones del lote.
+    """
+    def score(features):
+        raise RuntimeError("fallo")
+
+    micro_batcher = MicroBatcher(score, max_batch_size=8, max_wait_us=0)
+
+    async def scenario():
+        return await micro_batcher.submit(np.zeros(3))
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(scenario())
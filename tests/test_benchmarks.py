@@ -0,0 +1,72 @@
+"""
+Tests de las utilidades de la suite de benchmarks.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.common import percentile, time_per_call
+from benchmarks.bench_parallel import crossover
+from benchmarks.compare import compare
+
+
+def test_percentile_interpolates():
+    """
+    Test del cálculo de percentiles.
+    """
+    values = [1.0, 2.0, 3.0, 4.0]
+    
+    assert percentile(values, 0) == 1.0
+    assert percentile(values, 50) == 2.5
+    assert percentile(values, 100) == 4.0
+
+
+def test_time_per_call_reports_microseconds():
+    """
+    Test de la medición por llamada.
+    """
+    result = time_per_call(lambda: sum(range(10)), min_seconds=0.01, repeat=2)
+    
+    assert 0 < result['best_us'] <= result['median_us']
+    assert result['calls'] >= 1
+
+
+def test_compare_detects_regressions_by_direction():
+    """
+    Test de que las latencias que suben y el throughput que baja son
+    regresiones, y los contadores se ignoran.
+    """
+    base = {'results': [
+        {'concurrency': 1, 'p99_ms': 2.0, 'throughput_rps': 600.0, 'requests': 1000},
+        {'concurrency': 4, 'p99_ms': 8.0, 'throughput_rps': 650.0, 'requests': 1000}
+    ]}
+    new = {'results': [
+        {'concurrency': 1, 'p99_ms': 3.0, 'throughput_rps': 610.0, 'requests': 5},
+        {'concurrency': 4, 'p99_ms': 6.0, 'throughput_rps': 500.0, 'requests': 5}
+    ]}
+    
+    regressions, improvements = compare(base, new, threshold=10)
+    
+    assert [entry['metric'] for entry in regressions] == [
+        '[concurrency=1].p99_ms',
+        '[concurrency=4].throughput_rps'
+    ]
+    assert [entry['metric'] for entry in improvements] == ['[concurrency=4].p99_ms']
+
+
+def test_parallel_crossover_requires_all_larger_batches_faster():
+    """
+    Test de que el punto de cruce es el menor lote desde el que el pool
+    gana en todos los lotes mayores.
+    """
+    points = [
+        {'batch_size': 10, 'serial_us': 10, 'parallel_us': {'2': 5}},
+        {'batch_size': 100, 'serial_us': 100, 'parallel_us': {'2': 150}},
+        {'batch_size': 1000, 'serial_us': 1000, 'parallel_us': {'2': 800}},
+        {'batch_size': 10000, 'serial_us': 10000, 'parallel_us': {'2': 6000}}
+    ]
+    
+    assert crossover(points, 2) == 1000
+    assert crossover(points[:2], 2) is None
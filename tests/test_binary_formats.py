@@ -0,0 +1,149 @@
+"""
+Tests de los formatos binarios de entrada.
+"""
+
+import io
+import json
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from api.app import app, REQUIRED_FEATURES
+from api.binary_formats import NPY_CONTENT_TYPE, RAW_CONTENT_TYPE, decode_npy, decode_raw, encode_raw
+from tests.test_endpoints import BENIGN_CASE, MALIGNANT_CASE
+
+
+@pytest.fixture
+def client():
+    """
+    Fixture para crear un cliente de prueba de Flask.
+    """
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+
+@pytest.fixture
+def cases():
+    """
+    Matriz 2 x 30 con un caso maligno y uno benigno.
+    """
+    return np.array([[case[f] for f in REQUIRED_FEATURES] for case in (MALIGNANT_CASE, BENIGN_CASE)])
+
+
+def test_raw_decode_is_zero_copy(cases):
+    """
+    Test de que la matriz raw es una vista sobre el cuerpo.
+    """
+    body = encode_raw(cases.astype(np.float32))
+    
+    features = decode_raw(body, len(REQUIRED_FEATURES))
+    
+    assert features.dtype == np.float32
+    assert np.shares_memory(features, np.frombuffer(body, dtype=np.uint8))
+    np.testing.assert_array_equal(features, cases.astype(np.float32))
+
+
+def test_raw_decode_rejects_bad_header(cases):
+    """
+    Test de cabeceras raw inválidas.
+    """
+    body = encode_raw(cases)
+    
+    with pytest.raises(ValueError):
+        decode_raw(b'XXXX' + body[4:], len(REQUIRED_FEATURES))
+    with pytest.raises(ValueError):
+        decode_raw(body[:-8], len(REQUIRED_FEATURES))
+    with pytest.raises(ValueError):
+        decode_raw(body, 10)
+
+
+def test_npy_decode_handles_fortran_order(cases):
+    """
+    Test de arrays .npy en orden C y Fortran.
+    """
+    for array in (cases, np.asfortranarray(cases)):
+        buffer = io.BytesIO()
+        np.save(buffer, array)
+        np.testing.assert_array_equal(decode_npy(buffer.getvalue(), len(REQUIRED_FEATURES)), cases)
+
+
+def test_predict_batch_binary_matches_json(client, cases):
+    """
+    Test de que un lote binario se puntúa igual que el mismo lote en JSON.
+    """
+    buffer = io.BytesIO()
+    np.save(buffer, cases)
+    
+    expected = client.post(
+        '/predict/batch',
+        data=json.dumps([MALIGNANT_CASE, BENIGN_CASE]),
+        content_type='application/json'
+    ).get_json()['predictions']
+    
+    for content_type, body in ((RAW_CONTENT_TYPE, encode_raw(cases)), (NPY_CONTENT_TYPE, buffer.getvalue())):
+        response = client.post('/predict/batch', data=body, content_type=content_type)
+        assert response.status_code == 200
+        assert response.get_json()['predictions'] == expected
+    
+    response = client.post('/predict', data=encode_raw(cases[:1]), content_type=RAW_CONTENT_TYPE)
+    assert response.status_code == 200
+    assert response.get_json()['prediction_label'] == 'Malignant'
+    
+    response = client.post('/predict', data=encode_raw(cases), content_type=RAW_CONTENT_TYPE)
+    assert response.status_code == 400
+
+
+def test_predict_batch_arrow_reports_nulls(client, cases):
+    """
+    Test de tablas Arrow, con las filas con nulos reportadas como errores.
+    """
+    pyarrow = pytest.importorskip('pyarrow')
+    import pyarrow.ipc
+    
+    columns = {feature: cases[:, j].tolist() for j, feature in enumerate(REQUIRED_FEATURES)}
+    columns['mean_area'][1] = None
+    table = pyarrow.table(columns)
+    sink = pyarrow.BufferOutputStream()
+    with pyarrow.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    
+    response = client.post(
+        '/predict/batch',
+        data=sink.getvalue().to_pybytes(),
+        content_type='application/vnd.apache.arrow.stream'
+    )
+    
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['errors_count'] == 1
+    assert data['predictions'][0]['prediction_label'] == 'Malignant'
+    assert data['predictions'][1]['errors'] == ["Feature 'mean_area' debe ser un número"]
+
+
+def test_binary_non_finite_rows_are_reported(client, cases):
+    """
+    Test de que las filas binarias con NaN o infinitos se reportan como
+    errores en lugar de puntuarse.
+    """
+    cases = cases.copy()
+    cases[1, 0] = np.nan
+    cases[1, 3] = np.inf
+    buffer = io.BytesIO()
+    np.save(buffer, cases)
+    expected_errors = ["Feature 'mean_radius' debe ser un número", "Feature 'mean_area' debe ser un número"]
+    
+    for content_type, body in ((RAW_CONTENT_TYPE, encode_raw(cases)), (NPY_CONTENT_TYPE, buffer.getvalue())):
+        response = client.post('/predict/batch', data=body, content_type=content_type)
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data['errors_count'] == 1
+        assert data['predictions'][0]['prediction_label'] == 'Malignant'
+        assert data['predictions'][1]['errors'] == expected_errors
+    
+    response = client.post('/predict', data=encode_raw(cases[1:]), content_type=RAW_CONTENT_TYPE)
+    assert response.status_code == 400
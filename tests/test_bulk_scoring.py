@@ -0,0 +1,116 @@
+"""
+Tests de la puntuación masiva en streaming (CLI y endpoint).
+"""
+
+import csv
+import io
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from api.app import app, get_predictor, ModelPredictor, REQUIRED_FEATURES
+from api.bulk_scoring import detect_format, main, score_stream
+from tests.test_endpoints import BENIGN_CASE, MALIGNANT_CASE
+
+
+@pytest.fixture
+def client():
+    """
+    Fixture para crear un cliente de prueba de Flask.
+    """
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+
+def test_detect_format():
+    """
+    Test de detección de formato por extensión y Content-Type.
+    """
+    assert detect_format('casos.jsonl') == 'jsonl'
+    assert detect_format('application/x-ndjson') == 'jsonl'
+    assert detect_format('casos.csv') == 'csv'
+    assert detect_format('text/csv') == 'csv'
+    
+    with pytest.raises(ValueError):
+        detect_format('application/json')
+
+
+def test_score_stream_chunks_keep_order():
+    """
+    Test de que los bloques conservan el orden y el índice global.
+    """
+    records = [dict(case, id=f"caso-{i}") for i, case in enumerate([MALIGNANT_CASE, BENIGN_CASE] * 5)]
+    records[3] = None
+    
+    results = list(score_stream(get_predictor(), records, chunk_size=3))
+    
+    assert [r['index'] for r in results] == list(range(10))
+    assert results[3]['error'] == 'Invalid input'
+    assert results[4]['id'] == 'caso-4'
+    assert results[0]['prediction'] == results[2]['prediction']
+
+
+def test_score_stream_skips_cache_by_default():
+    """
+    Test de que la puntuación masiva no usa la caché salvo que se pida.
+    """
+    cached_predictor = ModelPredictor(cache_size=100)
+    records = [MALIGNANT_CASE, BENIGN_CASE] * 3
+    
+    list(score_stream(cached_predictor, records, chunk_size=4))
+    assert cached_predictor.cache.stats()['size'] == 0
+    assert cached_predictor.cache.stats()['misses'] == 0
+    
+    list(score_stream(cached_predictor, records, chunk_size=4, use_cache=True))
+    assert cached_predictor.cache.stats()['size'] == 2
+
+
+def test_cli_csv_to_jsonl(tmp_path):
+    """
+    Test del CLI leyendo CSV y escribiendo JSONL.
+    """
+    input_path = tmp_path / 'casos.csv'
+    output_path = tmp_path / 'resultados.jsonl'
+    with open(input_path, 'w', newline='') as handle:
+        writer = csv.DictWriter(handle, fieldnames=['id'] + REQUIRED_FEATURES)
+        writer.writeheader()
+        writer.writerow(dict(MALIGNANT_CASE, id='a'))
+        writer.writerow(dict(BENIGN_CASE, id='b'))
+    
+    main([str(input_path), '-o', str(output_path), '--chunk-size', '1'])
+    
+    results = [json.loads(line) for line in open(output_path)]
+    assert [r['id'] for r in results] == ['a', 'b']
+    assert [r['prediction'] for r in results] == [0, 1]
+
+
+def test_predict_stream_endpoint(client):
+    """
+    Test del endpoint de streaming con entrada JSONL y salida CSV.
+    """
+    body = ''.join(json.dumps(case) + '\n' for case in (MALIGNANT_CASE, BENIGN_CASE))
+    
+    response = client.post(
+        '/predict/stream?format=csv&chunk_size=1',
+        data=body,
+        content_type='application/x-ndjson'
+    )
+    
+    assert response.status_code == 200
+    assert response.mimetype == 'text/csv'
+    
+    rows = list(csv.DictReader(io.StringIO(response.data.decode())))
+    assert [row['prediction_label'] for row in rows] == ['Malignant', 'Benign']
+
+
+def test_predict_stream_invalid_content_type(client):
+    """
+    Test de Content-Type no soportado en streaming.
+    """
+    response = client.post('/predict/stream', data='{}', content_type='application/json')
+    assert response.status_code == 415
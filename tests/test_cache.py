@@ -0,0 +1,76 @@
+"""
+Tests de la caché de predicciones.
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from api.app import ModelPredictor, REQUIRED_FEATURES
+from api.cache import PredictionCache
+from tests.test_endpoints import MALIGNANT_CASE
+
+
+def test_cache_key_canonicalization():
+    """
+    Test de que valores equivalentes comparten clave y la versión la cambia.
+    """
+    row = np.array([0.0, 1.5, 2.0])
+    
+    assert PredictionCache.make_key(row, 'v1') == PredictionCache.make_key(np.array([-0.0, 1.5, 2]), 'v1')
+    assert PredictionCache.make_key(row, 'v1') != PredictionCache.make_key(row, 'v2')
+    assert PredictionCache.make_key(row, 'v1') != PredictionCache.make_key(row + 1e-12, 'v1')
+
+
+def test_cache_lru_eviction():
+    """
+    Test de que se desaloja la entrada menos usada.
+    """
+    cache = PredictionCache(max_size=2, ttl_seconds=0)
+    cache.put(b'a', np.array([1.0]))
+    cache.put(b'b', np.array([2.0]))
+    cache.get(b'a')
+    cache.put(b'c', np.array([3.0]))
+    
+    assert cache.get(b'b') is None
+    assert cache.get(b'a') is not None
+    assert cache.stats()['evictions'] == 1
+
+
+def test_cache_ttl_expiration():
+    """
+    Test de que las entradas expiradas no se sirven.
+    """
+    cache = PredictionCache(max_size=10, ttl_seconds=0.001)
+    cache.put(b'a', np.array([1.0]))
+    time.sleep(0.01)
+    
+    assert cache.get(b'a') is None
+    assert cache.stats()['misses'] == 1
+
+
+def test_predictor_cache_hits_and_bypass():
+    """
+    Test de aciertos, fallos y bypass de la caché en el predictor.
+    """
+    cached_predictor = ModelPredictor(cache_size=100)
+    
+    first = cached_predictor.predict(MALIGNANT_CASE)
+    second = cached_predictor.predict(MALIGNANT_CASE)
+    stats = cached_predictor.cache.stats()
+    
+    assert stats['misses'] == 1
+    assert stats['hits'] == 1
+    assert first['probability'] == second['probability']
+    
+    cached_predictor.predict(MALIGNANT_CASE, use_cache=False)
+    assert cached_predictor.cache.stats()['hits'] == 1
+    
+    features = np.array([[MALIGNANT_CASE[f] for f in REQUIRED_FEATURES]] * 3)
+    results = cached_predictor.predict_batch(features, {})
+    assert all(r['probability'] == first['probability'] for r in results)
+    assert cached_predictor.cache.stats()['hits'] == 4
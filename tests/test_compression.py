@@ -0,0 +1,81 @@
+"""
+Tests de la compresión del bosque tras el entrenamiento.
+"""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sklearn.datasets import load_breast_cancer
+from sklearn.ensemble import RandomForestClassifier
+
+from api.forest_engine import CompiledForest
+from models.train_model import compress_forest, flatten_forest, greedy_tree_order, truncate_tree
+
+DATA = load_breast_cancer()
+X_TRAIN, X_TEST = DATA.data[:450], DATA.data[450:]
+Y_TRAIN, Y_TEST = DATA.target[:450], DATA.target[450:]
+FOREST = RandomForestClassifier(n_estimators=20, random_state=0).fit(X_TRAIN, Y_TRAIN)
+
+
+def test_truncate_tree_limits_depth_and_keeps_shallow_trees_intact():
+    """
+    Test de la poda por profundidad de un árbol.
+    """
+    tree = FOREST.estimators_[0]
+    
+    unchanged = truncate_tree(tree, tree.tree_.max_depth)
+    np.testing.assert_array_equal(unchanged.predict_proba(X_TEST), tree.predict_proba(X_TEST))
+    
+    pruned = truncate_tree(tree, 2)
+    assert pruned.tree_.max_depth == 2
+    assert pruned.tree_.node_count <= 7
+    assert tree.tree_.max_depth > 2
+    np.testing.assert_allclose(pruned.predict_proba(X_TEST).sum(axis=1), 1.0)
+
+
+def test_greedy_order_starts_with_closest_tree():
+    """
+    Test de que el primer árbol elegido es el más parecido al objetivo.
+    """
+    target = np.array([[0.8, 0.2]])
+    trees = np.array([[[0.0, 1.0]], [[0.7, 0.3]], [[1.0, 0.0]]])
+    
+    order = greedy_tree_order(trees, target)
+    
+    assert order[0] == 1
+    assert sorted(order) == [0, 1, 2]
+
+
+def test_compressed_forest_stays_within_tolerances():
+    """
+    Test de que el bosque comprimido es más barato y respeta las tolerancias,
+    y de que el motor compilado reproduce sus probabilidades.
+    """
+    compressed, details = compress_forest(
+        FOREST, X_TRAIN, X_TEST, Y_TEST,
+        agreement_tolerance=0.02, metric_tolerance=0.02, probability_tolerance=0.05
+    )
+    
+    assert len(compressed.estimators_) * details['depth'] <= 20 * max(e.tree_.max_depth for e in FOREST.estimators_)
+    assert len(FOREST.estimators_) == 20
+    assert details['agreement_test'] >= 0.98
+    assert details['mean_probability_diff_test'] <= 0.05
+    
+    engine = CompiledForest(flatten_forest(compressed))
+    np.testing.assert_allclose(engine.predict_proba(X_TEST), compressed.predict_proba(X_TEST))
+
+
+def test_zero_tolerance_reproduces_full_forest():
+    """
+    Test de que sin tolerancia las predicciones no cambian.
+    """
+    compressed, _ = compress_forest(
+        FOREST, X_TRAIN, X_TEST, Y_TEST,
+        agreement_tolerance=0.0, metric_tolerance=0.0, probability_tolerance=0.0
+    )
+    
+    np.testing.assert_allclose(compressed.predict_proba(X_TEST), FOREST.predict_proba(X_TEST))
@@ -0,0 +1,125 @@
+"""
+Tests de las fuentes de datos en streaming y del entrenamiento fuera de memoria.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sklearn.datasets import load_breast_cancer
+
+from models.data_sources import ArraySpool, StratifiedStreamSplitter, open_source, pq, shard_slices
+from models.train_model import BreastCancerModelTrainer, combine_forests
+
+DATA = load_breast_cancer()
+
+
+@pytest.fixture
+def frame():
+    """
+    Dataset con los nombres de columna de la API y una fila inválida.
+    """
+    df = pd.DataFrame(DATA.data.copy(), columns=[name.replace(' ', '_') for name in DATA.feature_names])
+    df['target'] = DATA.target
+    df.loc[3, 'mean_radius'] = None
+    return df
+
+
+@pytest.mark.parametrize('extension', ['csv', 'jsonl', 'parquet'])
+def test_sources_stream_chunks_in_model_order(frame, tmp_path, extension):
+    """
+    Test de la lectura por bloques de cada formato.
+    """
+    path = str(tmp_path / f'data.{extension}')
+    if extension == 'csv':
+        frame.to_csv(path, index=False)
+    elif extension == 'jsonl':
+        frame.to_json(path, orient='records', lines=True)
+    else:
+        if pq is None:
+            pytest.skip("pyarrow no está instalado")
+        frame.to_parquet(path)
+    
+    source = open_source(path, DATA.feature_names)
+    chunks = list(source.iter_chunks(100))
+    
+    assert [len(y) for _, y in chunks][:2] == [99, 100]
+    X = np.concatenate([X for X, _ in chunks])
+    np.testing.assert_allclose(X, np.delete(DATA.data, 3, axis=0))
+    assert source.skipped_rows == 1
+
+
+def test_missing_columns_are_reported(frame, tmp_path):
+    """
+    Test del error cuando faltan columnas.
+    """
+    path = str(tmp_path / 'data.csv')
+    frame.drop(columns=['worst_area']).to_csv(path, index=False)
+    
+    with pytest.raises(ValueError, match='worst area'):
+        next(open_source(path, DATA.feature_names).iter_chunks(10))
+
+
+def test_stream_split_is_stratified_across_chunks():
+    """
+    Test de que cada clase aporta su proporción al test aunque llegue
+    repartida en bloques desiguales.
+    """
+    y = np.array([0] * 300 + [1] * 700)
+    splitter = StratifiedStreamSplitter(test_size=0.2, random_state=0)
+    
+    is_test = np.concatenate([splitter.split(y[start:start + 37]) for start in range(0, len(y), 37)])
+    
+    assert is_test[y == 0].sum() == 60
+    assert is_test[y == 1].sum() == 140
+
+
+def test_array_spool_reads_back_slices(tmp_path):
+    """
+    Test de la escritura por bloques y la lectura por tramos.
+    """
+    spool = ArraySpool(str(tmp_path / 'rows.bin'), n_columns=3)
+    values = np.arange(30, dtype=np.float64).reshape(10, 3)
+    spool.append(values[:4])
+    spool.append(values[4:])
+    
+    parts = [spool.read(rows) for rows in shard_slices(spool.rows, 3)]
+    
+    np.testing.assert_array_equal(np.concatenate(parts), values)
+
+
+def test_out_of_core_training_combines_stratified_shards(frame, tmp_path):
+    """
+    Test de extremo a extremo con un límite de memoria que obliga a usar
+    varios shards.
+    """
+    path = str(tmp_path / 'data.csv')
+    frame.to_csv(path, index=False)
+    trainer = BreastCancerModelTrainer()
+    
+    metrics = trainer.train_out_of_core(open_source(path, DATA.feature_names), memory_mb=0.05, n_estimators=20)
+    
+    assert metrics['n_shards'] > 1
+    assert metrics['n_samples_train'] + metrics['n_samples_test'] == len(DATA.data) - 1
+    assert metrics['test_accuracy'] > 0.85
+    assert trainer.model.n_estimators == metrics['n_shards'] * max(1, round(20 / metrics['n_shards']))
+    assert trainer.model.predict(trainer.scaler.transform(DATA.data[:5])).shape == (5,)
+
+
+def test_combine_forests_rejects_different_classes():
+    """
+    Test de que no se combinan bosques con clases distintas.
+    """
+    from sklearn.ensemble import RandomForestClassifier
+    
+    first = RandomForestClassifier(n_estimators=2, random_state=0).fit(DATA.data, DATA.target)
+    second = RandomForestClassifier(n_estimators=2, random_state=0).fit(DATA.data, DATA.target + 1)
+    
+    assert combine_forests([first, first]).n_estimators == 4
+    with pytest.raises(ValueError):
+        combine_forests([first, second])
@@ -12,7 +12,36 @@ import pytest
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from api.app import app
+import joblib
+import numpy as np
+
+from api.app import app, predictor, MODEL_PATH, SCALER_PATH, REQUIRED_FEATURES
+
+MALIGNANT_CASE = {
+    "mean_radius": 20.57, "mean_texture": 17.77, "mean_perimeter": 132.9,
+    "mean_area": 1326.0, "mean_smoothness": 0.08474, "mean_compactness": 0.07864,
+    "mean_concavity": 0.0869, "mean_concave_points": 0.07017, "mean_symmetry": 0.1812,
+    "mean_fractal_dimension": 0.05667, "radius_error": 0.5435, "texture_error": 0.7339,
+    "perimeter_error": 3.398, "area_error": 74.08, "smoothness_error": 0.005225,
+    "compactness_error": 0.01308, "concavity_error": 0.0186, "concave_points_error": 0.0134,
+    "symmetry_error": 0.01389, "fractal_dimension_error": 0.003532, "worst_radius": 24.99,
+    "worst_texture": 23.41, "worst_perimeter": 158.8, "worst_area": 1956.0,
+    "worst_smoothness": 0.1238, "worst_compactness": 0.1866, "worst_concavity": 0.2416,
+    "worst_concave_points": 0.186, "worst_symmetry": 0.275, "worst_fractal_dimension": 0.08902
+}
+
+BENIGN_CASE = {
+    "mean_radius": 13.54, "mean_texture": 14.36, "mean_perimeter": 87.46,
+    "mean_area": 566.3, "mean_smoothness": 0.09779, "mean_compactness": 0.08129,
+    "mean_concavity": 0.06664, "mean_concave_points": 0.04781, "mean_symmetry": 0.1885,
+    "mean_fractal_dimension": 0.05766, "radius_error": 0.2699, "texture_error": 0.7886,
+    "perimeter_error": 2.058, "area_error": 23.56, "smoothness_error": 0.008462,
+    "compactness_error": 0.0146, "concavity_error": 0.02387, "concave_points_error": 0.01315,
+    "symmetry_error": 0.0198, "fractal_dimension_error": 0.0023, "worst_radius": 15.11,
+    "worst_texture": 19.26, "worst_perimeter": 99.7, "worst_area": 711.2,
+    "worst_smoothness": 0.144, "worst_compactness": 0.1773, "worst_concavity": 0.239,
+    "worst_concave_points": 0.1288, "worst_symmetry": 0.2977, "worst_fractal_dimension": 0.07259
+}
 
 
 @pytest.fixture
@@ -236,6 +265,145 @@ def test_predict_invalid_values(client):
     assert response.status_code == 400
 
 
+@pytest.mark.parametrize('value', ['nan', 'inf', '-Infinity'])
+def test_predict_non_finite_values(client, value):
+    """
+    Test de que NaN e infinitos (que float() acepta) devuelven 400 en lugar
+    de una predicción.
+    """
+    response = client.post(
+        '/predict',
+        data=json.dumps(dict(MALIGNANT_CASE, mean_radius=value)),
+        content_type='application/json'
+    )
+    
+    assert response.status_code == 400
+    assert response.get_json()['missing_features'] == ["Feature 'mean_radius' debe ser un número"]
+
+
+def test_predict_batch_columns_non_finite(client):
+    """
+    Test de que el payload columnar reporta NaN e infinitos por fila.
+    """
+    columns = {f: [MALIGNANT_CASE[f], BENIGN_CASE[f]] for f in REQUIRED_FEATURES}
+    columns['mean_radius'][1] = 'nan'
+    columns['worst_area'][1] = 'inf'
+    
+    response = client.post(
+        '/predict/batch',
+        data=json.dumps({'columns': columns}),
+        content_type='application/json'
+    )
+    
+    data = json.loads(response.data)
+    assert data['errors_count'] == 1
+    assert data['predictions'][1]['errors'] == [
+        "Feature 'mean_radius' debe ser un número",
+        "Feature 'worst_area' debe ser un número"
+    ]
+
+
+def test_predict_batch_records(client):
+    """
+    Test de predicción por lotes con una lista de registros y una fila inválida.
+    """
+    invalid_case = dict(MALIGNANT_CASE, mean_radius="not_a_number")
+    payload = [MALIGNANT_CASE, invalid_case, BENIGN_CASE]
+    
+    response = client.post(
+        '/predict/batch',
+        data=json.dumps(payload),
+        content_type='application/json'
+    )
+    
+    assert response.status_code == 200
+    
+    data = json.loads(response.data)
+    assert data['count'] == 3
+    assert data['errors_count'] == 1
+    assert [r['index'] for r in data['predictions']] == [0, 1, 2]
+    assert data['predictions'][1]['error'] == 'Invalid input'
+    
+    for position, case in ((0, MALIGNANT_CASE), (2, BENIGN_CASE)):
+        single = json.loads(client.post(
+            '/predict',
+            data=json.dumps(case),
+            content_type='application/json'
+        ).data)
+        assert data['predictions'][position]['prediction'] == single['prediction']
+        assert data['predictions'][position]['probability'] == single['probability']
+
+
+def test_predict_batch_columns(client):
+    """
+    Test de predicción por lotes con payload columnar.
+    """
+    columns = {f: [MALIGNANT_CASE[f], BENIGN_CASE[f]] for f in REQUIRED_FEATURES}
+    columns['mean_texture'][1] = None
+    
+    response = client.post(
+        '/predict/batch',
+        data=json.dumps({'columns': columns}),
+        content_type='application/json'
+    )
+    
+    assert response.status_code == 200
+    
+    data = json.loads(response.data)
+    assert data['count'] == 2
+    assert 'prediction' in data['predictions'][0]
+    assert data['predictions'][1]['errors'] == ["Feature 'mean_texture' debe ser un número"]
+
+
+def test_predict_batch_invalid_columns(client):
+    """
+    Test de predicción por lotes con columnas faltantes.
+    """
+    response = client.post(
+        '/predict/batch',
+        data=json.dumps({'columns': {'mean_radius': [20.57]}}),
+        content_type='application/json'
+    )
+    
+    assert response.status_code == 400
+    
+    data = json.loads(response.data)
+    assert data['error'] == 'Invalid input'
+
+
+def test_single_pass_matches_model_predict():
+    """
+    Test de que la etiqueta derivada de predict_proba coincide con el
+    predict del modelo sklearn.
+    """
+    features = np.array([
+        [case[f] for f in REQUIRED_FEATURES] for case in (MALIGNANT_CASE, BENIGN_CASE)
+    ])
+    
+    probabilities = predictor.predict_proba_matrix(features)
+    scaler = joblib.load(SCALER_PATH)
+    expected = joblib.load(MODEL_PATH).predict(scaler.transform(features))
+    
+    assert list(predictor.decide(probabilities)) == list(expected)
+
+
+def test_decision_threshold():
+    """
+    Test de que el umbral de decisión desplaza la clase predicha.
+    """
+    probabilities = np.array([[0.3, 0.7], [0.6, 0.4]])
+    original_threshold = predictor.decision_threshold
+    
+    try:
+        predictor.decision_threshold = 0.5
+        assert list(predictor.decide(probabilities)) == [1, 0]
+        
+        predictor.decision_threshold = 0.25
+        assert list(predictor.decide(probabilities)) == [0, 0]
+    finally:
+        predictor.decision_threshold = original_threshold
+
+
 def test_get_features(client):
     """
     Test del endpoint de features.
@@ -0,0 +1,65 @@
+"""
+Tests de la evaluación del modelo con caché.
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sklearn.ensemble import RandomForestClassifier
+
+from models.train_model import BreastCancerModelTrainer
+
+
+@pytest.fixture
+def trained():
+    """
+    Entrenador con un bosque pequeño y sus particiones.
+    """
+    trainer = BreastCancerModelTrainer()
+    X, y = trainer.load_data()
+    splits = trainer.preprocess_data(X, y)
+    trainer.model = RandomForestClassifier(n_estimators=10, random_state=0, n_jobs=-1).fit(splits[0], splits[2])
+    return trainer, splits
+
+
+def test_evaluation_reports_metrics_from_one_probability_pass(trained):
+    """
+    Test de las métricas de evaluación.
+    """
+    trainer, splits = trained
+    
+    metrics = trainer.evaluate_model(*splits, n_jobs=1, cache_dir=None)
+    
+    assert 0.8 < metrics['test_accuracy'] <= 1.0
+    assert 0.8 < metrics['test_roc_auc'] <= 1.0
+    assert 0.8 < metrics['cv_mean'] <= 1.0
+    assert trainer.model.n_jobs == -1
+
+
+def test_unchanged_evaluation_is_served_from_cache(trained, tmp_path, monkeypatch):
+    """
+    Test de que una evaluación repetida no vuelve a puntuar el modelo y de
+    que cambiar los datos invalida la caché.
+    """
+    trainer, splits = trained
+    first = trainer.evaluate_model(*splits, n_jobs=1, cache_dir=str(tmp_path))
+    
+    def fail(*args, **kwargs):
+        raise AssertionError("La evaluación en caché no debe puntuar el modelo")
+    
+    monkeypatch.setattr(RandomForestClassifier, 'predict_proba', fail)
+    second = trainer.evaluate_model(*splits, n_jobs=1, cache_dir=str(tmp_path))
+    assert second.pop('training_date') >= first.pop('training_date')
+    assert second == first
+    
+    cached = json.loads(next(tmp_path.glob('*.json')).read_text())
+    assert 'training_date' not in cached
+    
+    X_train, X_test, y_train, y_test = splits
+    with pytest.raises(AssertionError):
+        trainer.evaluate_model(X_train, X_test[:-1], y_train, y_test[:-1], n_jobs=1, cache_dir=str(tmp_path))
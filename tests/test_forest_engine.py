@@ -0,0 +1,151 @@
+"""
+Tests del motor de inferencia compilado.
+
+Verifica que el bosque aplanado reproduce exactamente las probabilidades
+de scikit-learn.
+"""
+
+import os
+import sys
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.datasets import load_breast_cancer
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from api.app import COMPILED_MODEL_PATH, FUSED_MODEL_PATH, MODEL_PATH, SCALER_PATH
+from api.forest_engine import FOREST_ARRAYS, FOREST_SCALARS, CompiledForest
+from models.train_model import flatten_forest
+
+
+@pytest.fixture(scope='module')
+def artifacts():
+    """
+    Fixture que carga el modelo sklearn, el scaler y el bosque compilado.
+    """
+    model = joblib.load(MODEL_PATH)
+    model.n_jobs = 1
+    scaler = joblib.load(SCALER_PATH)
+    compiled = CompiledForest.load(COMPILED_MODEL_PATH)
+    return model, scaler, compiled
+
+
+def test_compiled_matches_sklearn(artifacts):
+    """
+    Test de que las probabilidades compiladas coinciden bit a bit con sklearn.
+    """
+    model, scaler, compiled = artifacts
+    X = scaler.transform(load_breast_cancer(as_frame=True).data)
+    
+    np.testing.assert_array_equal(compiled.predict_proba(X), model.predict_proba(X))
+    np.testing.assert_array_equal(compiled.predict(X), model.predict(X))
+
+
+def test_compiled_single_row(artifacts):
+    """
+    Test de predicción de una sola fila con el motor compilado.
+    """
+    model, scaler, compiled = artifacts
+    X = scaler.transform(load_breast_cancer(as_frame=True).data.iloc[:1])
+    
+    probabilities = compiled.predict_proba(X)
+    
+    assert probabilities.shape == (1, 2)
+    np.testing.assert_array_equal(probabilities, model.predict_proba(X))
+
+
+def test_compiled_rejects_wrong_shape(artifacts):
+    """
+    Test de que el motor rechaza matrices con un número de features incorrecto.
+    """
+    _, _, compiled = artifacts
+    
+    with pytest.raises(ValueError):
+        compiled.predict_proba(np.zeros((2, 5)))
+
+
+def test_fused_matches_two_step_pipeline(artifacts):
+    """
+    Test de que el bosque fusionado predice lo mismo que scaler + bosque
+    sobre features crudas.
+    """
+    model, scaler, _ = artifacts
+    fused = CompiledForest.load(FUSED_MODEL_PATH)
+    X = load_breast_cancer(as_frame=True).data
+    
+    np.testing.assert_array_equal(fused.predict_proba(X.values), model.predict_proba(scaler.transform(X)))
+
+
+def test_fused_exact_at_thresholds(artifacts):
+    """
+    Test de que la decisión del bosque fusionado coincide justo en los
+    umbrales y en el float64 inmediatamente superior.
+    """
+    model, scaler, _ = artifacts
+    fused = CompiledForest.load(FUSED_MODEL_PATH)
+    base = load_breast_cancer(as_frame=True).data
+    
+    left = fused.children[0::2]
+    split_nodes = np.flatnonzero(left != np.arange(len(left)))
+    rng = np.random.default_rng(0)
+    rows = []
+    for node in rng.choice(split_nodes, size=200):
+        for value in (fused.threshold[node], np.nextafter(fused.threshold[node], np.inf)):
+            row = base.values[rng.integers(len(base))].copy()
+            row[fused.feature[node]] = value
+            rows.append(row)
+    X = np.array(rows)
+    
+    expected = model.predict_proba(scaler.transform(pd.DataFrame(X, columns=base.columns)))
+    np.testing.assert_array_equal(fused.predict_proba(X), expected)
+
+
+def test_compiled_artifact_is_memory_mapped():
+    """
+    Test de que los arrays se mapean en memoria sin copias y de que la
+    carga en memoria privada da el mismo resultado.
+    """
+    mapped = CompiledForest.load(FUSED_MODEL_PATH)
+    copied = CompiledForest.load(FUSED_MODEL_PATH, mmap=False)
+    X = load_breast_cancer().data
+    
+    for name in ('feature', 'threshold', 'children', 'value', 'roots'):
+        array = getattr(mapped, name)
+        assert not array.flags.writeable
+        assert isinstance(array.base, np.memmap) or isinstance(array, np.memmap)
+    
+    np.testing.assert_array_equal(mapped.predict_proba(X), copied.predict_proba(X))
+
+
+def test_flattened_forest_has_only_engine_arrays(artifacts):
+    """
+    Test de que el artefacto solo incluye los arrays que usa el motor.
+    """
+    model, _, _ = artifacts
+    
+    assert set(flatten_forest(model)) == set(FOREST_ARRAYS + FOREST_SCALARS) - {'fused'}
+
+
+@pytest.mark.parametrize('value', [np.nan, np.inf, -np.inf])
+def test_non_finite_input_is_rejected_like_sklearn(artifacts, value):
+    """
+    Test de que los motores compilado y fusionado rechazan NaN e infinitos
+    en lugar de devolver una predicción (el NaN iría siempre a la
+    izquierda). scikit-learn 1.3 también los rechaza; las versiones con
+    soporte de valores ausentes aceptan NaN, pero nunca infinitos.
+    """
+    model, scaler, compiled = artifacts
+    fused = CompiledForest.load(FUSED_MODEL_PATH)
+    X = load_breast_cancer().data[:3].copy()
+    X[1, 0] = value
+    
+    with pytest.raises(ValueError):
+        compiled.predict_proba(scaler.transform(X))
+    with pytest.raises(ValueError):
+        fused.predict_proba(X)
+    if np.isinf(value):
+        with pytest.raises(ValueError):
+            model.predict_proba(scaler.transform(X))
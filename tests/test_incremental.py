@@ -0,0 +1,122 @@
+"""
+Tests del reentrenamiento incremental y de la numeración de versiones.
+"""
+
+import copy
+import os
+import sys
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sklearn.datasets import load_breast_cancer
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.preprocessing import StandardScaler
+
+from api.registry import ModelRegistry
+from models.data_sources import open_source
+from models.train_model import BreastCancerModelTrainer, rescale_thresholds
+
+DATA = load_breast_cancer()
+
+
+@pytest.fixture
+def trained_dir(tmp_path):
+    """
+    Artefacto entrenado con las primeras 400 filas del dataset.
+    """
+    trainer = BreastCancerModelTrainer()
+    trainer.feature_names = DATA.feature_names
+    trainer.target_names = DATA.target_names
+    trainer.scaler = StandardScaler().fit(DATA.data[:400])
+    trainer.model = RandomForestClassifier(n_estimators=20, max_depth=6, random_state=0)
+    trainer.model.fit(trainer.scaler.transform(DATA.data[:400]), DATA.target[:400])
+    trainer.save_model(str(tmp_path))
+    return str(tmp_path)
+
+
+@pytest.fixture
+def new_cases(tmp_path):
+    """
+    CSV con las filas que el artefacto no ha visto.
+    """
+    path = str(tmp_path / 'new.csv')
+    frame = pd.DataFrame(DATA.data[400:], columns=DATA.feature_names)
+    frame['target'] = DATA.target[400:]
+    frame.to_csv(path, index=False)
+    return path
+
+
+def test_rescaled_thresholds_keep_tree_decisions():
+    """
+    Test de que el bosque decide lo mismo sobre features crudas tras
+    actualizar el scaler (salvo valores que la nueva escala no distingue
+    del umbral en float32).
+    """
+    scaler = StandardScaler().fit(DATA.data[:300])
+    forest = RandomForestClassifier(n_estimators=10, random_state=0)
+    forest.fit(scaler.transform(DATA.data[:300]), DATA.target[:300])
+    expected = forest.predict(scaler.transform(DATA.data))
+    
+    updated = copy.deepcopy(scaler).partial_fit(DATA.data[300:])
+    rescale_thresholds(forest, scaler, updated)
+    
+    agreement = np.mean(forest.predict(updated.transform(DATA.data)) == expected)
+    assert agreement > 0.99
+
+
+def test_update_appends_trees_and_versions_artifact(trained_dir, new_cases):
+    """
+    Test de la actualización con warm start y de la copia versionada.
+    """
+    trainer = BreastCancerModelTrainer()
+    trainer.load_artifacts(trained_dir)
+    first_trees = list(trainer.model.estimators_)
+    
+    report = trainer.update_model(open_source(new_cases, trainer.feature_names), n_new_trees=5)
+    trainer.save_model(trained_dir)
+    
+    assert report['n_estimators'] == 25
+    assert trainer.model.estimators_[:20] == first_trees
+    assert report['n_samples_train'] + report['n_samples_validation'] == len(DATA.data) - 400
+    assert report['scaler_samples_seen'] == 400 + report['n_samples_train']
+    assert report['validation_after']['accuracy'] > 0.85
+    
+    metadata = joblib.load(os.path.join(trained_dir, 'model_metadata.pkl'))
+    assert (metadata['version'], metadata['parent_version']) == (2, 1)
+    registry = ModelRegistry(os.path.join(trained_dir, 'registry'))
+    assert [entry['version'] for entry in registry.versions()] == [2, 1]
+    archived = joblib.load(os.path.join(registry.path('v1'), 'breast_cancer_model.pkl'))
+    assert archived.n_estimators == 20
+
+
+def test_replace_weakest_keeps_forest_size(trained_dir, new_cases):
+    """
+    Test de que se retiran tantos árboles como se añaden.
+    """
+    trainer = BreastCancerModelTrainer()
+    trainer.load_artifacts(trained_dir)
+    
+    report = trainer.update_model(open_source(new_cases, trainer.feature_names), n_new_trees=5, replace_weakest=True)
+    
+    assert report['n_estimators'] == 20
+    assert len(report['replaced_trees']) == 5
+
+
+def test_update_requires_every_class(trained_dir, tmp_path):
+    """
+    Test del error cuando los casos nuevos no contienen todas las clases.
+    """
+    path = str(tmp_path / 'benign.csv')
+    frame = pd.DataFrame(DATA.data[DATA.target == 1], columns=DATA.feature_names)
+    frame['target'] = 1
+    frame.to_csv(path, index=False)
+    trainer = BreastCancerModelTrainer()
+    trainer.load_artifacts(trained_dir)
+    
+    with pytest.raises(ValueError, match='clases'):
+        trainer.update_model(open_source(path, trainer.feature_names))
@@ -0,0 +1,51 @@
+"""
+Tests del backend JSON de la API.
+"""
+
+import json
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from api.app import app, get_predictor
+from api.json_backend import BACKEND, dumps, dumps_bytes, loads
+from tests.test_endpoints import MALIGNANT_CASE
+
+
+def test_round_trip_matches_stdlib():
+    """
+    Test de que el backend produce el mismo JSON que la biblioteca estándar.
+    """
+    payload = {'prediction': 0, 'probability': {'Malignant': 0.97, 'Benign': 0.03}, 'labels': ['á', 'b']}
+    
+    assert loads(dumps(payload)) == payload
+    assert json.loads(dumps_bytes(payload)) == payload
+    assert loads(dumps_bytes(payload)) == payload
+
+
+def test_flask_uses_backend_provider():
+    """
+    Test de que las respuestas de Flask pasan por el backend configurado.
+    """
+    with app.test_client() as client:
+        response = client.get('/')
+    
+    assert response.get_json()['json_backend'] == BACKEND
+    assert response.mimetype == 'application/json'
+
+
+def test_format_result_uses_precomputed_labels():
+    """
+    Test de que las etiquetas se precalculan al cargar el modelo.
+    """
+    current = get_predictor()
+    result = current.predict_row(current.record_to_row(MALIGNANT_CASE))
+    
+    assert current.labels == ['Malignant', 'Benign']
+    assert result['prediction_label'] == 'Malignant'
+    assert isinstance(result['confidence'], float)
+    assert set(result['probability']) == set(current.labels)
+    np.testing.assert_allclose(sum(result['probability'].values()), 1.0)
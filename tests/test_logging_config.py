@@ -0,0 +1,56 @@
+"""
+Tests del logging estructurado y muestreado.
+"""
+
+import json
+import logging
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from api.app import app
+from api.logging_config import JsonFormatter, PredictionSampler
+
+
+def test_json_formatter_includes_extra_fields():
+    """
+    Test de que cada registro es una línea JSON con los campos extra.
+    """
+    record = logging.getLogger('api.test').makeRecord(
+        'api.test', logging.INFO, __file__, 1, "Predicción realizada: %s", ('Malignant',), None,
+        extra={'confidence': 0.97}
+    )
+    
+    entry = json.loads(JsonFormatter().format(record))
+    
+    assert entry['message'] == 'Predicción realizada: Malignant'
+    assert entry['level'] == 'INFO'
+    assert entry['logger'] == 'api.test'
+    assert entry['confidence'] == 0.97
+
+
+def test_prediction_sampler_rates():
+    """
+    Test de las tasas de muestreo extremas y de una intermedia.
+    """
+    assert not any(PredictionSampler(0.0)() for _ in range(1000))
+    assert all(PredictionSampler(1.0)() for _ in range(1000))
+    assert 0 < sum(PredictionSampler(0.5)() for _ in range(1000)) < 1000
+    
+    with pytest.raises(ValueError):
+        PredictionSampler(1.5)
+
+
+def test_health_check_does_not_log(caplog):
+    """
+    Test de que el health check no registra nada en cada sondeo.
+    """
+    with caplog.at_level(logging.INFO, logger='api.app'):
+        with app.test_client() as client:
+            response = client.get('/')
+    
+    assert response.status_code == 200
+    assert not [record for record in caplog.records if record.name == 'api.app']
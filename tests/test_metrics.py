@@ -0,0 +1,58 @@
+"""
+Tests de las métricas en formato Prometheus.
+"""
+
+import json
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from api.app import app
+from api.metrics import Counter, Histogram
+from tests.test_endpoints import MALIGNANT_CASE
+
+
+def test_shards_are_aggregated_across_threads():
+    """
+    Test de que los fragmentos de cada hilo se suman al exponer.
+    """
+    counter = Counter('test_total', 'Contador de prueba', ('kind',))
+    histogram = Histogram('test_seconds', 'Histograma de prueba', buckets=(0.1, 1.0))
+    
+    def work():
+        for _ in range(1000):
+            counter.inc('a')
+            histogram.observe(0.5)
+    
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert counter.values() == {('a',): 4000}
+    lines = histogram.render()
+    assert 'test_seconds_bucket{le="0.1"} 0' in lines
+    assert 'test_seconds_bucket{le="1"} 4000' in lines
+    assert 'test_seconds_bucket{le="+Inf"} 4000' in lines
+    assert 'test_seconds_count 4000' in lines
+
+
+def test_metrics_endpoint_reports_stages():
+    """
+    Test del endpoint /metrics tras una predicción.
+    """
+    with app.test_client() as client:
+        client.post('/predict', data=json.dumps(MALIGNANT_CASE), content_type='application/json')
+        response = client.get('/metrics')
+    
+    assert response.status_code == 200
+    assert response.content_type.startswith('text/plain; version=0.0.4')
+    
+    body = response.data.decode()
+    for stage in ('parse', 'validate', 'model', 'serialize'):
+        assert f'prediction_stage_duration_seconds_count{{stage="{stage}"}}' in body
+    assert 'http_requests_total{endpoint="/predict",method="POST",status="200"}' in body
+    assert 'model_info{' in body
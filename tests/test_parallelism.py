@@ -0,0 +1,91 @@
+"""
+Tests del control de paralelismo de la inferencia.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from api.app import ModelPredictor, predictor
+from api.parallelism import ParallelScorer
+
+
+class RecordingModel:
+    """
+    Modelo falso que registra el tamaño de cada bloque puntuado.
+    """
+
+    def __init__(self):
+        self.blocks = []
+
+    def predict_proba(self, features):
+        self.blocks.append(len(features))
+        return np.column_stack([features[:, 0], 1 - features[:, 0]])
+
+
+def test_small_batches_are_scored_serially():
+    """
+    Test de que por debajo del umbral se hace una sola llamada al modelo.
+    """
+    scorer = ParallelScorer(n_jobs=4, threshold=100)
+    model = RecordingModel()
+    
+    scorer.predict_proba(model, np.zeros((99, 30)))
+    
+    assert model.blocks == [99]
+    assert not ParallelScorer(n_jobs=1, threshold=1).is_parallel(10 ** 6)
+
+
+def test_large_batches_are_split_in_order():
+    """
+    Test de que los lotes grandes se reparten y se reensamblan en orden.
+    """
+    scorer = ParallelScorer(n_jobs=4, threshold=2)
+    model = RecordingModel()
+    features = np.random.RandomState(0).rand(10, 30)
+    
+    probabilities = scorer.predict_proba(model, features)
+    
+    assert sorted(model.blocks) == [2, 2, 3, 3]
+    np.testing.assert_array_equal(probabilities[:, 0], features[:, 0])
+    
+    # Con menos filas que hilos no se crean bloques vacíos
+    model.blocks = []
+    scorer.predict_proba(model, features[:3])
+    assert model.blocks == [1, 1, 1]
+
+
+def test_parallel_scoring_matches_serial_with_real_model():
+    """
+    Test de que el bosque devuelve las mismas probabilidades en paralelo.
+    """
+    features = np.random.RandomState(1).rand(64, 30) * 100
+    parallel = ModelPredictor(cache_size=0, scorer=ParallelScorer(n_jobs=3, threshold=1))
+    
+    np.testing.assert_array_equal(
+        parallel.predict_proba_matrix(features),
+        predictor.predict_proba_matrix(features)
+    )
+
+
+def test_sklearn_backend_ignores_pickled_n_jobs():
+    """
+    Test de que el n_jobs=-1 del entrenamiento no se usa al servir.
+    """
+    sklearn_predictor = ModelPredictor(backend='sklearn', cache_size=0)
+    
+    assert sklearn_predictor.model.n_jobs == 1
+
+
+def test_invalid_configuration_is_rejected():
+    """
+    Test de la validación de parámetros.
+    """
+    with pytest.raises(ValueError):
+        ParallelScorer(n_jobs=0)
+    with pytest.raises(ValueError):
+        ParallelScorer(threshold=0)
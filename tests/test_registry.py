@@ -0,0 +1,208 @@
+"""
+Tests del registro de versiones y del servicio de varias versiones.
+"""
+
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import api.app as app_module
+from api.app import (
+    COMPILED_MODEL_PATH, FUSED_MODEL_PATH, METADATA_PATH, MODEL_PATH, MODEL_VERSION_HEADER, SCALER_PATH, app
+)
+from api.registry import ModelPool, ModelRegistry, UnknownModelVersion
+from tests.test_endpoints import MALIGNANT_CASE
+
+
+def make_artifact(directory, content):
+    """
+    Crea un artefacto mínimo con un archivo y un subdirectorio.
+    """
+    os.makedirs(os.path.join(directory, 'forest'))
+    with open(os.path.join(directory, 'model.bin'), 'w') as artifact:
+        artifact.write(content)
+    with open(os.path.join(directory, 'forest', 'threshold.npy'), 'w') as artifact:
+        artifact.write(content * 2)
+    return [os.path.join(directory, 'model.bin'), os.path.join(directory, 'forest')]
+
+
+def test_publish_is_content_addressed_and_immutable(tmp_path):
+    """
+    Test de que el mismo contenido da el mismo directorio, de solo lectura.
+    """
+    registry = ModelRegistry(str(tmp_path / 'registry'))
+    first = registry.publish(make_artifact(str(tmp_path / 'a'), 'uno'), metadata={'parent_version': None})
+    again = registry.publish(make_artifact(str(tmp_path / 'b'), 'uno'))
+    second = registry.publish(make_artifact(str(tmp_path / 'c'), 'dos'))
+    
+    assert first == again != second
+    assert sorted(name for name in os.listdir(registry.root) if not name.endswith('.json')) == sorted([first, second])
+    assert not os.stat(os.path.join(registry.root, first, 'forest', 'threshold.npy')).st_mode & 0o222
+    assert [entry['version'] for entry in registry.versions()] == [2, 1]
+
+
+def test_resolve_accepts_versions_aliases_and_prefixes(tmp_path):
+    """
+    Test de las formas de referirse a una versión.
+    """
+    registry = ModelRegistry(str(tmp_path / 'registry'))
+    first = registry.publish(make_artifact(str(tmp_path / 'a'), 'uno'), version=7)
+    second = registry.publish(make_artifact(str(tmp_path / 'b'), 'dos'))
+    
+    assert registry.resolve('7') == registry.resolve('v7') == registry.resolve(first[:8]) == first
+    assert registry.resolve('latest') == second
+    assert registry.resolve('8') == second
+    
+    registry.set_alias('latest', 'v7')
+    assert registry.resolve('latest') == first
+    
+    for ref in ('v99', 'nope', first[:3]):
+        with pytest.raises(UnknownModelVersion):
+            registry.resolve(ref)
+
+
+class FakePredictor:
+    """
+    Predictor mínimo con la memoria que declara.
+    """
+    
+    def __init__(self, memory_bytes):
+        self.memory_bytes = memory_bytes
+
+
+def test_pool_evicts_least_recently_used_versions(tmp_path):
+    """
+    Test del LRU acotado por memoria.
+    """
+    registry = ModelRegistry(str(tmp_path / 'registry'))
+    digests = [registry.publish(make_artifact(str(tmp_path / name), name)) for name in 'abc']
+    pool = ModelPool(registry, lambda path, digest: FakePredictor(40), max_bytes=100)
+    
+    first = pool.get(digests[0])
+    pool.get(digests[1])
+    assert pool.get(digests[0]) is first
+    pool.get(digests[2])
+    
+    stats = pool.stats()
+    assert stats['loaded'] == [digests[0], digests[2]]
+    assert (stats['loads'], stats['hits'], stats['evictions']) == (3, 1, 1)
+
+
+def test_pool_loads_each_version_once(tmp_path):
+    """
+    Test de que las peticiones concurrentes a una versión no cargada
+    comparten una única carga.
+    """
+    registry = ModelRegistry(str(tmp_path / 'registry'))
+    digest = registry.publish(make_artifact(str(tmp_path / 'a'), 'a'))
+    
+    def slow_load(path, digest):
+        time.sleep(0.05)
+        return FakePredictor(1)
+    
+    pool = ModelPool(registry, slow_load, max_bytes=100)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(pool.get('latest'))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert pool.loads == 1
+    assert all(result is results[0] for result in results)
+    assert pool.stats()['loaded'] == [digest]
+
+
+def test_pool_cleans_up_after_failed_load(tmp_path):
+    """
+    Test de que una carga fallida no deja el lock de la versión ni una
+    entrada en el pool, y de que se puede volver a intentar.
+    """
+    registry = ModelRegistry(str(tmp_path / 'registry'))
+    digest = registry.publish(make_artifact(str(tmp_path / 'a'), 'a'))
+    attempts = []
+    
+    def flaky_load(path, digest):
+        attempts.append(digest)
+        if len(attempts) == 1:
+            raise ValueError("artefactos corruptos")
+        return FakePredictor(1)
+    
+    pool = ModelPool(registry, flaky_load, max_bytes=100)
+    
+    with pytest.raises(ValueError):
+        pool.get(digest)
+    assert pool._load_locks == {}
+    assert pool.stats()['loaded'] == []
+    
+    assert pool.get(digest).memory_bytes == 1
+    assert pool.stats()['loads'] == 1
+    assert pool._load_locks == {}
+
+
+@pytest.fixture
+def served_registry(tmp_path, monkeypatch):
+    """
+    Registro con el modelo actual publicado como versión 1 y servido por la app.
+    """
+    registry = ModelRegistry(str(tmp_path / 'registry'))
+    digest = registry.publish(
+        [MODEL_PATH, SCALER_PATH, METADATA_PATH, COMPILED_MODEL_PATH, FUSED_MODEL_PATH], version=1
+    )
+    monkeypatch.setattr(app_module, 'model_registry', registry)
+    monkeypatch.setattr(app_module, 'model_pool', ModelPool(registry, app_module._load_version, 1 << 30))
+    return digest
+
+
+@pytest.fixture
+def client():
+    """
+    Fixture para crear un cliente de prueba de Flask.
+    """
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+
+def test_requests_are_routed_by_header_or_path(client, served_registry):
+    """
+    Test del enrutado a una versión por cabecera y por ruta.
+    """
+    default = client.post('/predict', json=MALIGNANT_CASE)
+    by_header = client.post('/predict', json=MALIGNANT_CASE, headers={MODEL_VERSION_HEADER: 'v1'})
+    by_path = client.post(f'/models/{served_registry[:8]}/predict/batch', json=[MALIGNANT_CASE])
+    
+    assert by_header.status_code == by_path.status_code == 200
+    assert by_header.headers[MODEL_VERSION_HEADER] == served_registry[:12]
+    assert by_path.headers[MODEL_VERSION_HEADER] == served_registry[:12]
+    assert default.headers[MODEL_VERSION_HEADER] == app_module.get_predictor().model_version
+    assert by_header.get_json()['probability'] == default.get_json()['probability']
+    assert app_module.model_pool.stats()['loads'] == 1
+
+
+def test_unknown_version_returns_404(client, served_registry):
+    """
+    Test de la respuesta para una versión inexistente.
+    """
+    response = client.post('/models/v42/predict', json=MALIGNANT_CASE)
+    
+    assert response.status_code == 404
+    assert response.get_json()['error'] == 'Model version not found'
+
+
+def test_models_endpoint_lists_versions(client, served_registry):
+    """
+    Test del listado de versiones y del pool.
+    """
+    client.post('/predict', json=MALIGNANT_CASE, headers={MODEL_VERSION_HEADER: 'latest'})
+    
+    data = client.get('/models').get_json()
+    
+    assert data['versions'][0]['digest'] == served_registry
+    assert data['versions'][0]['aliases'] == ['latest']
+    assert data['pool']['loaded'] == [served_registry]
@@ -0,0 +1,148 @@
+"""
+Tests de la recarga en caliente del modelo.
+"""
+
+import copy
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import api.app as app_module
+from api.app import app, get_predictor, reloader
+from api.reload import ModelReloader
+from tests.test_endpoints import MALIGNANT_CASE
+
+
+@pytest.fixture
+def client():
+    """
+    Fixture para crear un cliente de prueba de Flask.
+    """
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+
+def test_reload_swaps_predictor():
+    """
+    Test de que una recarga correcta publica un predictor nuevo.
+    """
+    previous = get_predictor()
+    
+    assert reloader.reload(wait=True)
+    
+    current = get_predictor()
+    assert current is not previous
+    assert current.model_version == previous.model_version
+    assert reloader.status()['last_error'] is None
+
+
+def test_failed_reload_keeps_current_predictor():
+    """
+    Test de que una recarga fallida no sustituye el predictor activo.
+    """
+    swapped = []
+    
+    def failing_load():
+        raise ValueError("artefactos inválidos")
+    
+    failing_reloader = ModelReloader(failing_load, swapped.append)
+    
+    assert not failing_reloader.reload(wait=True)
+    assert swapped == []
+    assert failing_reloader.status()['failures'] == 1
+    assert 'artefactos inválidos' in failing_reloader.status()['last_error']
+
+
+def test_verify_rejects_mismatched_schema():
+    """
+    Test de que la validación rechaza un modelo con otras features.
+    """
+    candidate = copy.copy(get_predictor())
+    candidate.metadata = dict(candidate.metadata, feature_names=['otra_feature'] * 30)
+    
+    with pytest.raises(ValueError):
+        candidate.verify()
+
+
+def test_reload_result_is_not_overwritten_by_a_later_reload():
+    """
+    Test de que reload(wait=True) devuelve el resultado de su propia
+    recarga aunque otra posterior cambie last_error antes de que lo lea.
+    """
+    outcomes = iter([ValueError("artefactos inválidos"), None])
+    
+    def load():
+        error = next(outcomes)
+        if error is not None:
+            raise error
+        return object()
+    
+    def swap(new_predictor):
+        pass
+    
+    racing = ModelReloader(load, swap)
+    original_run = racing._run
+    
+    def run_then_reload(outcome):
+        # Tras liberar el lock, y antes del join, otra recarga tiene éxito
+        original_run(outcome)
+        racing._run = original_run
+        racing.reload(wait=True)
+    
+    racing._run = run_then_reload
+    
+    assert not racing.reload(wait=True)
+    assert racing.status()['last_error'] is None
+
+
+def test_reload_endpoint_is_disabled_without_token(client, monkeypatch):
+    """
+    Test de que sin ADMIN_TOKEN el endpoint de recarga se rechaza.
+    """
+    monkeypatch.setattr(app_module, 'ADMIN_TOKEN', None)
+    
+    response = client.post('/admin/reload?wait=true')
+    
+    assert response.status_code == 403
+
+
+def test_reload_endpoint_reports_reload_in_progress(client, monkeypatch):
+    """
+    Test de que con ?wait=true una recarga ya en curso responde 409 y no
+    se informa como fallida.
+    """
+    monkeypatch.setattr(app_module, 'ADMIN_TOKEN', 'secreto')
+    failures = reloader.status()['failures']
+    
+    with reloader._lock:
+        response = client.post('/admin/reload?wait=true', headers={'X-Admin-Token': 'secreto'})
+    
+    assert response.status_code == 409
+    assert response.get_json()['status'] == 'in_progress'
+    assert reloader.status()['failures'] == failures
+
+
+def test_reload_endpoint(client, monkeypatch):
+    """
+    Test del endpoint de recarga y de que la API sigue prediciendo.
+    """
+    monkeypatch.setattr(app_module, 'ADMIN_TOKEN', 'secreto')
+    assert client.post('/admin/reload?wait=true', headers={'X-Admin-Token': 'otro'}).status_code == 403
+    
+    response = client.post('/admin/reload?wait=true', headers={'X-Admin-Token': 'secreto'})
+    assert response.status_code == 200
+    
+    data = json.loads(response.data)
+    assert data['status'] == 'reloaded'
+    
+    response = client.post(
+        '/predict',
+        data=json.dumps(MALIGNANT_CASE),
+        content_type='application/json'
+    )
+    assert response.status_code == 200
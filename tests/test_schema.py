@@ -0,0 +1,81 @@
+"""
+Tests del esquema compilado de features.
+"""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from api.app import REQUIRED_FEATURES
+from api.schema import FeatureSchema
+from tests.test_endpoints import MALIGNANT_CASE
+
+
+def test_schema_from_metadata_normalizes_names():
+    """
+    Test de que los nombres de sklearn se normalizan al formato de la API.
+    """
+    schema = FeatureSchema.from_metadata({'feature_names': ['mean radius', 'worst area']}, REQUIRED_FEATURES)
+    
+    assert schema.names == ('mean_radius', 'worst_area')
+    assert FeatureSchema.from_metadata({}, REQUIRED_FEATURES).names == tuple(REQUIRED_FEATURES)
+
+
+def test_parse_matches_feature_order():
+    """
+    Test de conversión de un registro válido (incluidos valores en texto).
+    """
+    schema = FeatureSchema(REQUIRED_FEATURES)
+    record = dict(MALIGNANT_CASE, mean_radius='20.57')
+    
+    row, errors = schema.parse(record)
+    
+    assert errors == []
+    assert row.dtype == np.float64
+    np.testing.assert_array_equal(row, [float(MALIGNANT_CASE[f]) for f in REQUIRED_FEATURES])
+
+
+def test_parse_reports_every_bad_field():
+    """
+    Test de que se reportan todos los campos erróneos a la vez.
+    """
+    schema = FeatureSchema(REQUIRED_FEATURES)
+    record = dict(MALIGNANT_CASE, mean_texture='abc', worst_area=None)
+    del record['mean_radius']
+    del record['symmetry_error']
+    
+    row, errors = schema.parse(record)
+    
+    assert row is None
+    assert errors == [
+        'mean_radius',
+        "Feature 'mean_texture' debe ser un número",
+        'symmetry_error',
+        "Feature 'worst_area' debe ser un número"
+    ]
+    assert schema.parse([1, 2, 3]) == (None, ['El registro debe ser un objeto JSON'])
+
+
+def test_parse_rejects_non_finite_values():
+    """
+    Test de que "nan", "inf" y 1e999 (que float() acepta) se reportan como
+    valores no numéricos, todos a la vez, también en parse_many.
+    """
+    schema = FeatureSchema(REQUIRED_FEATURES)
+    record = dict(MALIGNANT_CASE, mean_radius='nan', mean_texture='inf', worst_area=1e999)
+    
+    row, errors = schema.parse(record)
+    
+    assert row is None
+    assert errors == [
+        "Feature 'mean_radius' debe ser un número",
+        "Feature 'mean_texture' debe ser un número",
+        "Feature 'worst_area' debe ser un número"
+    ]
+    
+    features, row_errors = schema.parse_many([MALIGNANT_CASE, dict(MALIGNANT_CASE, mean_area='-Infinity')])
+    assert row_errors == {1: ["Feature 'mean_area' debe ser un número"]}
+    assert np.isfinite(features).all()
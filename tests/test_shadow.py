@@ -0,0 +1,106 @@
+"""
+Tests de la puntuación en sombra de un modelo candidato.
+"""
+
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import api.app as app_module
+from api.app import app, get_predictor
+from api.shadow import ShadowScorer
+from tests.test_endpoints import MALIGNANT_CASE
+
+
+class FakeCandidate:
+    """
+    Candidato que devuelve siempre las mismas probabilidades.
+    """
+    
+    model_version = 'candidate'
+    
+    def __init__(self, probabilities, release=None):
+        self.probabilities = np.array([probabilities])
+        self.release = release
+    
+    def predict_proba_matrix(self, features):
+        if self.release is not None:
+            self.release.wait()
+        return self.probabilities
+    
+    def decide(self, probabilities):
+        return np.argmax(probabilities, axis=1)
+
+
+def test_shadow_records_disagreement_and_latency():
+    """
+    Test de la comparación entre el candidato y el modelo principal.
+    """
+    shadow = ShadowScorer(lambda: FakeCandidate([0.2, 0.8]))
+    
+    assert shadow.submit(np.zeros((1, 30)), 1, [0.3, 0.7], 0.001)
+    assert shadow.submit(np.zeros((1, 30)), 0, [0.9, 0.1], 0.003)
+    shadow.join()
+    
+    stats = shadow.stats()
+    assert (stats['scored'], stats['disagreements']) == (2, 1)
+    assert stats['disagreement_rate'] == 0.5
+    assert stats['mean_probability_difference'] == pytest.approx((0.1 + 0.7) / 2)
+    assert stats['latency']['primary']['p50_ms'] == pytest.approx(2.0)
+    assert stats['candidate_version'] == 'candidate'
+
+
+def test_full_queue_drops_without_blocking():
+    """
+    Test de que con la cola llena se descarta sin esperar al candidato.
+    """
+    release = threading.Event()
+    shadow = ShadowScorer(lambda: FakeCandidate([0.5, 0.5], release), queue_size=2, n_workers=1)
+    
+    start = time.perf_counter()
+    accepted = [shadow.submit(np.zeros((1, 30)), 0, [0.5, 0.5], 0.0) for _ in range(10)]
+    elapsed = time.perf_counter() - start
+    release.set()
+    shadow.join()
+    
+    assert elapsed < 0.5
+    assert sum(accepted) <= 3
+    stats = shadow.stats()
+    assert stats['dropped'] == 10 - sum(accepted)
+    assert stats['scored'] == sum(accepted)
+
+
+def test_sample_rate_zero_skips_everything():
+    """
+    Test de que fuera de la muestra no se encola nada.
+    """
+    shadow = ShadowScorer(lambda: FakeCandidate([0.5, 0.5]), sample_rate=0.0)
+    
+    assert not shadow.submit(np.zeros((1, 30)), 0, [0.5, 0.5], 0.0)
+    assert shadow.stats()['queued'] == 0
+
+
+def test_predict_endpoint_feeds_shadow(monkeypatch):
+    """
+    Test de extremo a extremo: /predict encola y el candidato (el mismo
+    modelo) coincide con la respuesta.
+    """
+    shadow = ShadowScorer(get_predictor)
+    monkeypatch.setattr(app_module, 'shadow_scorer', shadow)
+    app.config['TESTING'] = True
+    
+    with app.test_client() as client:
+        response = client.post('/predict', json=MALIGNANT_CASE)
+        shadow.join()
+        status = client.get('/shadow').get_json()
+    
+    assert response.status_code == 200
+    assert status['enabled']
+    assert (status['scored'], status['disagreements']) == (1, 0)
+    assert status['mean_probability_difference'] == pytest.approx(0.0)
@@ -0,0 +1,114 @@
+"""
+Tests del arranque diferido de la API (STARTUP_MODE) y de los endpoints
+de liveness y readiness.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import api.app as app_module
+from api.app import create_app, get_predictor
+from api.reload import ModelReloader
+from tests.test_endpoints import MALIGNANT_CASE
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+def test_import_has_no_side_effects():
+    """
+    Test de que importar la API no carga el modelo ni joblib/scikit-learn.
+    """
+    script = (
+        "import json, sys; import api.app; "
+        "print(json.dumps({'ready': api.app.model_ready(), "
+        "'modules': [m for m in ('joblib', 'sklearn', 'pyarrow') if m in sys.modules]}))"
+    )
+    completed = subprocess.run(
+        [sys.executable, '-c', script], cwd=ROOT_DIR, capture_output=True, text=True, check=True
+    )
+    
+    assert json.loads(completed.stdout) == {'ready': False, 'modules': []}
+
+
+@pytest.fixture
+def gated_reloader(monkeypatch):
+    """
+    Reloader cuya carga espera a que el test la libere, con la API sin
+    modelo activo.
+    """
+    current = get_predictor()
+    release = threading.Event()
+    
+    def gated_load():
+        release.wait(5)
+        return current
+    
+    reloader = ModelReloader(gated_load, app_module._swap_predictor)
+    monkeypatch.setattr(app_module, '_active_predictor', None)
+    monkeypatch.setattr(app_module, 'reloader', reloader)
+    return reloader, release
+
+
+def test_lazy_startup_is_live_before_ready(gated_reloader):
+    """
+    Test de que en modo lazy la app responde enseguida y las predicciones
+    esperan a readiness.
+    """
+    reloader, release = gated_reloader
+    client = create_app('lazy').test_client()
+    
+    assert client.get('/health/live').status_code == 200
+    loading = client.get('/health/ready')
+    assert loading.status_code == 503
+    assert loading.get_json()['status'] == 'loading'
+    not_ready = client.post('/predict', json=MALIGNANT_CASE)
+    assert not_ready.status_code == 503
+    assert not_ready.headers['Retry-After'] == '1'
+    
+    release.set()
+    assert reloader.wait(5)
+    
+    ready = client.get('/health/ready')
+    assert ready.status_code == 200
+    assert ready.get_json()['model_version'] == get_predictor().model_version
+    assert client.post('/predict', json=MALIGNANT_CASE).status_code == 200
+
+
+def test_get_predictor_waits_for_background_load(gated_reloader):
+    """
+    Test de que get_predictor() fuera de una petición espera a la carga en
+    curso en lugar de lanzar otra.
+    """
+    reloader, release = gated_reloader
+    create_app('lazy')
+    threading.Timer(0.05, release.set).start()
+    
+    assert get_predictor() is not None
+    assert reloader.status()['reloads'] == 1
+
+
+def test_failed_initial_load_fails_liveness(monkeypatch):
+    """
+    Test de que si la carga inicial falla la liveness responde 503 y el
+    modo eager no devuelve una app sin modelo.
+    """
+    def failing_load():
+        raise ValueError("artefactos inválidos")
+    
+    monkeypatch.setattr(app_module, '_active_predictor', None)
+    monkeypatch.setattr(app_module, 'reloader', ModelReloader(failing_load, app_module._swap_predictor))
+    
+    with pytest.raises(RuntimeError, match='artefactos inválidos'):
+        create_app('eager')
+    
+    client = create_app('lazy').test_client()
+    app_module.reloader.wait(5)
+    assert client.get('/health/live').status_code == 503
+    assert client.get('/health/ready').status_code == 503
@@ -0,0 +1,66 @@
+"""
+Tests de la búsqueda de hiperparámetros con objetivo de latencia.
+"""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sklearn.ensemble import RandomForestClassifier
+
+from models.train_model import BreastCancerModelTrainer, InferenceLatencyModel, LatencyAwareScorer
+
+
+def _fit_forest(n_estimators, max_depth):
+    X = np.random.RandomState(0).rand(60, 30)
+    y = (X[:, 0] > 0.5).astype(int)
+    return RandomForestClassifier(n_estimators=n_estimators, max_depth=max_depth, random_state=0).fit(X, y), X, y
+
+
+def test_latency_model_is_linear_in_trees_by_depth():
+    """
+    Test de la estimación de latencia a partir del tamaño del bosque.
+    """
+    forest, _, _ = _fit_forest(10, 3)
+    latency_model = InferenceLatencyModel(base_ms=0.1, per_node_ms=0.01)
+    
+    assert InferenceLatencyModel.forest_size(forest) <= 30
+    assert latency_model.estimate_ms(forest) == 0.1 + 0.01 * InferenceLatencyModel.forest_size(forest)
+
+
+def test_scorer_prefers_faster_forest_and_discards_over_budget():
+    """
+    Test de que a igual precisión gana el bosque más rápido y que los
+    bosques fuera del presupuesto quedan descartados.
+    """
+    small, X, y = _fit_forest(5, 3)
+    large, _, _ = _fit_forest(50, 3)
+    latency_model = InferenceLatencyModel(base_ms=0.0, per_node_ms=0.001)
+    
+    scorer = LatencyAwareScorer(latency_model, budget_ms=1.0)
+    assert scorer(small, X, y) > scorer(large, X, y) > 0
+    
+    tight = LatencyAwareScorer(latency_model, budget_ms=0.05)
+    assert tight(large, X, y) < 0
+
+
+def test_tune_model_selects_candidate_from_search_space():
+    """
+    Test de una búsqueda pequeña sobre el dataset real.
+    """
+    trainer = BreastCancerModelTrainer()
+    X, y = trainer.load_data()
+    X_train, _, y_train, _ = trainer.preprocess_data(X, y)
+    space = {'n_estimators': [10, 20], 'max_depth': [3, 5]}
+    
+    results = trainer.tune_model(
+        X_train, y_train, n_candidates=4, n_jobs=1, min_resources=100, param_distributions=space
+    )
+    
+    assert trainer.model.n_estimators in space['n_estimators']
+    assert trainer.model.max_depth in space['max_depth']
+    assert results['best_params'] == {k: trainer.model.get_params()[k] for k in space}
+    assert results['measured_p99_ms'] > 0